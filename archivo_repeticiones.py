@@ -0,0 +1,278 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - archivo_repeticiones.py
+
+Archivo de grabaciones: muchas partidas en un solo fichero, con índice.
+
+Un `.rep` por partida (ver `repeticion.py`) no escala a las partidas que
+generan los bots o las sesiones largas: para encontrar "todas las partidas
+con más de N puntos" hay que abrir y analizar miles de ficheros.
+
+Un archivo son dos ficheros a los que solo se añade por el final:
+
+- RUTA: las grabaciones serializadas (`Grabacion.a_bytes`) una tras otra.
+  Cada una conserva su cabecera, así que el fichero sigue siendo legible
+  aunque se pierda el índice.
+- RUTA.idx: una cabecera (`CABECERA_INDICE`) y un registro de ancho fijo por
+  partida (`INDICE_DTYPE`): posición y tamaño en RUTA, semilla, puntuación
+  final, longitud alcanzada y pasos.
+
+Al añadir escribimos primero la grabación y después su registro: si el
+proceso se interrumpe, el índice nunca apunta a datos incompletos. Lo que
+quede a medias (un registro incompleto al final del índice o una grabación
+sin registro) lo ignora `LectorArchivo` y lo recorta `EscritorArchivo` al
+abrir el archivo, antes de añadir la siguiente partida.
+
+`LectorArchivo` abre ambos ficheros con `mmap`. El índice es un array
+estructurado de NumPy construido directamente sobre el mapa (sin copiarlo ni
+recorrerlo), así que filtrar por puntuación es una comparación vectorizada y
+cargar la partida n-ésima es leer el registro n y tomar una vista de sus
+bytes: las acciones de la `Grabacion` resultante no se copian.
+
+Ejemplos:
+    python main.py --grabar partidas.arc
+    python archivo_repeticiones.py partidas.arc --puntuacion-minima 200
+    python archivo_repeticiones.py partidas.arc --partida 1000000
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from repeticion import Grabacion, Reproductor
+
+EXTENSION_INDICE = ".idx"
+
+MAGIA_INDICE = b"S3DI"
+VERSION_INDICE = 1
+
+# Magia, versión y tamaño de cada registro (para detectar índices de otra
+# versión del formato).
+CABECERA_INDICE = struct.Struct("<4sHH")
+
+# Un registro por partida, en el mismo orden en que se añadieron.
+INDICE_DTYPE = np.dtype([
+    ("desplazamiento", "<u8"),  # Posición de la grabación en RUTA
+    ("bytes", "<u4"),           # Tamaño de la grabación serializada
+    ("semilla", "<u8"),
+    ("puntuacion", "<u4"),
+    ("longitud", "<u4"),        # Longitud final de la serpiente
+    ("pasos", "<u4"),
+])
+
+
+def _validar_cabecera(datos, ruta: str):
+    if len(datos) < CABECERA_INDICE.size:
+        raise ValueError(f"{ruta}: índice sin cabecera")
+    magia, version, tam_registro = CABECERA_INDICE.unpack_from(datos)
+    if magia != MAGIA_INDICE:
+        raise ValueError(f"{ruta}: no es un índice de grabaciones de Snake 3D")
+    if version != VERSION_INDICE or tam_registro != INDICE_DTYPE.itemsize:
+        raise ValueError(f"{ruta}: versión de índice no soportada: {version}")
+
+
+class EscritorArchivo:
+    """
+    Añade grabaciones al final de un archivo (lo crea si no existe).
+
+    No admite varios escritores a la vez sobre el mismo archivo.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        ruta_indice = ruta + EXTENSION_INDICE
+        if os.path.exists(ruta_indice) and os.path.getsize(ruta_indice):
+            self._reparar(ruta, ruta_indice)
+
+        self._datos = open(ruta, "ab")
+        self._indice = open(ruta_indice, "ab")
+        if self._indice.tell() == 0:
+            self._indice.write(CABECERA_INDICE.pack(MAGIA_INDICE, VERSION_INDICE, INDICE_DTYPE.itemsize))
+            self._indice.flush()
+
+    @staticmethod
+    def _reparar(ruta: str, ruta_indice: str):
+        """
+        Deja el archivo como estaba tras la última partida completa. Si se
+        interrumpió una escritura, el índice puede acabar en un registro a
+        medias (que desalinearía todos los siguientes) y RUTA en una grabación
+        sin registro: recortamos ambos antes de añadir nada.
+
+        Raises:
+            ValueError: si el índice no es válido o apunta más allá de RUTA.
+        """
+        with open(ruta_indice, "r+b") as indice:
+            _validar_cabecera(indice.read(CABECERA_INDICE.size), ruta_indice)
+            num_partidas = (os.path.getsize(ruta_indice) - CABECERA_INDICE.size) // INDICE_DTYPE.itemsize
+            indice.truncate(CABECERA_INDICE.size + num_partidas * INDICE_DTYPE.itemsize)
+
+            fin_datos = 0
+            if num_partidas:
+                indice.seek(CABECERA_INDICE.size + (num_partidas - 1) * INDICE_DTYPE.itemsize)
+                ultimo = np.frombuffer(indice.read(INDICE_DTYPE.itemsize), dtype=INDICE_DTYPE)[0]
+                fin_datos = int(ultimo["desplazamiento"]) + int(ultimo["bytes"])
+
+        tamano_datos = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+        if tamano_datos < fin_datos:
+            raise ValueError(f"{ruta}: faltan datos de grabaciones ({tamano_datos} de {fin_datos} bytes)")
+        if tamano_datos > fin_datos:
+            with open(ruta, "r+b") as datos:
+                datos.truncate(fin_datos)
+
+    def agregar(self, grabacion: Grabacion, puntuacion: int = None, longitud: int = None) -> int:
+        """
+        Añade `grabacion` al archivo.
+
+        :param puntuacion: Puntuación final. Con None (o sin `longitud`) se
+                           reproduce la partida para obtenerla.
+        :param longitud: Longitud final de la serpiente.
+
+        Returns:
+            int: número de la partida dentro del archivo.
+        """
+        if puntuacion is None or longitud is None:
+            reproductor = Reproductor(grabacion)
+            reproductor.avanzar()
+            puntuacion = reproductor.simulacion.puntuacion
+            longitud = len(reproductor.simulacion.snake)
+
+        datos = grabacion.a_bytes()
+        desplazamiento = self._datos.tell()
+        self._datos.write(datos)
+        self._datos.flush()
+
+        registro = np.array([(desplazamiento, len(datos), grabacion.semilla,
+                              puntuacion, longitud, len(grabacion))], dtype=INDICE_DTYPE)
+        self._indice.write(registro.tobytes())
+        self._indice.flush()
+        return (self._indice.tell() - CABECERA_INDICE.size) // INDICE_DTYPE.itemsize - 1
+
+    def cerrar(self):
+        self._datos.close()
+        self._indice.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+class LectorArchivo:
+    """
+    Acceso aleatorio, sin copias, a las partidas de un archivo.
+
+    Ve el archivo tal y como estaba al abrirlo. Las grabaciones obtenidas con
+    `grabacion` son vistas del mapa: hay que soltarlas antes de `cerrar`.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        ruta_indice = ruta + EXTENSION_INDICE
+        with open(ruta_indice, "rb") as indice:
+            self._mapa_indice = mmap.mmap(indice.fileno(), 0, access=mmap.ACCESS_READ)
+        _validar_cabecera(self._mapa_indice, ruta_indice)
+
+        # Ignoramos un último registro incompleto (escritura interrumpida).
+        num_partidas = (len(self._mapa_indice) - CABECERA_INDICE.size) // INDICE_DTYPE.itemsize
+        self.indice = np.frombuffer(self._mapa_indice, dtype=INDICE_DTYPE,
+                                    count=num_partidas, offset=CABECERA_INDICE.size)
+
+        # `mmap` no admite ficheros vacíos (archivo recién creado).
+        self._mapa_datos = None
+        datos = b""
+        if os.path.getsize(ruta):
+            with open(ruta, "rb") as archivo:
+                self._mapa_datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            datos = self._mapa_datos
+        self._datos = memoryview(datos)
+
+    def __len__(self) -> int:
+        return len(self.indice)
+
+    def registro(self, partida: int) -> dict:
+        """
+        Campos del índice de la partida número `partida`, como enteros de
+        Python (un registro de NumPy seguiría siendo una vista del mapa).
+        """
+        return {campo: int(self.indice[campo][partida]) for campo in INDICE_DTYPE.names}
+
+    def datos(self, partida: int) -> memoryview:
+        """Bytes serializados de la partida número `partida` (una vista)."""
+        desplazamiento = int(self.indice["desplazamiento"][partida])
+        return self._datos[desplazamiento:desplazamiento + int(self.indice["bytes"][partida])]
+
+    def grabacion(self, partida: int) -> Grabacion:
+        """Grabación de la partida número `partida`, con sus acciones sin copiar."""
+        return Grabacion.desde_bytes(self.datos(partida))
+
+    def buscar(self, puntuacion_minima: int = 0, longitud_minima: int = 0) -> np.ndarray:
+        """Números de las partidas con puntuación y longitud mayores o iguales a las dadas."""
+        seleccion = (self.indice["puntuacion"] >= puntuacion_minima) & (self.indice["longitud"] >= longitud_minima)
+        return np.flatnonzero(seleccion)
+
+    def cerrar(self):
+        self.indice = None
+        self._datos.release()
+        self._mapa_indice.close()
+        if self._mapa_datos is not None:
+            self._mapa_datos.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta un archivo de grabaciones de Snake 3D.")
+    parser.add_argument("ruta", help="Archivo creado con main.py --grabar (o con EscritorArchivo).")
+    parser.add_argument("--puntuacion-minima", type=int, default=None, metavar="N",
+                        help="Cuenta las partidas con al menos N puntos y muestra las primeras.")
+    parser.add_argument("--partida", type=int, default=None, metavar="K",
+                        help="Reproduce la partida número K y comprueba su puntuación.")
+    parser.add_argument("--importar", nargs="+", default=None, metavar="REP",
+                        help="Añade al archivo grabaciones sueltas (.rep).")
+    args = parser.parse_args()
+
+    if args.importar:
+        with EscritorArchivo(args.ruta) as escritor:
+            for ruta in args.importar:
+                numero = escritor.agregar(Grabacion.cargar(ruta))
+                print(f"{ruta} -> partida {numero}")
+
+    with LectorArchivo(args.ruta) as lector:
+        print(f"{len(lector)} partidas, {os.path.getsize(args.ruta) / 1024:.1f} KB de grabaciones")
+        if len(lector):
+            puntuaciones = lector.indice["puntuacion"]
+            print(f"Puntuación: media {puntuaciones.mean():.1f}, máxima {puntuaciones.max()}")
+            del puntuaciones  # Las vistas del índice deben soltarse antes de cerrar
+
+        if args.puntuacion_minima is not None:
+            inicio = time.perf_counter()
+            partidas = lector.buscar(args.puntuacion_minima)
+            duracion = time.perf_counter() - inicio
+            print(f"{len(partidas)} partidas con al menos {args.puntuacion_minima} puntos "
+                  f"({duracion * 1000:.2f} ms)")
+            for numero in partidas[:10]:
+                registro = lector.registro(numero)
+                print(f"  #{numero}: puntuación {registro['puntuacion']}, longitud {registro['longitud']}, "
+                      f"{registro['pasos']} pasos, semilla {registro['semilla']}")
+
+        if args.partida is not None:
+            registro = lector.registro(args.partida)
+            reproductor = Reproductor(lector.grabacion(args.partida))
+            reproductor.avanzar()
+            simulacion = reproductor.simulacion
+            estado = "ok" if simulacion.puntuacion == registro["puntuacion"] else "NO COINCIDE"
+            print(f"Partida #{args.partida}: puntuación {simulacion.puntuacion} (índice: "
+                  f"{registro['puntuacion']}, {estado}), longitud {len(simulacion.snake)}, paso {reproductor.paso}")
+            del reproductor, simulacion  # Sueltan la vista de las acciones antes de cerrar
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - benchmarks/bench_logica.py
+
+Micro-benchmarks de la lógica (sin OpenGL):
+
+- `Snake.mover` con serpientes de 10 a 10.000 segmentos.
+- `Snake.mover` en el paso que cruza una arista (transición de cara).
+- `Comida.generar_nueva_posicion` con el tablero lleno al 0-99%.
+- Pasos de `Simulacion` y de `SimulacionLote` (macro).
+- `Snake.instantanea` en cada paso y `Snake.restaurar` a 100 pasos atrás.
+
+Para serpientes de hasta 10.000 segmentos necesitamos un cubo mayor que el
+del juego: usamos N = 45 (11.618 celdas de superficie) en todas las
+longitudes, de modo que solo cambie la longitud entre mediciones.
+"""
+
+import copy
+import random
+
+import comun  # noqa: F401  (añade la raíz del proyecto a sys.path)
+from comun import cronometrar, serpiente_larga
+
+import numpy as np
+
+from comida import Comida
+from simulacion import Simulacion
+from simulacion_lote import SimulacionLote
+from snake import Snake
+
+TAMANO_CUBO_LARGO = 45
+LONGITUDES = (10, 100, 1000, 10000)
+OCUPACIONES = (0.0, 0.5, 0.9, 0.99)
+PASOS_POR_MEDICION = 100
+
+
+def bench_mover() -> dict:
+    resultados = {}
+    for longitud in LONGITUDES:
+        base = serpiente_larga(longitud, TAMANO_CUBO_LARGO)
+
+        def mover_varios(snake):
+            for _ in range(PASOS_POR_MEDICION):
+                snake.mover()
+
+        t = cronometrar(mover_varios, repeticiones=7, preparar=lambda: copy.deepcopy(base))
+        resultados[f"snake_mover_L{longitud}"] = t / PASOS_POR_MEDICION
+    return resultados
+
+
+def bench_transicion() -> dict:
+    """
+    Coste del paso que cambia de cara. Sustituye al antiguo benchmark de
+    `_aplicar_transformacion_coordenadas`: desde que las coordenadas son
+    fijas, una transición solo gira la matriz de orientación.
+    """
+    resultados = {}
+    for longitud in (10, 10000):
+        base = serpiente_larga(longitud, TAMANO_CUBO_LARGO)
+        # Avanzamos hasta la celda anterior a la arista superior.
+        while base.cabeza_en_vista()[1] < base.size - 1:
+            base.mover()
+
+        def cruzar(snake):
+            eje, _ = snake.mover()
+            assert eje is not None
+
+        t = cronometrar(cruzar, repeticiones=50, preparar=lambda: copy.deepcopy(base))
+        resultados[f"snake_transicion_L{longitud}"] = t
+    return resultados
+
+
+def bench_comida() -> dict:
+    resultados = {}
+    for ocupacion in OCUPACIONES:
+        snake = Snake()
+        rng = random.Random(0)
+        mapa = snake.ocupacion
+        libres = [tuple(c) for c in mapa.superficie.tolist() if not mapa.ocupada(*c)]
+        rng.shuffle(libres)
+        objetivo = int(round(ocupacion * len(mapa.superficie)))
+        for celda in libres[:max(0, objetivo - len(snake))]:
+            mapa.ocupar(*celda)
+        comida = Comida(snake, rng)
+
+        def generar():
+            for _ in range(1000):
+                comida.generar_nueva_posicion()
+
+        t = cronometrar(generar, repeticiones=5)
+        resultados[f"comida_generar_ocupacion{int(ocupacion * 100)}"] = t / 1000
+    return resultados
+
+
+def bench_simulacion() -> dict:
+    """Macro: pasos por partida de la simulación escalar y de la vectorizada."""
+    def partida():
+        simulacion = Simulacion(semilla=0)
+        rng = random.Random(1)
+        for _ in range(2000):
+            if simulacion.terminado:
+                simulacion.reiniciar()
+            simulacion.paso(rng.randrange(5) if rng.random() < 0.3 else 0)
+
+    t_escalar = cronometrar(partida, repeticiones=3) / 2000
+
+    lote = SimulacionLote(1024, semilla=0)
+    acciones = np.random.default_rng(1).integers(0, 5, size=(200, 1024))
+
+    def pasos_lote():
+        for fila in acciones:
+            lote.paso(fila)
+            lote.reiniciar(lote.terminado)
+
+    t_lote = cronometrar(pasos_lote, repeticiones=3) / (200 * 1024)
+    return {"simulacion_paso": t_escalar, "simulacion_lote_paso_por_partida": t_lote}
+
+
+def bench_instantanea() -> dict:
+    """
+    Instantánea en cada paso (no debe depender de la longitud: el cuerpo se
+    comparte) y vuelta a una instantánea de PASOS_POR_MEDICION pasos atrás.
+    """
+    resultados = {}
+    for longitud in (10, 10000):
+        base = serpiente_larga(longitud, TAMANO_CUBO_LARGO)
+
+        def mover_con_instantaneas(snake):
+            for _ in range(PASOS_POR_MEDICION):
+                snake.instantanea()
+                snake.mover()
+
+        t = cronometrar(mover_con_instantaneas, repeticiones=7, preparar=lambda: copy.deepcopy(base))
+        resultados[f"snake_instantanea_L{longitud}"] = t / PASOS_POR_MEDICION
+
+        snake = copy.deepcopy(base)
+        inicial = snake.instantanea()
+        for _ in range(PASOS_POR_MEDICION):
+            snake.mover()
+        final = snake.instantanea()
+
+        def ida_y_vuelta():
+            snake.restaurar(inicial)
+            snake.restaurar(final)
+
+        resultados[f"snake_restaurar_L{longitud}"] = cronometrar(ida_y_vuelta, repeticiones=20) / 2
+    return resultados
+
+
+BENCHMARKS = (bench_mover, bench_transicion, bench_comida, bench_simulacion, bench_instantanea)
@@ -0,0 +1,136 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - benchmarks/bench_render.py
+
+Benchmarks de renderizado en un contexto OpenGL sin ventana (`contexto.py`, en la
+raíz del proyecto):
+
+- Construcción del tablero (mallado + subida a la GPU) con GRID_SIZE 15,
+  31, 63 y 127.
+- Un frame completo como el de `Game._renderizar_escena` (luces, rotación,
+  serpiente + comida instanciadas y tablero), terminado con `glFinish`.
+- El tablero de 128³ visto desde una cámara cercana (como la 4), donde el
+  descarte de bloques fuera del frustum debe evitar dibujar casi todo.
+
+Los tiempos dependen del driver: con Mesa por software (llvmpipe) miden la
+CPU, no una GPU real. Compara solo contra una línea base de la misma máquina.
+"""
+
+import random
+
+import comun  # noqa: F401  (añade la raíz del proyecto a sys.path)
+from comun import cronometrar
+
+from contexto import crear_contexto
+
+ANCHO, ALTO = 640, 480
+TAMANOS_TABLERO = (15, 31, 63, 127)
+LONGITUD_SERPIENTE_FRAME = 500
+
+
+def bench_compilar_tablero() -> dict:
+    from OpenGL.GL import glFinish
+    from tablero import Tablero
+
+    resultados = {}
+    for size in TAMANOS_TABLERO:
+        tableros = []
+
+        def compilar():
+            # El constructor genera la malla y la sube (la topología ya está en caché).
+            tableros.append(Tablero(size))
+            glFinish()
+
+        resultados[f"tablero_compilar_N{size}"] = cronometrar(compilar, repeticiones=3)
+        for tablero in tableros:
+            tablero.liberar()
+    return resultados
+
+
+def bench_frame() -> dict:
+    from OpenGL.GL import (
+        glEnable, glClear, glClearColor, glLoadIdentity, glMatrixMode, glPushMatrix,
+        glPopMatrix, glRotatef, glMultMatrixf, glFinish,
+        GL_DEPTH_TEST, GL_NORMALIZE, GL_PROJECTION, GL_MODELVIEW,
+        GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT,
+    )
+    from OpenGL.GLU import gluPerspective, gluLookAt
+
+    from configuracion import COLOR_FONDO, FOV, NEAR_PLANE, FAR_PLANE, GRID_SIZE, CAMARA_1_POS
+    from comun import serpiente_larga
+    from comida import Comida
+    from luces import Iluminacion
+    from renderizador import RenderizadorSegmentos
+    from tablero import Tablero
+
+    glEnable(GL_DEPTH_TEST)
+    glEnable(GL_NORMALIZE)
+    glClearColor(*COLOR_FONDO)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(FOV, ANCHO / ALTO, NEAR_PLANE, FAR_PLANE)
+    glMatrixMode(GL_MODELVIEW)
+
+    tablero = Tablero()
+    luces = Iluminacion()
+    renderizador = RenderizadorSegmentos(tablero, luces)
+    snake = serpiente_larga(LONGITUD_SERPIENTE_FRAME, GRID_SIZE)
+    comida = Comida(snake, random.Random(0))
+    distancia = GRID_SIZE * 2.5
+
+    def frame():
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glLoadIdentity()
+        gluLookAt(*(distancia * c for c in CAMARA_1_POS), 0, 0, 0, 0, 1, 0)
+        luces.activar()
+        glPushMatrix()
+        glRotatef(30.0, 1, 0, 0)
+        glRotatef(45.0, 0, 1, 0)
+        glMultMatrixf(snake.orientacion.matriz_gl())
+        renderizador.dibujar(snake, comida)
+        tablero.dibujar()
+        glPopMatrix()
+        glFinish()
+
+    frame()  # Calentamiento: compila shaders y sube las instancias
+    return {"render_frame_completo": cronometrar(frame, repeticiones=20)}
+
+
+def bench_tablero_cercano() -> dict:
+    from OpenGL.GL import (
+        glClear, glLoadIdentity, glMatrixMode, glFinish,
+        GL_PROJECTION, GL_MODELVIEW, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT,
+    )
+    from OpenGL.GLU import gluPerspective, gluLookAt
+
+    from configuracion import FOV, NEAR_PLANE, CAMARA_4_ALTURA, CAMARA_4_DISTANCIA_MIRA
+    from tablero import Tablero
+
+    size = 128
+    tablero = Tablero(size)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(FOV, ANCHO / ALTO, NEAR_PLANE, size * 5.0)
+    glMatrixMode(GL_MODELVIEW)
+
+    # Cabeza en el centro de la cara frontal, mirando hacia arriba.
+    hx, hy, hz = tablero.obtener_posicion_mundo(size // 2, size // 2, size - 1)
+
+    def frame():
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glLoadIdentity()
+        gluLookAt(hx, hy, hz + CAMARA_4_ALTURA, hx, hy + CAMARA_4_DISTANCIA_MIRA, hz, 0, 0, 1)
+        tablero.dibujar()
+        glFinish()
+
+    frame()
+    resultado = {"tablero_dibujar_N128_cercano": cronometrar(frame, repeticiones=10)}
+    tablero.liberar()
+    return resultado
+
+
+def ejecutar() -> dict:
+    crear_contexto(ANCHO, ALTO)
+    resultados = {}
+    for bench in (bench_compilar_tablero, bench_frame, bench_tablero_cercano):
+        resultados.update(bench())
+    return resultados
@@ -0,0 +1,66 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - benchmarks/comun.py
+
+Utilidades compartidas por los benchmarks: acceso a los módulos del juego
+desde la carpeta `benchmarks/`, un cronómetro reproducible y serpientes
+largas construidas de forma determinista.
+
+Medimos siempre el *mínimo* de varias repeticiones: es la cifra más estable
+entre ejecuciones, porque el ruido (otros procesos, el recolector de basura,
+la CPU cambiando de frecuencia) solo puede sumar tiempo, nunca restarlo.
+"""
+
+import gc
+import os
+import sys
+import time
+
+# Los módulos del juego viven en la carpeta padre.
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_PROYECTO not in sys.path:
+    sys.path.insert(0, RAIZ_PROYECTO)
+
+
+def cronometrar(funcion, repeticiones=5, preparar=None) -> float:
+    """
+    Ejecuta `funcion` `repeticiones` veces y devuelve el mínimo en segundos.
+
+    Si se indica `preparar`, se llama antes de cada repetición (fuera del
+    tiempo medido) y su resultado se pasa a `funcion`.
+    """
+    mejor = float("inf")
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            argumento = preparar() if preparar else None
+            inicio = time.perf_counter()
+            if preparar:
+                funcion(argumento)
+            else:
+                funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+    finally:
+        if gc_activo:
+            gc.enable()
+    return mejor
+
+
+def serpiente_larga(longitud: int, size: int):
+    """
+    Serpiente de `longitud` segmentos en un cubo de lado `size`. La cabeza
+    avanza por el anillo x = size // 2 (donde empieza) y el resto del cuerpo
+    se reparte por celdas fuera de ese anillo, así que los primeros pasos
+    nunca chocan.
+    """
+    from snake import Snake
+
+    snake = Snake(size)
+    mid = size // 2
+    superficie = snake.topologia.superficie
+    fuera_del_anillo = superficie[superficie[:, 0] != mid]
+    for x, y, z in fuera_del_anillo[:longitud - len(snake)].tolist():
+        snake._agregar_cola(x, y, z)
+    if len(snake) != longitud:
+        raise ValueError(f"No caben {longitud} segmentos en un cubo de lado {size}")
+    return snake
@@ -0,0 +1,111 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - benchmarks/ejecutar.py
+
+Ejecuta los benchmarks y los compara con una línea base guardada en JSON.
+
+Uso:
+    python benchmarks/ejecutar.py                   # mide y compara
+    python benchmarks/ejecutar.py --guardar-base    # mide y guarda la base
+    python benchmarks/ejecutar.py --sin-render      # solo la lógica (sin GL)
+
+Cada resultado es el tiempo mínimo por operación, en segundos. Una medición
+es una regresión si supera la línea base en más de `--tolerancia` (25% por
+defecto); en ese caso el programa termina con código 1, de modo que puede
+usarse como paso previo a publicar cambios en el bucle del juego.
+
+La línea base depende de la máquina: genérala en la misma máquina (y con el
+mismo driver de OpenGL) en la que vayas a comparar.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import comun  # noqa: F401  (añade la raíz del proyecto a sys.path)
+
+RUTA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base.json")
+TOLERANCIA = 0.25
+
+
+def medir(con_render: bool) -> dict:
+    import bench_logica
+
+    resultados = {}
+    for bench in bench_logica.BENCHMARKS:
+        resultados.update(bench())
+
+    if con_render:
+        try:
+            import bench_render
+            resultados.update(bench_render.ejecutar())
+        except Exception as error:
+            # Sin EGL/OSMesa no hay contexto GL: seguimos con la lógica.
+            print(f"Benchmarks de renderizado omitidos: {error}")
+    return resultados
+
+
+def comparar(resultados: dict, base: dict, tolerancia: float) -> list:
+    """Imprime la tabla comparativa y devuelve los nombres que han empeorado."""
+    regresiones = []
+    print(f"{'benchmark':<36} {'actual':>12} {'base':>12} {'cambio':>9}")
+    for nombre, valor in resultados.items():
+        referencia = base.get(nombre)
+        if referencia is None:
+            print(f"{nombre:<36} {_formato(valor):>12} {'-':>12} {'nuevo':>9}")
+            continue
+
+        cambio = valor / referencia - 1.0
+        marca = ""
+        if cambio > tolerancia:
+            regresiones.append(nombre)
+            marca = "  <-- REGRESIÓN"
+        print(f"{nombre:<36} {_formato(valor):>12} {_formato(referencia):>12} {cambio:>+8.1%}{marca}")
+    return regresiones
+
+
+def _formato(segundos: float) -> str:
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.2f} us"
+    if segundos < 1.0:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos:.2f} s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de Snake 3D.")
+    parser.add_argument("--guardar-base", action="store_true", help="Guarda los resultados como nueva línea base.")
+    parser.add_argument("--base", default=RUTA_BASE, help="Ruta del JSON de la línea base.")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA, help="Empeoramiento admitido (0.25 = 25%%).")
+    parser.add_argument("--sin-render", action="store_true", help="Omite los benchmarks que necesitan OpenGL.")
+    args = parser.parse_args()
+
+    resultados = medir(not args.sin_render)
+
+    if args.guardar_base:
+        datos = {
+            "maquina": {"python": platform.python_version(), "plataforma": platform.platform()},
+            "resultados": resultados,
+        }
+        with open(args.base, "w") as archivo:
+            json.dump(datos, archivo, indent=2)
+        print(f"Línea base guardada en {args.base} ({len(resultados)} benchmarks)")
+        return 0
+
+    base = {}
+    if os.path.exists(args.base):
+        with open(args.base) as archivo:
+            base = json.load(archivo)["resultados"]
+    else:
+        print(f"No existe la línea base {args.base}; usa --guardar-base para crearla")
+
+    regresiones = comparar(resultados, base, args.tolerancia)
+    if regresiones:
+        print(f"{len(regresiones)} regresión(es): {', '.join(regresiones)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
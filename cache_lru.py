@@ -0,0 +1,108 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - cache_lru.py
+
+Caché LRU acotada por memoria.
+
+La caché de `TextRenderer` era un diccionario que solo crecía: cada
+puntuación, lectura de FPS o texto de depuración distinto se quedaba
+guardado hasta el final del proceso. En sesiones largas (el modo quiosco)
+eso es una fuga lenta de memoria.
+
+`CacheLRU` guarda las entradas en un `OrderedDict` ordenado por uso reciente
+y lleva la cuenta de los bytes de cada valor. Al superar el presupuesto
+expulsa las menos usadas recientemente. También cuenta aciertos, fallos y
+expulsiones, para que el perfilador pueda mostrarlos.
+"""
+
+from collections import OrderedDict
+
+
+def _bytes_valor(valor) -> int:
+    """Tamaño por defecto de un valor: `nbytes` (arrays NumPy) o `len` (bytes)."""
+    nbytes = getattr(valor, "nbytes", None)
+    return int(nbytes) if nbytes is not None else len(valor)
+
+
+class CacheLRU:
+    """
+    Caché clave -> valor con un presupuesto de bytes y expulsión LRU.
+    """
+
+    def __init__(self, presupuesto_bytes: int, medir=_bytes_valor):
+        """
+        :param presupuesto_bytes: Bytes máximos que pueden ocupar los valores.
+        :param medir: Función valor -> bytes que ocupa.
+        """
+        self.presupuesto_bytes = presupuesto_bytes
+        self.medir = medir
+        self._entradas = OrderedDict()  # clave -> (valor, bytes)
+        self.bytes = 0
+
+        # Contadores para el perfilador
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.bytes_expulsados = 0
+        self.rechazos = 0  # Valores mayores que todo el presupuesto
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._entradas
+
+    def obtener(self, clave):
+        """Devuelve el valor de `clave` (y lo marca como recién usado) o None."""
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+
+    def guardar(self, clave, valor) -> None:
+        """Guarda `valor`, expulsando las entradas más antiguas si no cabe."""
+        tamano = self.medir(valor)
+        if tamano > self.presupuesto_bytes:
+            self.rechazos += 1
+            return
+
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= anterior[1]
+
+        while self.bytes + tamano > self.presupuesto_bytes:
+            _, (_, tamano_expulsado) = self._entradas.popitem(last=False)
+            self.bytes -= tamano_expulsado
+            self.expulsiones += 1
+            self.bytes_expulsados += tamano_expulsado
+
+        self._entradas[clave] = (valor, tamano)
+        self.bytes += tamano
+
+    def limpiar(self) -> None:
+        """Vacía la caché (los contadores se conservan)."""
+        self._entradas.clear()
+        self.bytes = 0
+
+    def estadisticas(self) -> dict:
+        """Ocupación y contadores de la caché."""
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self.bytes,
+            "presupuesto_bytes": self.presupuesto_bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "expulsiones": self.expulsiones,
+            "bytes_expulsados": self.bytes_expulsados,
+            "rechazos": self.rechazos,
+        }
+
+    def resumen(self) -> str:
+        """Estado de la caché en dos líneas cortas (ocupación y contadores)."""
+        e = self.estadisticas()
+        return (f"{e['entradas']} entradas, {e['bytes'] / 1024:.1f}/{e['presupuesto_bytes'] / 1024:.0f} KB\n"
+                f"aciertos {e['tasa_aciertos'] * 100:.0f}%, expulsiones {e['expulsiones']}")
@@ -0,0 +1,310 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - captura.py
+
+Capturas de pantalla y grabación de vídeo sin detener el bucle de render.
+
+Leer el framebuffer con `glReadPixels` justo después de dibujar obliga al
+driver a terminar todo el trabajo pendiente del frame y a copiar los píxeles
+antes de devolver el control: el bucle se queda esperando a la GPU.
+
+`Capturador` usa un anillo de pixel buffer objects (PBO, `NUM_PBOS_CAPTURA`):
+
+1. Al final del frame N, `glReadPixels` con un PBO enlazado solo encola la
+   copia del framebuffer a ese PBO y vuelve enseguida.
+2. En el frame N+1, cuando la copia ya ha terminado, mapeamos el PBO y
+   entregamos la memoria mapeada (sin copiarla) a un hilo escritor, mientras
+   otro PBO libre recibe el frame N+1.
+3. El hilo escritor codifica el frame (PNG o vídeo crudo) y lo anuncia; el
+   bucle desmapea el PBO al frame siguiente y puede volver a usarlo.
+
+Si el escritor no da abasto y no queda ningún PBO libre, el frame se
+descarta (y se cuenta) en lugar de esperar: grabar nunca frena el juego. En
+el hilo principal solo quedan tres llamadas a OpenGL por frame; la
+codificación (filtrado de filas con NumPy y zlib, que libera el GIL) ocurre
+en el hilo escritor.
+
+Formatos de vídeo:
+- "png": una secuencia CARPETA/video_FECHA/frame_000000.png...
+- "raw": un único fichero CARPETA/video_FECHA.rgba con los frames tal y
+  como los devuelve OpenGL (RGBA, de abajo arriba), escritos directamente
+  desde la memoria mapeada sin ninguna conversión. Es el formato más barato;
+  para convertirlo:
+      ffmpeg -f rawvideo -pix_fmt rgba -s 1280x960 -r 60 -i video.rgba -vf vflip video.mp4
+
+Las capturas se hacen con la cámara activa en ese momento.
+"""
+
+import ctypes
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+from OpenGL.GL import (
+    glGenBuffers, glBindBuffer, glBufferData, glDeleteBuffers, glMapBufferRange, glUnmapBuffer,
+    glReadPixels, glPixelStorei,
+    GL_PIXEL_PACK_BUFFER, GL_STREAM_READ, GL_MAP_READ_BIT, GL_PACK_ALIGNMENT,
+    GL_RGBA, GL_UNSIGNED_BYTE,
+)
+
+from configuracion import CARPETA_CAPTURAS, NUM_PBOS_CAPTURA, NIVEL_COMPRESION_PNG
+
+FORMATOS_VIDEO = ("png", "raw")
+
+# Estados de cada PBO
+LIBRE = 0
+LEYENDO = 1    # glReadPixels encolado
+MAPEADO = 2    # En manos del hilo escritor
+
+_FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def _bloque_png(tipo: bytes, datos) -> bytes:
+    crc = zlib.crc32(datos, zlib.crc32(tipo))
+    return struct.pack(">I", len(datos)) + tipo + bytes(datos) + struct.pack(">I", crc)
+
+
+def codificar_png(pixeles: np.ndarray, nivel: int = NIVEL_COMPRESION_PNG) -> bytes:
+    """
+    Codifica una imagen RGBA (alto, ancho, 4) leída de OpenGL (fila 0 abajo)
+    como PNG RGB de 8 bits, de arriba abajo.
+    """
+    alto, ancho, _ = pixeles.shape
+    # Cada fila del PNG empieza con su tipo de filtro (0 = ninguno).
+    filas = np.zeros((alto, 1 + ancho * 3), dtype=np.uint8)
+    filas[:, 1:].reshape(alto, ancho, 3)[...] = pixeles[::-1, :, :3]
+    cabecera = struct.pack(">IIBBBBB", ancho, alto, 8, 2, 0, 0, 0)  # 8 bits, RGB
+    return (_FIRMA_PNG + _bloque_png(b"IHDR", cabecera)
+            + _bloque_png(b"IDAT", zlib.compress(filas, nivel)) + _bloque_png(b"IEND", b""))
+
+
+class Capturador:
+    """
+    Lectura asíncrona del framebuffer con PBO y escritura en segundo plano.
+    """
+
+    def __init__(self, ancho: int, alto: int, carpeta: str = CARPETA_CAPTURAS, formato_video: str = "png",
+                 num_pbos: int = NUM_PBOS_CAPTURA):
+        if formato_video not in FORMATOS_VIDEO:
+            raise ValueError(f"Formato de vídeo desconocido: {formato_video}")
+        self.ancho = ancho
+        self.alto = alto
+        self.carpeta = carpeta
+        self.formato_video = formato_video
+
+        tamano = ancho * alto * 4
+        self.pbos = [int(pbo) for pbo in np.atleast_1d(glGenBuffers(num_pbos))]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, tamano, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        self.estados = [LIBRE] * num_pbos
+        self.destinos = [None] * num_pbos  # Adónde va el frame de cada PBO
+        self._siguiente = 0                # PBO que recibirá la próxima lectura
+
+        # Peticiones pendientes
+        self._captura_pedida = False
+        self._video = None        # Destino del vídeo en curso (carpeta o fichero abierto)
+        self._frame_video = 0
+
+        # Hilo escritor: recibe (pbo, píxeles, destino) y devuelve el pbo.
+        self._trabajos = queue.Queue()
+        self._terminados = queue.SimpleQueue()
+        self._hilo = threading.Thread(target=self._escribir, name="captura", daemon=True)
+        self._hilo.start()
+        self.error = None
+
+        # Contadores para el perfilador
+        self.frames_escritos = 0
+        self.frames_descartados = 0
+        self.capturas = 0
+
+    # ------------------------------------------------------------------
+    # Peticiones (desde el bucle del juego)
+    # ------------------------------------------------------------------
+
+    @property
+    def grabando(self) -> bool:
+        return self._video is not None
+
+    def capturar_pantalla(self):
+        """Guarda el próximo frame como CARPETA/captura_FECHA.png."""
+        self._captura_pedida = True
+
+    def iniciar_video(self):
+        """Empieza a grabar todos los frames en el formato `formato_video`."""
+        if self.grabando:
+            return
+        os.makedirs(self.carpeta, exist_ok=True)
+        nombre = os.path.join(self.carpeta, "video_" + time.strftime("%Y%m%d_%H%M%S"))
+        if self.formato_video == "png":
+            os.makedirs(nombre, exist_ok=True)
+            self._video = nombre
+        else:
+            self._video = open(nombre + ".rgba", "wb")
+        self._frame_video = 0
+        print(f"Grabando vídeo en {nombre} ({self.ancho}x{self.alto})")
+
+    def detener_video(self):
+        """Termina el vídeo en curso (los frames ya leídos se escriben igualmente)."""
+        if not self.grabando:
+            return
+        self._entregar_lecturas()  # El último frame leído también entra en el vídeo
+        if self.formato_video == "raw":
+            # El hilo cierra el fichero cuando haya escrito los frames anteriores.
+            self._trabajos.put((None, None, self._video))
+        print(f"Vídeo terminado: {self._frame_video} frames")
+        self._video = None
+
+    def alternar_video(self):
+        if self.grabando:
+            self.detener_video()
+        else:
+            self.iniciar_video()
+
+    # ------------------------------------------------------------------
+    # Por frame (hilo de OpenGL)
+    # ------------------------------------------------------------------
+
+    def procesar_frame(self):
+        """
+        Llamar una vez por frame, con la escena ya dibujada y antes de
+        `pygame.display.flip`. Sin capturas pendientes no hace nada.
+        """
+        if self.error is not None:
+            print(f"Captura detenida por un error al escribir: {self.error}")
+            self.error = None
+            self._captura_pedida = False
+            self.detener_video()
+
+        self._recoger_terminados()
+
+        # Entregamos primero lo leído en frames anteriores: así la lectura de
+        # este frame puede usar el PBO que acabe de soltar el escritor.
+        self._entregar_lecturas()
+        if not (self._captura_pedida or self.grabando):
+            return
+        pbo = self._pbo_libre()
+        if pbo is None:
+            # La captura de pantalla se reintenta en el próximo frame.
+            self.frames_descartados += 1
+            return
+
+        destinos = []
+        if self._captura_pedida:
+            os.makedirs(self.carpeta, exist_ok=True)
+            ruta = os.path.join(self.carpeta, time.strftime("captura_%Y%m%d_%H%M%S.png"))
+            destinos.append(ruta)
+            self._captura_pedida = False
+            self.capturas += 1
+            print(f"Captura: {ruta}")
+        if self.grabando:
+            if self.formato_video == "png":
+                destinos.append(os.path.join(self._video, f"frame_{self._frame_video:06d}.png"))
+            else:
+                destinos.append(self._video)
+            self._frame_video += 1
+        self._leer(pbo, destinos)
+
+    def _recoger_terminados(self):
+        """Desmapea los PBO que el hilo escritor ya ha terminado de leer."""
+        while True:
+            try:
+                pbo = self._terminados.get_nowait()
+            except queue.Empty:
+                return
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[pbo])
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            self.estados[pbo] = LIBRE
+
+    def _entregar_lecturas(self):
+        """Mapea los PBO con lecturas encoladas y se los pasa al hilo escritor."""
+        tamano = self.ancho * self.alto * 4
+        for pbo, estado in enumerate(self.estados):
+            if estado != LEYENDO:
+                continue
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[pbo])
+            puntero = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, tamano, GL_MAP_READ_BIT)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            pixeles = np.ctypeslib.as_array(ctypes.cast(puntero, ctypes.POINTER(ctypes.c_ubyte)),
+                                            shape=(self.alto, self.ancho, 4))
+            self.estados[pbo] = MAPEADO
+            self._trabajos.put((pbo, pixeles, self.destinos[pbo]))
+
+    def _pbo_libre(self):
+        """Siguiente PBO libre del anillo, o None si el escritor los tiene todos."""
+        for _ in range(len(self.pbos)):
+            pbo = self._siguiente
+            self._siguiente = (self._siguiente + 1) % len(self.pbos)
+            if self.estados[pbo] == LIBRE:
+                return pbo
+        return None
+
+    def _leer(self, pbo: int, destinos: list):
+        """Encola la copia del framebuffer al PBO `pbo` (no espera a la GPU)."""
+        glPixelStorei(GL_PACK_ALIGNMENT, 4)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[pbo])
+        glReadPixels(0, 0, self.ancho, self.alto, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.estados[pbo] = LEYENDO
+        self.destinos[pbo] = destinos
+
+    # ------------------------------------------------------------------
+    # Hilo escritor
+    # ------------------------------------------------------------------
+
+    def _escribir(self):
+        while True:
+            trabajo = self._trabajos.get()
+            if trabajo is None:
+                return
+            pbo, pixeles, destinos = trabajo
+            if pbo is None:
+                destinos.close()  # Fin de un vídeo crudo
+                continue
+            try:
+                png = None
+                for destino in destinos:
+                    if isinstance(destino, str):
+                        png = png or codificar_png(pixeles)
+                        with open(destino, "wb") as archivo:
+                            archivo.write(png)
+                    else:
+                        destino.write(pixeles)
+                self.frames_escritos += 1
+            except (OSError, ValueError) as error:
+                self.error = error
+            finally:
+                trabajo = pixeles = None  # La memoria deja de ser válida al desmapear
+                self._terminados.put(pbo)
+
+    # ------------------------------------------------------------------
+
+    def cerrar(self):
+        """Termina el vídeo en curso, espera al hilo escritor y libera los PBO."""
+        self.detener_video()
+        self._entregar_lecturas()
+        self._trabajos.put(None)
+        self._hilo.join()
+        self._recoger_terminados()
+        glDeleteBuffers(len(self.pbos), self.pbos)
+
+    def estadisticas(self) -> dict:
+        return {
+            "grabando": self.grabando,
+            "frames_escritos": self.frames_escritos,
+            "frames_descartados": self.frames_descartados,
+            "capturas": self.capturas,
+            "pendientes": self._trabajos.qsize(),
+        }
+
+    def resumen(self) -> str:
+        e = self.estadisticas()
+        estado = "grabando" if e["grabando"] else "parado"
+        return (f"{estado}, {e['frames_escritos']} frames\n"
+                f"descartados {e['frames_descartados']}, en cola {e['pendientes']}")
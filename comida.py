@@ -4,94 +4,72 @@ Proyecto Snake 3D - comida.py
 Este módulo gestiona la comida dentro del mundo cúbico.
 Implementamos la clase Comida que se encarga de:
 1. Representar la comida en el espacio 3D (x, y, z).
-2. Generar nuevas posiciones aleatorias asegurando que aparezcan en la superficie.
-3. Rotar sus coordenadas solidariamente con el mundo para mantener la coherencia
-   con la serpiente durante las transiciones de cara.
+2. Generar nuevas posiciones aleatorias asegurando que aparezcan en la superficie
+   y, si la serpiente ya ocupa toda la superficie, avisar de ello.
+
+Las coordenadas de la comida son fijas en el espacio del cubo, igual que las
+de la serpiente: las transiciones de cara solo cambian la matriz de
+orientación (`orientacion.py`), así que la comida ya no necesita rotarse.
 """
 
 import random
-from OpenGL.GL import *
-from configuracion import GRID_SIZE, COLOR_COMIDA
+from configuracion import COLOR_COMIDA
 from segmento import Segmento
 
 class Comida:
-    def __init__(self, snake_ref):
+    def __init__(self, snake_ref, rng=None):
         """
         Inicializa la comida.
         :param snake_ref: Referencia a la serpiente para evitar generar comida sobre su cuerpo.
+        :param rng: Generador aleatorio (interfaz `random.Random`). Una instancia
+                    con semilla hace que la secuencia de comida sea reproducible.
+                    Con None se crea uno propio. No debe compartirse con otro
+                    código que saque números de él: `instantanea` da por hecho
+                    que solo avanza en `generar_nueva_posicion`.
         """
         self.snake = snake_ref
+        self.rng = random.Random() if rng is None else rng
+        # Último estado del generador capturado por `instantanea` (None si el
+        # generador ha avanzado desde entonces).
+        self._estado_rng = None
         self.posicion = None
         self.generar_nueva_posicion()
 
-    def generar_nueva_posicion(self):
-        """
-        Genera una posición aleatoria (x, y, z) que esté en la SUPERFICIE del cubo
-        y que no colisione con la serpiente.
+    def generar_nueva_posicion(self) -> bool:
         """
-        while True:
-            # 1. Elegir una cara aleatoria (0=Front/Back, 1=Left/Right, 2=Top/Bottom)
-            #    y fijar esa coordenada a 0 o GRID_SIZE-1.
-            eje_fijo = random.randint(0, 2)
-            lado = random.choice([0, GRID_SIZE - 1])
+        Coloca la comida en una celda aleatoria de la SUPERFICIE del cubo que
+        no esté ocupada por la serpiente.
 
-            coords = [0, 0, 0]
-            coords[eje_fijo] = lado
-            
-            # 2. Las otras dos coordenadas son aleatorias dentro del rango.
-            for i in range(3):
-                if i != eje_fijo:
-                    coords[i] = random.randint(0, GRID_SIZE - 1)
-            
-            x, y, z = coords
+        En lugar de probar posiciones al azar hasta acertar, pedimos una celda
+        al índice de libres que mantiene la serpiente (`ocupacion.py`): un
+        único sorteo O(1), incluso con el cubo casi lleno.
 
-            # 3. Validar que no colisione con la serpiente
-            colision = False
-            for seg in self.snake.segmentos:
-                if seg.x == x and seg.y == y and seg.z == z:
-                    colision = True
-                    break
-            
-            if not colision:
-                # Usamos la clase Segmento para facilitar el dibujado, aunque sea comida
-                self.posicion = Segmento(x, y, z, COLOR_COMIDA)
-                break
-
-    def rotar_coordenadas(self, eje, angulo_mundo):
-        """
-        Aplica la misma transformación de coordenadas que sufre la serpiente
-        cuando el mundo rota, para que la comida se quede "quieta" visualmente
-        respecto al tablero, aunque sus coordenadas lógicas cambien.
+        Returns:
+            bool: False si no queda ninguna celda libre (tablero completo).
         """
-        if not self.posicion:
-            return
+        self._estado_rng = None  # El sorteo avanza el generador
+        celda = self.snake.ocupacion.celda_libre_aleatoria(self.rng)
+        if celda is None:
+            self.posicion = None
+            return False
 
-        N = GRID_SIZE - 1
-        angulo_transformacion = -angulo_mundo # Inverso a la rotación visual
+        # Usamos la clase Segmento como contenedor de coordenadas y color
+        self.posicion = Segmento(*celda, COLOR_COMIDA)
+        return True
 
-        x, y, z = self.posicion.x, self.posicion.y, self.posicion.z
-
-        if eje == "y":
-            if angulo_transformacion == 90.0:
-                # Rotación +90º alrededor de Y (CCW)
-                self.posicion.x = N - z
-                self.posicion.z = x
-            elif angulo_transformacion == -90.0:
-                # Rotación -90º alrededor de Y (CW)
-                self.posicion.x = z
-                self.posicion.z = N - x
+    def instantanea(self) -> tuple:
+        """
+        Celda de la comida y estado del generador aleatorio.
 
-        elif eje == "x":
-            if angulo_transformacion == 90.0:
-                # Rotación +90º alrededor de X
-                self.posicion.y = z
-                self.posicion.z = N - y
-            elif angulo_transformacion == -90.0:
-                # Rotación -90º alrededor de X
-                self.posicion.y = N - z
-                self.posicion.z = y
+        `getstate` copia todo el estado del Mersenne Twister (625 enteros),
+        pero el generador solo avanza al comer: reutilizamos la misma tupla
+        (inmutable) en todas las instantáneas hasta el siguiente sorteo.
+        """
+        if self._estado_rng is None:
+            self._estado_rng = self.rng.getstate()
+        return self.posicion, self._estado_rng
 
-    def dibujar(self, tablero):
-        if self.posicion:
-            # Reutilizamos el método de dibujo de Segmento
-            self.posicion.dibujar(tablero)
+    def restaurar(self, instantanea: tuple):
+        """Vuelve al estado guardado con `instantanea`."""
+        self.posicion, self._estado_rng = instantanea
+        self.rng.setstate(self._estado_rng)
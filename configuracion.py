@@ -17,8 +17,12 @@ Organizamos la configuración en secciones temáticas:
 1. Paleta de colores (incluyendo canal alpha para transparencias).
 2. Dimensiones del mundo cúbico y tamaño de cada celda.
 3. Configuración de la ventana y proyección.
-4. Parámetros de control y velocidad.
-5. Configuración de las diferentes cámaras.
+4. Texto e interfaz (caché de maquetación del HUD).
+5. Capturas de pantalla y vídeo.
+6. Miniaturas sin ventana.
+7. Parámetros de control y velocidad (ritmo de frames y su perfilado,
+   puntuación, paso de la serpiente y rotación automática).
+8. Configuración de las diferentes cámaras.
 """
 
 # ---------------------------------------------------------------------------
@@ -66,6 +70,12 @@ ESPACIO_CELDA = 0.2
 ANCHO_TOTAL = (GRID_SIZE * TAMANO_CELDA) + ((GRID_SIZE - 1) * ESPACIO_CELDA)
 OFFSET_GRID = ANCHO_TOTAL / 2.0
 
+# GRID_SIZE es solo el valor por defecto: `main.py --tamano N` juega en un
+# cubo de N³ celdas. Para que los cubos grandes (128³) sigan siendo fluidos,
+# cada cara del tablero se divide en bloques de este lado (en celdas), y los
+# bloques fuera del campo de visión no se dibujan.
+LADO_BLOQUE_TABLERO = 16
+
 # ---------------------------------------------------------------------------
 # Ventana y proyección en perspectiva
 # ---------------------------------------------------------------------------
@@ -79,13 +89,63 @@ SCREEN_ASPECT_RATIO = SCREEN_WIDTH / SCREEN_HEIGHT
 # Un valor ligeramente angular nos permite abarcar bien el volumen del cubo.
 FOV        = 60
 NEAR_PLANE = 0.1
-FAR_PLANE  = 100.0
+FAR_PLANE  = 100.0  # Mínimo: con cubos grandes se amplía según la distancia de la cámara
+
+# ---------------------------------------------------------------------------
+# Texto e interfaz (HUD)
+# ---------------------------------------------------------------------------
+
+# Memoria máxima (bytes) de la caché de maquetación de textos de
+# `TextRenderer`. Una cadena de 30 caracteres ocupa unos 3 KB de vértices.
+PRESUPUESTO_CACHE_TEXTO_BYTES = 256 * 1024
+
+# ---------------------------------------------------------------------------
+# Capturas de pantalla (F12) y vídeo (F10), ver `captura.py`
+# ---------------------------------------------------------------------------
+
+# Carpeta por defecto (`main.py --capturas`).
+CARPETA_CAPTURAS = "capturas"
+
+# PBO en el anillo de lectura asíncrona: con más, el hilo escritor puede
+# retrasarse más frames antes de que se descarte alguno.
+NUM_PBOS_CAPTURA = 3
+
+# Nivel de zlib de los PNG: 1 comprime algo menos pero es varias veces más
+# rápido que el 6 por defecto, y los frames de vídeo no se quedan atrás.
+NIVEL_COMPRESION_PNG = 1
+
+# ---------------------------------------------------------------------------
+# Miniaturas sin ventana, ver `miniaturas.py`
+# ---------------------------------------------------------------------------
+
+# Tamaño por defecto (`miniaturas.py --tamano-imagen`).
+MINIATURA_ANCHO = 320
+MINIATURA_ALTO = 240
 
 # ---------------------------------------------------------------------------
 # Control y velocidad de actualización
 # ---------------------------------------------------------------------------
 
 FPS = 60
+
+# Modo de ritmo de frames (ver `ritmo.py`):
+# - "limitado": duerme hasta completar el presupuesto (comportamiento clásico).
+# - "sin_limite": sin esperas; mide el margen real de renderizado.
+# - "vsync": la espera la impone el intercambio de buffers sincronizado.
+# - "precision": duerme casi todo el presupuesto y apura el resto en espera
+#   activa, evitando la granularidad gruesa de los temporizadores del SO.
+MODO_RITMO = "limitado"
+
+# Presupuesto de tiempo por frame (ms) para los modos "limitado" y "precision".
+PRESUPUESTO_FRAME_MS = 1000.0 / FPS
+
+# En modo "precision", dejamos de dormir este margen (ms) antes del objetivo
+# y terminamos con espera activa.
+MARGEN_ESPERA_ACTIVA_MS = 2.0
+
+# Número de frames recientes que guardamos para las estadísticas de ritmo.
+MUESTRAS_TIEMPO_FRAME = 600
+
 # Puntuación (Fase 9)
 PUNTOS_POR_COMIDA = 8
 
@@ -100,6 +160,11 @@ VELOCIDAD_ROTACION_MUNDO = 90.0
 # 0.15 = 150ms. Cuanto menor sea el número, más rápida es la serpiente.
 TIEMPO_PASO = 0.15
 
+# Máximo de pasos lógicos que recuperamos en un mismo frame tras un tirón.
+# Si el retraso es mayor, descartamos el sobrante en lugar de encadenar
+# frames cada vez más lentos (la llamada "espiral de la muerte").
+MAX_PASOS_POR_FRAME = 5
+
 # --- FASE 5: Configuración de Rotación Automática ---
 #
 # Tiempo (en segundos) que tarda el mundo en completar una rotación de 90º
@@ -0,0 +1,125 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - contexto.py
+
+Contexto OpenGL sin ventana, para los benchmarks de renderizado
+(`benchmarks/bench_render.py`) y las miniaturas (`miniaturas.py`).
+
+Usamos EGL sin superficie (disponible con Mesa en servidores Linux sin
+pantalla) y dibujamos en un framebuffer object. Si EGL no está disponible,
+probamos con OSMesa (renderizado por software); `PYOPENGL_PLATFORM=egl` u
+`osmesa` fuerza una de las dos. Importante: la plataforma de PyOpenGL se
+elige en la primera importación de `OpenGL`, así que hay que llamar a
+`crear_contexto` antes de importar cualquier módulo que use GL.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+
+
+def crear_contexto(ancho: int, alto: int) -> str:
+    """
+    Crea un contexto GL de compatibilidad con un FBO de `ancho` x `alto`
+    (color RGBA8 + profundidad) y lo deja activo.
+
+    Returns:
+        str: la plataforma usada ("egl" u "osmesa").
+    """
+    plataforma = os.environ.get("PYOPENGL_PLATFORM")
+    if plataforma is None and "OpenGL" in sys.modules:
+        raise RuntimeError("OpenGL ya está importado con la plataforma por defecto: "
+                           "hay que llamar a crear_contexto antes de importar módulos que usen GL")
+    if plataforma is None:
+        # Hay que decidir antes de importar `OpenGL`: tanteamos EGL con ctypes.
+        os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+        if _egl_disponible():
+            plataforma = "egl"
+        elif ctypes.util.find_library("OSMesa") is not None:
+            plataforma = "osmesa"
+        else:
+            raise RuntimeError("No hay EGL ni OSMesa para crear un contexto GL sin ventana")
+        os.environ["PYOPENGL_PLATFORM"] = plataforma
+
+    if plataforma == "egl":
+        os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+        _crear_egl()
+    elif plataforma == "osmesa":
+        _crear_osmesa(ancho, alto)
+    else:
+        raise RuntimeError(f"Plataforma sin ventana no soportada: {plataforma}")
+
+    _crear_fbo(ancho, alto)
+    return os.environ["PYOPENGL_PLATFORM"]
+
+
+def _egl_disponible() -> bool:
+    """True si libEGL existe y su pantalla por defecto se puede inicializar."""
+    nombre = ctypes.util.find_library("EGL")
+    if nombre is None:
+        return False
+    try:
+        egl = ctypes.CDLL(nombre)
+    except OSError:
+        return False
+    egl.eglGetDisplay.restype = ctypes.c_void_p
+    egl.eglGetDisplay.argtypes = [ctypes.c_void_p]
+    egl.eglInitialize.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+    pantalla = egl.eglGetDisplay(None)  # EGL_DEFAULT_DISPLAY
+    return bool(pantalla) and bool(egl.eglInitialize(pantalla, None, None))
+
+
+def _crear_egl():
+    from OpenGL import EGL
+
+    pantalla = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    if not EGL.eglInitialize(pantalla, None, None):
+        raise RuntimeError("No se pudo inicializar EGL")
+
+    atributos = (EGL.EGLint * 13)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE,
+    )
+    configuracion = EGL.EGLConfig()
+    num_configuraciones = EGL.EGLint()
+    EGL.eglChooseConfig(pantalla, atributos, ctypes.pointer(configuracion), 1,
+                        ctypes.pointer(num_configuraciones))
+    if num_configuraciones.value == 0:
+        raise RuntimeError("EGL no ofrece ninguna configuración compatible")
+
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    contexto = EGL.eglCreateContext(pantalla, configuracion, EGL.EGL_NO_CONTEXT, None)
+    EGL.eglMakeCurrent(pantalla, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, contexto)
+
+
+def _crear_osmesa(ancho, alto):
+    from OpenGL import GL, arrays
+    from OpenGL.osmesa import OSMesaCreateContextExt, OSMesaMakeCurrent, OSMESA_RGBA
+
+    contexto = OSMesaCreateContextExt(OSMESA_RGBA, 24, 0, 0, None)
+    buffer = arrays.GLubyteArray.zeros((alto, ancho, 4))
+    if not OSMesaMakeCurrent(contexto, buffer, GL.GL_UNSIGNED_BYTE, ancho, alto):
+        raise RuntimeError("No se pudo activar el contexto OSMesa")
+    # Mantenemos el buffer vivo mientras dure el proceso.
+    _crear_osmesa.buffer = buffer
+
+
+def _crear_fbo(ancho, alto):
+    from OpenGL.GL import (
+        glGenFramebuffers, glBindFramebuffer, glGenRenderbuffers, glBindRenderbuffer,
+        glRenderbufferStorage, glFramebufferRenderbuffer, glViewport,
+        GL_FRAMEBUFFER, GL_RENDERBUFFER, GL_RGBA8, GL_DEPTH_COMPONENT24,
+        GL_COLOR_ATTACHMENT0, GL_DEPTH_ATTACHMENT,
+    )
+
+    fbo = glGenFramebuffers(1)
+    glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+    for formato, anclaje in ((GL_RGBA8, GL_COLOR_ATTACHMENT0), (GL_DEPTH_COMPONENT24, GL_DEPTH_ATTACHMENT)):
+        renderbuffer = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, renderbuffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, formato, ancho, alto)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, anclaje, GL_RENDERBUFFER, renderbuffer)
+    glViewport(0, 0, ancho, alto)
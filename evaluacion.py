@@ -0,0 +1,215 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - evaluacion.py
+
+Ejecutor de línea de comandos para jugar muchas partidas sin ventana.
+
+`main.py` abre una ventana y ejecuta una única partida interactiva. Para
+evaluar bots o detectar regresiones en las reglas necesitamos lo contrario:
+miles de partidas con semilla, repartidas entre todos los núcleos de la
+máquina, y un resumen al final.
+
+Funcionamiento:
+
+1. Cada partida `i` usa la semilla `semilla + i`, así que el resultado de una
+   ejecución no depende del número de procesos ni del orden de los trabajos.
+2. Las partidas se reparten en bloques entre un `ProcessPoolExecutor`. Cada
+   proceso juega su bloque con `Simulacion` (sin Pygame ni OpenGL).
+3. Los resultados (puntuación, longitud y pasos de cada partida) se escriben
+   directamente en un array compartido (`multiprocessing.shared_memory`): los
+   procesos no devuelven listas que haya que serializar y copiar.
+
+Ejemplo:
+    python evaluacion.py --partidas 2000 --procesos 8 --politica voraz
+"""
+
+import argparse
+import copy
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from simulacion import Simulacion, ACCIONES, ACCION_NINGUNA
+from topologia import TRANSICIONES
+
+# Una fila por partida en el buffer compartido.
+RESULTADO_DTYPE = np.dtype([
+    ("puntuacion", np.int64),
+    ("longitud", np.int64),
+    ("pasos", np.int64),
+])
+
+# Límite de pasos por defecto: evita partidas infinitas (p. ej. una política
+# que da vueltas sin llegar nunca a la comida).
+MAX_PASOS = 20000
+
+
+# ---------------------------------------------------------------------------
+# Políticas
+# ---------------------------------------------------------------------------
+
+def politica_aleatoria(simulacion, rng) -> int:
+    """Gira al azar en un 30% de los pasos; el resto sigue recto."""
+    if rng.random() < 0.3:
+        return rng.randrange(len(ACCIONES))
+    return ACCION_NINGUNA
+
+
+def _destino(snake, direccion):
+    """
+    Celda a la que llegaría la cabeza avanzando en `direccion`, sin mover la
+    serpiente (misma lógica que `Snake.mover`, sobre una copia del marco).
+    """
+    id_cabeza = snake.topologia.id_celda(*snake.cabeza())
+    orientacion = snake.orientacion
+    id_destino = snake.topologia.vecino(id_cabeza, orientacion.a_cubo(direccion))
+    if id_destino < 0:
+        orientacion = copy.copy(orientacion)
+        orientacion.girar(*TRANSICIONES[direccion])
+        id_destino = snake.topologia.vecino(id_cabeza, orientacion.a_cubo(direccion))
+    return snake.topologia.celda(id_destino)
+
+
+def politica_voraz(simulacion, rng) -> int:
+    """
+    Elige, entre los giros que no chocan en el siguiente paso, el que deja la
+    cabeza más cerca de la comida (distancia Manhattan en el cubo).
+    """
+    snake = simulacion.snake
+    comida = simulacion.comida.posicion
+    if comida is None:
+        return ACCION_NINGUNA
+
+    mejores, mejor_distancia = [], None
+    for accion, direccion in enumerate(ACCIONES):
+        if direccion is None or all(a + b == 0 for a, b in zip(direccion, snake.direccion)):
+            continue
+
+        x, y, z = _destino(snake, direccion)
+        ocupacion = snake.ocupacion.cantidad(x, y, z)
+        if snake.cola() == (x, y, z):
+            ocupacion -= 1
+        if ocupacion > 0:
+            continue
+
+        distancia = abs(x - comida.x) + abs(y - comida.y) + abs(z - comida.z)
+        if mejor_distancia is None or distancia < mejor_distancia:
+            mejores, mejor_distancia = [accion], distancia
+        elif distancia == mejor_distancia:
+            mejores.append(accion)
+
+    if not mejores:
+        return ACCION_NINGUNA
+    return rng.choice(mejores)
+
+
+POLITICAS = {
+    "aleatoria": politica_aleatoria,
+    "voraz": politica_voraz,
+}
+
+
+# ---------------------------------------------------------------------------
+# Trabajo de cada proceso
+# ---------------------------------------------------------------------------
+
+def jugar_partida(semilla: int, politica, max_pasos: int = MAX_PASOS) -> tuple:
+    """Juega una partida completa y devuelve (puntuación, longitud, pasos)."""
+    simulacion = Simulacion(semilla)
+    # La política tiene su propio generador para no alterar la comida.
+    rng = random.Random(semilla ^ 0x5EED)
+    while not simulacion.terminado and simulacion.pasos < max_pasos:
+        simulacion.paso(politica(simulacion, rng))
+    return simulacion.puntuacion, len(simulacion.snake), simulacion.pasos
+
+
+def _jugar_bloque(nombre_memoria, total, inicio, fin, semilla, nombre_politica, max_pasos):
+    """
+    Juega las partidas [inicio, fin) y escribe cada resultado en su fila del
+    buffer compartido.
+    """
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        resultados = np.ndarray((total,), dtype=RESULTADO_DTYPE, buffer=memoria.buf)
+        politica = POLITICAS[nombre_politica]
+        for i in range(inicio, fin):
+            resultados[i] = jugar_partida(semilla + i, politica, max_pasos)
+        del resultados  # Liberamos la vista antes de cerrar la memoria
+    finally:
+        memoria.close()
+    return fin - inicio
+
+
+def evaluar(partidas, procesos=None, semilla=0, politica="voraz",
+            max_pasos=MAX_PASOS, tam_bloque=None) -> np.ndarray:
+    """
+    Juega `partidas` partidas repartidas entre `procesos` procesos.
+
+    Returns:
+        np.ndarray estructurado (RESULTADO_DTYPE) con una fila por partida.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if tam_bloque is None:
+        # Unos 4 bloques por proceso: suficiente para equilibrar la carga sin
+        # multiplicar el coste de lanzar trabajos.
+        tam_bloque = max(1, -(-partidas // (procesos * 4)))
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, partidas * RESULTADO_DTYPE.itemsize))
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            trabajos = [
+                ejecutor.submit(_jugar_bloque, memoria.name, partidas, inicio,
+                                min(inicio + tam_bloque, partidas), semilla, politica, max_pasos)
+                for inicio in range(0, partidas, tam_bloque)
+            ]
+            for trabajo in trabajos:
+                trabajo.result()
+
+        resultados = np.ndarray((partidas,), dtype=RESULTADO_DTYPE, buffer=memoria.buf).copy()
+    finally:
+        memoria.close()
+        memoria.unlink()
+    return resultados
+
+
+def resumen(resultados: np.ndarray) -> dict:
+    """Estadísticas agregadas (media, mínimo, máximo) de cada campo."""
+    datos = {"partidas": int(len(resultados))}
+    for campo in RESULTADO_DTYPE.names:
+        columna = resultados[campo]
+        datos[campo] = {
+            "media": float(columna.mean()) if len(columna) else 0.0,
+            "min": int(columna.min()) if len(columna) else 0,
+            "max": int(columna.max()) if len(columna) else 0,
+        }
+    return datos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Juega partidas de Snake 3D sin ventana y resume los resultados.")
+    parser.add_argument("--partidas", type=int, default=1000, help="Número de partidas.")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos (por defecto, uno por núcleo).")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la primera partida.")
+    parser.add_argument("--politica", choices=sorted(POLITICAS), default="voraz")
+    parser.add_argument("--max-pasos", type=int, default=MAX_PASOS, help="Límite de pasos por partida.")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultados = evaluar(args.partidas, args.procesos, args.semilla, args.politica, args.max_pasos)
+    duracion = time.perf_counter() - inicio
+
+    datos = resumen(resultados)
+    print(f"Partidas: {datos['partidas']}  (política '{args.politica}', semilla {args.semilla})")
+    for campo in RESULTADO_DTYPE.names:
+        estadisticas = datos[campo]
+        print(f"  {campo:<10} media {estadisticas['media']:9.2f}   "
+              f"min {estadisticas['min']:6d}   max {estadisticas['max']:6d}")
+    pasos_totales = int(resultados["pasos"].sum())
+    print(f"Tiempo: {duracion:.2f} s  ({pasos_totales / max(duracion, 1e-9):,.0f} pasos/s)")
+
+
+if __name__ == "__main__":
+    main()
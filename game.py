@@ -23,10 +23,15 @@ from OpenGL.GLU import gluPerspective, gluLookAt
 
 from configuracion import *
 from tablero import Tablero
-from snake import Snake
-from comida import Comida
+from simulacion import Simulacion
+from repeticion import Grabacion, nueva_semilla
+from archivo_repeticiones import EscritorArchivo
 from luces import Iluminacion
+from renderizador import RenderizadorSegmentos
 from input_handler import InputHandler
+from ritmo import Marcapasos
+from perfilador import Perfilador
+from captura import Capturador
 
 from text_renderer import TextRenderer
 
@@ -36,11 +41,25 @@ ESTADO_JUGANDO = 1
 ESTADO_GAMEOVER = 2
 
 class Game:
-    def __init__(self):
+    def __init__(self, modo_ritmo=MODO_RITMO, presupuesto_ms=PRESUPUESTO_FRAME_MS, ruta_perfil=None,
+                 tamano=GRID_SIZE, ruta_grabacion=None, carpeta_capturas=CARPETA_CAPTURAS,
+                 formato_video="png"):
+        # Lado del cubo de esta partida (GRID_SIZE por defecto)
+        self.tamano = tamano
+
         # 1. Inicialización de Pygame y Ventana
         pygame.init()
         display = (SCREEN_WIDTH, SCREEN_HEIGHT)
-        pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+        if modo_ritmo == "vsync":
+            try:
+                pygame.display.set_mode(display, DOUBLEBUF | OPENGL, vsync=1)
+            except pygame.error as error:
+                # Sin soporte de vsync en este driver: seguimos con el límite clásico.
+                print(f"VSync no disponible ({error}); usando el modo 'limitado'")
+                modo_ritmo = "limitado"
+                pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+        else:
+            pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
         pygame.display.set_caption("Snake 3D: Vóxel Planetario")
 
         # 2. Configuración OpenGL
@@ -52,15 +71,40 @@ class Game:
         self.text_renderer = TextRenderer() # Nuevo renderizador de texto
         
         # Inicializamos entidades del juego (se reiniciarán al empezar)
-        self.tablero = Tablero()
+        self.tablero = Tablero(self.tamano)
+        self.renderizador = RenderizadorSegmentos(self.tablero, self.luces)
+        self.simulacion = None
+        self.grabacion = None
         self.snake = None
         self.comida = None
         
         # 4. Estado del Juego
-        self.clock = pygame.time.Clock()
+        self.marcapasos = Marcapasos(modo_ritmo, presupuesto_ms)
+
+        # Perfilador de fases (superposición con F3; volcado opcional al salir)
+        self.perfilador = Perfilador()
+        self.perfilador.registrar("cache texto", self.text_renderer.cache)
+        self.ruta_perfil = ruta_perfil
+        self.mostrar_perfil = False
+        self.lineas_perfil = []
+        self.tiempo_refresco_perfil = 0.0
+
+        # Capturas (F12) y vídeo (F10) sin detener el bucle (ver `captura.py`)
+        self.capturador = Capturador(SCREEN_WIDTH, SCREEN_HEIGHT, carpeta_capturas, formato_video)
+        self.perfilador.registrar("captura", self.capturador)
+
+        # Grabación de partidas: con `ruta_grabacion`, cada partida terminada
+        # se añade al archivo RUTA (ver `archivo_repeticiones.py`).
+        self.ruta_grabacion = ruta_grabacion
+        self.archivo_grabaciones = None
         self.running = True
         self.estado = ESTADO_MENU
         self.score = 0
+
+        # Paso fijo: tiempo acumulado pendiente de convertir en pasos lógicos
+        # y celdas del cuerpo antes del último paso (para interpolar).
+        self.tiempo_acumulado = 0.0
+        self.celdas_anteriores = None
         
         # Variables de rotación del mundo
         self.rot_x = 0.0
@@ -81,18 +125,55 @@ class Game:
         glClearColor(*COLOR_FONDO)
         
         glMatrixMode(GL_PROJECTION)
-        gluPerspective(FOV, SCREEN_ASPECT_RATIO, NEAR_PLANE, FAR_PLANE)
+        # Con cubos grandes la cámara se aleja (ver `_renderizar`): ampliamos el
+        # plano lejano para que la cara trasera siga dentro del frustum.
+        gluPerspective(FOV, SCREEN_ASPECT_RATIO, NEAR_PLANE, max(FAR_PLANE, self.tamano * 5.0))
         glMatrixMode(GL_MODELVIEW)
 
     def reset_game(self):
         """Reinicia la partida: serpiente, comida y puntuación."""
-        self.snake = Snake(self.tablero)
-        self.comida = Comida(self.snake)
+        # Toda la lógica vive en la simulación; aquí solo guardamos accesos
+        # directos a sus entidades para el renderizado y las cámaras.
+        # La semilla es explícita para poder guardarla con la grabación.
+        semilla = nueva_semilla()
+        self.simulacion = Simulacion(semilla, self.tamano)
+        self.grabacion = Grabacion(semilla, self.tamano)
+        self.snake = self.simulacion.snake
+        self.comida = self.simulacion.comida
         self.score = 0
+        self.tiempo_acumulado = 0.0
+        self.celdas_anteriores = None
         self.rot_x = 0.0
         self.rot_y = 0.0
         self.animando = False
 
+    def instantanea(self) -> tuple:
+        """
+        Estado de la partida en curso: la simulación (en O(1), ver
+        `Simulacion.instantanea`), el paso fijo, la rotación del mundo con su
+        animación y la longitud de la grabación.
+        """
+        return (
+            self.simulacion.instantanea(), self.estado, self.score,
+            self.tiempo_acumulado, self.celdas_anteriores,
+            self.rot_x, self.rot_y, self.animando, self.tiempo_animacion,
+            dict(self.inicio_rot), dict(self.meta_rot), len(self.grabacion),
+        )
+
+    def restaurar(self, instantanea: tuple):
+        """
+        Vuelve al estado guardado con `instantanea` (de esta misma partida).
+        La grabación descarta los pasos posteriores.
+        """
+        (simulacion, self.estado, self.score,
+         self.tiempo_acumulado, self.celdas_anteriores,
+         self.rot_x, self.rot_y, self.animando, self.tiempo_animacion,
+         inicio_rot, meta_rot, pasos_grabados) = instantanea
+        self.simulacion.restaurar(simulacion)
+        self.inicio_rot = dict(inicio_rot)
+        self.meta_rot = dict(meta_rot)
+        del self.grabacion.acciones[pasos_grabados:]
+
     def run(self):
         """
         Inicia el bucle principal del juego.
@@ -102,12 +183,27 @@ class Game:
         # Inicializamos objetos para que se vean en el menú de fondo (opcional)
         self.reset_game()
 
+        self.marcapasos.reiniciar()
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
-            self._procesar_input()
-            self._actualizar(dt)
-            self._renderizar()
-        
+            dt = self.marcapasos.esperar()
+            self.perfilador.cerrar_frame(dt)
+
+            with self.perfilador.medir("input"):
+                self._procesar_input()
+            with self.perfilador.medir("actualizar"):
+                self._actualizar(dt)
+            with self.perfilador.medir("renderizar"):
+                self._renderizar()
+
+        if self.estado == ESTADO_JUGANDO:
+            self._guardar_grabacion()  # Partida interrumpida al cerrar la ventana
+        if self.archivo_grabaciones is not None:
+            self.archivo_grabaciones.cerrar()
+        self.capturador.cerrar()
+        print(self.marcapasos.resumen())
+        if self.ruta_perfil:
+            self.perfilador.volcar_csv(self.ruta_perfil + ".csv")
+            self.perfilador.volcar_json(self.ruta_perfil + ".json")
         pygame.quit()
 
     def _procesar_input(self):
@@ -132,10 +228,18 @@ class Game:
             if not self.animando:
                 # Input para la serpiente
                 if self.input.direccion_snake:
-                    self.snake.cambiar_direccion(self.input.direccion_snake)
+                    self.simulacion.cambiar_direccion(self.input.direccion_snake)
                 
                 # --- OPTIMIZACION: Eliminada rotacion manual WASD ---
         
+        if self.input.alternar_perfil:
+            self.mostrar_perfil = not self.mostrar_perfil
+
+        if self.input.captura_pantalla:
+            self.capturador.capturar_pantalla()
+        if self.input.alternar_video:
+            self.capturador.alternar_video()
+
         # Fase 10: Cambio de cámara (Permitido en cualquier estado o restringido según diseño)
         # El usuario pidió "antes de presionar S o R", es decir en MENU o GAMEOVER.
         # Pero para mejor UX, lo permitiremos siempre o al menos en MENU/GAMEOVER.
@@ -155,6 +259,9 @@ class Game:
         if self.estado == ESTADO_JUGANDO:
             if self.animando:
                 self._actualizar_animacion(dt)
+                # La lógica y el temporizador de pasos se detienen durante la
+                # rotación: `tiempo_acumulado` no avanza, y el paso en curso se
+                # completa con normalidad cuando termina la animación.
             else:
                 self._actualizar_juego(dt)
         
@@ -162,6 +269,14 @@ class Game:
         elif self.estado == ESTADO_MENU or self.estado == ESTADO_GAMEOVER:
             self.rot_y += 10.0 * dt # Rotación automática de fondo
 
+        # El texto del perfil solo se regenera dos veces por segundo: es
+        # legible y no obliga a rasterizar texto nuevo en cada frame.
+        if self.mostrar_perfil:
+            self.tiempo_refresco_perfil -= dt
+            if self.tiempo_refresco_perfil <= 0:
+                self.lineas_perfil = self.perfilador.lineas_superposicion()
+                self.tiempo_refresco_perfil = 0.5
+
     def _actualizar_animacion(self, dt):
         self.tiempo_animacion += dt
         t = min(self.tiempo_animacion / TIEMPO_ROTACION_AUTO, 1.0)
@@ -179,36 +294,71 @@ class Game:
         # 1. Rotación manual (ELIMINADA)
         # --- OPTIMIZACION: Eliminada logica WASD ---
 
-        # 2. Actualizar lógica de la serpiente
-        eje_transicion, angulo_transicion = self.snake.actualizar(dt)
-        
+        # 2. Paso fijo: convertimos el tiempo acumulado en pasos lógicos
+        # conservando el sobrante, de modo que la velocidad media es
+        # exactamente 1 / TIEMPO_PASO y un frame lento recupera los pasos
+        # perdidos (hasta MAX_PASOS_POR_FRAME).
+        self.tiempo_acumulado += dt
+        pasos = 0
+        while self.tiempo_acumulado >= TIEMPO_PASO:
+            if pasos == MAX_PASOS_POR_FRAME:
+                self.tiempo_acumulado %= TIEMPO_PASO
+                break
+            self.tiempo_acumulado -= TIEMPO_PASO
+            pasos += 1
+            if not self._paso_logico():
+                break
+
+    def _paso_logico(self) -> bool:
+        """
+        Ejecuta un paso de la simulación y reacciona a su resultado.
+
+        Returns:
+            bool: True si la partida sigue sin transición en curso (podemos
+            seguir encadenando pasos en este frame).
+        """
+        self.celdas_anteriores = self.snake.celdas()
+        accion = self.simulacion.accion_pendiente()
+        resultado = self.simulacion.paso(accion)
+        self.grabacion.registrar(accion)
+        self.score = self.simulacion.puntuacion
+
         # Verificar muerte
         if not self.snake.vivo:
+            print("Game Over: Autocolisión detectada")
             self.estado = ESTADO_GAMEOVER
-            return
+            self._guardar_grabacion()
+            return False
 
         # 3. Detectar transiciones de cara (Rotación Automática)
-        if eje_transicion:
-            self._iniciar_transicion(eje_transicion, angulo_transicion)
-        
-        # 4. Detectar colisión con comida
-        head = self.snake.segmentos[0]
-        if self.comida.posicion and \
-           head.x == self.comida.posicion.x and \
-           head.y == self.comida.posicion.y and \
-           head.z == self.comida.posicion.z:
-            
-            self.snake.crecer()
-            self.score += PUNTOS_POR_COMIDA # Sumar puntos
-            self.comida.generar_nueva_posicion()
+        if resultado.eje:
+            self._iniciar_transicion(resultado.eje, resultado.angulo)
+
+        # 4. Efecto visual al comer
+        if resultado.comio:
             self.luces.trigger_flash() # Disparar flash visual
 
+        # Si no queda ninguna celda libre, la partida ha terminado.
+        if resultado.terminado:
+            print("Tablero completo: no quedan celdas libres")
+            self.estado = ESTADO_GAMEOVER
+            self._guardar_grabacion()
+            return False
+
+        return not self.animando
+
+    def _guardar_grabacion(self):
+        """Añade la partida actual al archivo de grabaciones, si se pidió con `ruta_grabacion`."""
+        if not self.ruta_grabacion:
+            return
+        if self.archivo_grabaciones is None:
+            self.archivo_grabaciones = EscritorArchivo(self.ruta_grabacion)
+        numero = self.archivo_grabaciones.agregar(self.grabacion, self.simulacion.puntuacion, len(self.snake))
+        print(f"Partida #{numero} grabada en {self.ruta_grabacion} ({len(self.grabacion)} pasos)")
+
     def _iniciar_transicion(self, eje, angulo):
         self.animando = True
         self.tiempo_animacion = 0.0
-        
-        # Rotamos la comida solidariamente
-        self.comida.rotar_coordenadas(eje, angulo)
 
         # Preparamos la interpolación visual
         # Ajuste de "pop": retrocedemos la vista para compensar el salto lógico
@@ -228,12 +378,32 @@ class Game:
             self.meta_rot['x'] = self.rot_x
             self.meta_rot['y'] = self.inicio_rot['y'] + angulo
 
+    def _alfa_interpolacion(self) -> float:
+        """Fracción del paso lógico en curso ya transcurrida, en [0, 1]."""
+        if self.estado != ESTADO_JUGANDO:
+            return 1.0
+        return min(self.tiempo_acumulado / TIEMPO_PASO, 1.0)
+
+    def _posicion_cabeza(self):
+        """
+        Posición de mundo (en el marco de la vista) de la cabeza, interpolada
+        igual que en el renderizador para que las cámaras no vayan a saltos.
+        """
+        actual = self.tablero.obtener_posicion_mundo(*self.snake.cabeza_en_vista())
+        alfa = self._alfa_interpolacion()
+        if self.celdas_anteriores is None or alfa >= 1.0:
+            return actual
+
+        x, y, z = (int(c) for c in self.celdas_anteriores[0])
+        anterior = self.tablero.obtener_posicion_mundo(*self.snake.orientacion.a_vista(x, y, z))
+        return tuple(a + (b - a) * alfa for a, b in zip(anterior, actual))
+
     def _renderizar(self):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glLoadIdentity()
 
         # Cámara
-        dist = GRID_SIZE * 2.5
+        dist = self.tamano * 2.5
         
         if self.camara_actual == 1:
             # Cámara 1: Default (Isométrica)
@@ -249,10 +419,9 @@ class Game:
         elif self.camara_actual == 3:
             # Cámara 3: Tercera Persona (Dinámica)
             # Sigue a la cabeza de la serpiente
-            if self.snake and self.snake.segmentos:
-                head = self.snake.segmentos[0]
-                # Obtenemos la posición real en el mundo
-                hx, hy, hz = self.tablero.obtener_posicion_mundo(head.x, head.y, head.z)
+            if self.snake and len(self.snake):
+                # Obtenemos la posición real en el mundo (en el marco de la vista)
+                hx, hy, hz = self._posicion_cabeza()
                 
                 # La cámara se posiciona con un offset relativo a la cabeza
                 cx = hx + CAMARA_3_OFFSET[0]
@@ -269,9 +438,8 @@ class Game:
 
         elif self.camara_actual == 4:
             # Cámara 4: Primera Persona (Snake View)
-            if self.snake and self.snake.segmentos:
-                head = self.snake.segmentos[0]
-                hx, hy, hz = self.tablero.obtener_posicion_mundo(head.x, head.y, head.z)
+            if self.snake and len(self.snake):
+                hx, hy, hz = self._posicion_cabeza()
                 
                 # Dirección de la serpiente
                 dx, dy, dz = self.snake.direccion
@@ -302,6 +470,15 @@ class Game:
         Dibuja los objetos de la escena (luces, mundo, entidades).
         Separado de _renderizar para reutilizarlo con distintas cámaras.
         """
+        with self.perfilador.medir("escena"):
+            self._dibujar_escena()
+        # La imagen se lee antes del flip: después el back buffer es indefinido.
+        with self.perfilador.medir("captura"):
+            self.capturador.procesar_frame()
+        with self.perfilador.medir("flip"):
+            pygame.display.flip()
+
+    def _dibujar_escena(self):
         # Actualizar luces (necesario para el efecto flash en objetos)
         self.luces.activar()
 
@@ -310,27 +487,43 @@ class Game:
         glRotatef(self.rot_x, 1, 0, 0)
         glRotatef(self.rot_y, 0, 1, 0)
 
-        # Dibujar entidades
-        if self.snake: self.snake.dibujar()
-        if self.comida: self.comida.dibujar(self.tablero)
-        self.tablero.dibujar()
+        # Las entidades guardan coordenadas fijas del cubo: la matriz de
+        # orientación las lleva al marco de la cara frontal actual.
+        if self.snake:
+            glMultMatrixf(self.snake.orientacion.matriz_gl())
+
+        # Dibujar entidades (serpiente + comida en una sola llamada instanciada)
+        with self.perfilador.medir("entidades"):
+            self.renderizador.dibujar(self.snake, self.comida,
+                                      self.celdas_anteriores, self._alfa_interpolacion())
+        with self.perfilador.medir("tablero"):
+            self.tablero.dibujar()
 
         glPopMatrix()
         
         # --- RENDERIZADO DE UI (2D) ---
-        if self.estado == ESTADO_MENU:
-            self.text_renderer.dibujar_texto("SNAKE 3D PLANETARIO", 20, 20, "large")
-            self.text_renderer.dibujar_texto("Press 'S' to Start", 20, 80, "small")
-            self.text_renderer.dibujar_texto("Select Camera: '1' (Iso) / '2' (Front) / '3' (Follow) / '4' (FPS)", 20, 120, "small")
-            self.text_renderer.dibujar_texto("Controls: Arrows to Move", 20, 160, "small")
+        with self.perfilador.medir("texto"):
+            if self.estado == ESTADO_MENU:
+                self.text_renderer.dibujar_texto("SNAKE 3D PLANETARIO", 20, 20, "large")
+                self.text_renderer.dibujar_texto("Press 'S' to Start", 20, 80, "small")
+                self.text_renderer.dibujar_texto("Select Camera: '1' (Iso) / '2' (Front) / '3' (Follow) / '4' (FPS)", 20, 120, "small")
+                self.text_renderer.dibujar_texto("Controls: Arrows to Move", 20, 160, "small")
             
-        elif self.estado == ESTADO_JUGANDO:
-            self.text_renderer.dibujar_texto(f"Score: {self.score}", 20, 20, "large")
+            elif self.estado == ESTADO_JUGANDO:
+                self.text_renderer.dibujar_texto(f"Score: {self.score}", 20, 20, "large")
             
-        elif self.estado == ESTADO_GAMEOVER:
-            self.text_renderer.dibujar_texto("GAME OVER", 20, 20, "large")
-            self.text_renderer.dibujar_texto(f"Final Score: {self.score}", 20, 80, "large")
-            self.text_renderer.dibujar_texto("Press 'R' to Restart", 20, 140, "small")
+            elif self.estado == ESTADO_GAMEOVER:
+                self.text_renderer.dibujar_texto("GAME OVER", 20, 20, "large")
+                self.text_renderer.dibujar_texto(f"Final Score: {self.score}", 20, 80, "large")
+                self.text_renderer.dibujar_texto("Press 'R' to Restart", 20, 140, "small")
+
+            if self.mostrar_perfil:
+                for i, (nivel, linea) in enumerate(self.lineas_perfil):
+                    self.text_renderer.dibujar_texto(linea, SCREEN_WIDTH - 420 + nivel * 20, 20 + i * 28,
+                                                     "small", cachear=False)
+
+            # Toda la interfaz sale en una sola llamada de dibujo
+            self.text_renderer.presentar()
 
         # --- EFECTO FLASH (Overlay 2D) ---
         # Implementación Híbrida:
@@ -349,7 +542,6 @@ class Game:
             glLoadIdentity()
             
             glDisable(GL_DEPTH_TEST)
-            glDisable(GL_LIGHTING) # Importante: color puro sin luces
             glEnable(GL_BLEND)
             glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
             
@@ -365,12 +557,9 @@ class Game:
             glEnd()
             
             glEnable(GL_DEPTH_TEST)
-            glEnable(GL_LIGHTING)
             glDisable(GL_BLEND)
             
             glPopMatrix()
             glMatrixMode(GL_PROJECTION)
             glPopMatrix()
             glMatrixMode(GL_MODELVIEW)
-
-        pygame.display.flip()
@@ -17,6 +17,8 @@ Funcionalidades implementadas:
 - Mapeo de flechas a direcciones de la serpiente.
 - Acciones de menú (S para iniciar, R para reiniciar).
 - Selección de cámara (teclas 1-4).
+- Superposición del perfilador de rendimiento (F3).
+- Captura de pantalla (F12) y grabación de vídeo (F10).
 """
 
 import pygame
@@ -47,6 +49,9 @@ class InputHandler:
         self.camara_2 = False
         self.camara_3 = False
         self.camara_4 = False
+        self.alternar_perfil = False
+        self.captura_pantalla = False
+        self.alternar_video = False
 
 
         # 2. Procesar cola de eventos (pulsaciones discretas)
@@ -76,6 +81,12 @@ class InputHandler:
                     self.camara_3 = True
                 elif event.key == K_4:
                     self.camara_4 = True
+                elif event.key == K_F3:
+                    self.alternar_perfil = True
+                elif event.key == K_F12:
+                    self.captura_pantalla = True
+                elif event.key == K_F10:
+                    self.alternar_video = True
 
         # 3. Procesar estado continuo (teclas mantenidas para rotación manual)
         # --- OPTIMIZACION: Eliminado WASD por redundancia ---
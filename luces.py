@@ -14,15 +14,19 @@ Además de la iluminación estática, este módulo gestiona el efecto de
 "Flash" que se activa cuando la serpiente come. Este feedback visual
 refuerza la sensación de logro del jugador mediante un destello de luz
 que ilumina momentáneamente toda la escena.
+
+Los parámetros de la luz ya no se cargan en `GL_LIGHT0` cada frame: se suben
+como uniforms a los shaders (`shaders.py`), que también aplican el flash.
 """
 
-from OpenGL.GL import *
+import numpy as np
+from OpenGL.GL import glGetFloatv, GL_MODELVIEW_MATRIX
 
 
 class Iluminacion:
     """
-    Clase que encapsula la configuración de iluminación OpenGL y el sistema
-    de efectos visuales dinámicos (flash al comer).
+    Clase que encapsula la configuración de iluminación y el sistema de
+    efectos visuales dinámicos (flash al comer).
     
     La iluminación se compone de tres elementos:
     - Luz ambiental: Iluminación base que afecta a todos los objetos.
@@ -34,13 +38,17 @@ class Iluminacion:
         self.luz_posicion = [10.0, 10.0, 10.0, 1.0]
         
         # Configuración base de intensidad
+        self.ambiente_global = [0.2, 0.2, 0.2] # El valor por defecto de GL_LIGHT_MODEL_AMBIENT
         self.base_ambiental = [0.3, 0.3, 0.3, 1.0]
         self.base_difusa = [0.8, 0.8, 0.8, 1.0]
-        
-        # Estado actual (puede variar por el flash)
-        self.luz_ambiental = list(self.base_ambiental)
-        self.luz_difusa = list(self.base_difusa)
         self.luz_especular = [1.0, 1.0, 1.0, 1.0]
+
+        # Material: brillo especular blanco
+        self.material_especular = [1.0, 1.0, 1.0]
+        self.brillo = 50.0
+
+        # Posición de la luz en espacio de ojo (se fija en `activar`)
+        self.posicion_ojo = np.array(self.luz_posicion[:3], dtype=np.float32)
         
         # Variables para el efecto Flash
         self.flash_intensity = 0.0
@@ -52,47 +60,33 @@ class Iluminacion:
         self.flash_intensity = 1.0
 
     def update(self, dt):
-        """Actualiza la intensidad del flash frame a frame."""
+        """
+        Actualiza la intensidad del flash frame a frame.
+        El aclarado de la luz hacia el blanco lo aplica el shader a partir de
+        `flash_intensity` (ambiental +0.7, difusa +0.2).
+        """
         if self.flash_intensity > 0:
             self.flash_intensity -= self.flash_decay * dt
             if self.flash_intensity < 0:
                 self.flash_intensity = 0
-            
-            # Mezclamos el color base con blanco puro según la intensidad del flash
-            # Ambiental: 0.3 -> 1.0
-            # Difusa: 0.8 -> 1.0
-            
-            fi = self.flash_intensity
-            self.luz_ambiental = [
-                min(1.0, self.base_ambiental[0] + fi * 0.7),
-                min(1.0, self.base_ambiental[1] + fi * 0.7),
-                min(1.0, self.base_ambiental[2] + fi * 0.7),
-                1.0
-            ]
-            self.luz_difusa = [
-                min(1.0, self.base_difusa[0] + fi * 0.2),
-                min(1.0, self.base_difusa[1] + fi * 0.2),
-                min(1.0, self.base_difusa[2] + fi * 0.2),
-                1.0
-            ]
-        else:
-            # Restaurar valores base si no hay flash (optimización)
-            self.luz_ambiental = list(self.base_ambiental)
-            self.luz_difusa = list(self.base_difusa)
 
     def activar(self):
-        glEnable(GL_LIGHTING)
-        glEnable(GL_LIGHT0)
-        
-        glLightfv(GL_LIGHT0, GL_POSITION, self.luz_posicion)
-        glLightfv(GL_LIGHT0, GL_AMBIENT, self.luz_ambiental)
-        glLightfv(GL_LIGHT0, GL_DIFFUSE, self.luz_difusa)
-        glLightfv(GL_LIGHT0, GL_SPECULAR, self.luz_especular)
-        
-        # Configuración de material para que los colores de los objetos reaccionen a la luz
-        glEnable(GL_COLOR_MATERIAL)
-        glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
-        
-        # Brillo especular
-        glMaterialfv(GL_FRONT, GL_SPECULAR, [1.0, 1.0, 1.0, 1.0])
-        glMaterialf(GL_FRONT, GL_SHININESS, 50.0)
+        """
+        Fija la posición de la luz con la matriz de vista actual, igual que
+        hacía `glLightfv(GL_POSITION)`: debe llamarse tras colocar la cámara
+        y antes de rotar el mundo.
+        """
+        vista = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=np.float32).reshape(4, 4).T
+        posicion = vista @ np.asarray(self.luz_posicion, dtype=np.float32)
+        self.posicion_ojo = posicion[:3] / posicion[3]
+
+    def subir_uniforms(self, programa):
+        """Sube el estado de la luz y del flash a un `ProgramaShader` en uso."""
+        programa.uniform_3f("luz_posicion", self.posicion_ojo)
+        programa.uniform_3f("ambiente_global", self.ambiente_global)
+        programa.uniform_3f("luz_ambiente", self.base_ambiental)
+        programa.uniform_3f("luz_difusa", self.base_difusa)
+        programa.uniform_3f("luz_especular", self.luz_especular)
+        programa.uniform_3f("material_especular", self.material_especular)
+        programa.uniform_1f("brillo", self.brillo)
+        programa.uniform_1f("intensidad_flash", self.flash_intensity)
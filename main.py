@@ -17,10 +17,35 @@ Esta separación nos permite:
   línea de comandos o modos de ejecución alternativos).
 """
 
+import argparse
+
+from configuracion import GRID_SIZE, MODO_RITMO, PRESUPUESTO_FRAME_MS, CARPETA_CAPTURAS
+from captura import FORMATOS_VIDEO
 from game import Game
+from ritmo import MODOS_RITMO
 
 def main():
-    juego = Game()
+    parser = argparse.ArgumentParser(description="Snake 3D: Vóxel Planetario")
+    parser.add_argument("--ritmo", choices=MODOS_RITMO, default=MODO_RITMO,
+                        help="Modo de ritmo de frames (ver ritmo.py).")
+    parser.add_argument("--presupuesto-ms", type=float, default=PRESUPUESTO_FRAME_MS,
+                        help="Duración objetivo de cada frame en los modos 'limitado' y 'precision'.")
+    parser.add_argument("--perfil", metavar="RUTA", default=None,
+                        help="Al salir, vuelca el perfil de frames en RUTA.csv y RUTA.json.")
+    parser.add_argument("--grabar", metavar="RUTA", default=None,
+                        help="Añade cada partida al archivo de grabaciones RUTA (ver archivo_repeticiones.py).")
+    parser.add_argument("--capturas", metavar="CARPETA", default=CARPETA_CAPTURAS,
+                        help="Carpeta de las capturas (F12) y los vídeos (F10).")
+    parser.add_argument("--formato-video", choices=FORMATOS_VIDEO, default="png",
+                        help="Vídeo como secuencia de PNG o como RGBA crudo (ver captura.py).")
+    parser.add_argument("--tamano", type=int, default=GRID_SIZE,
+                        help="Lado del cubo en celdas (por ejemplo, 64 o 128).")
+    args = parser.parse_args()
+    if args.tamano < 4:
+        parser.error("--tamano debe ser al menos 4 (la serpiente inicial ocupa 3 celdas)")
+
+    juego = Game(args.ritmo, args.presupuesto_ms, args.perfil, args.tamano, args.grabar,
+                 args.capturas, args.formato_video)
     juego.run()
 
 if __name__ == "__main__":
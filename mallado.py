@@ -0,0 +1,294 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - mallado.py
+
+Este módulo convierte las celdas de superficie del tablero en buffers de
+vértices compactos, listos para subir a la GPU.
+
+Hasta ahora `Tablero` compilaba, por cada celda de superficie, un cubo
+completo de 6 caras (24 vértices) más 12 aristas (otros 24 vértices). Con
+GRID_SIZE = 15 eso son ~1.200 cubos y ~56.000 vértices; con N = 64, más de
+un millón. La mayoría de esas caras quedan entre dos celdas vecinas y solo
+acumulan capas de cristal unas encima de otras.
+
+El mallado tiene dos partes:
+
+1. **Relleno (cristal)**: solo conservamos las caras que no tocan otra celda
+   de superficie (las que miran al exterior del cubo o a su interior hueco).
+   Después fusionamos las caras coplanarias contiguas en rectángulos
+   ("greedy meshing"): cada cara del cubo grande queda en muy pocos quads,
+   independientemente de N. Los rectángulos cubren también la separación
+   entre celdas, de modo que el relleno se ve como una lámina continua de
+   cristal con dos capas (exterior e interior), igual que el rayo que
+   atravesaba antes un minicubo.
+
+2. **Aristas (wireframe)**: son las que dibujan la rejilla, así que se
+   mantienen por celda, pero indexadas: 8 vértices compartidos por celda en
+   lugar de 24 repetidos.
+
+Todo el cálculo está vectorizado con NumPy salvo la fusión de rectángulos,
+que recorre las filas de cada plano (N iteraciones por plano).
+
+Orden de la transparencia: el cristal se dibuja con mezcla alfa y sin
+escribir profundidad, así que el resultado depende del orden. Dos
+primitivas del mismo color y alfa dan el mismo resultado en cualquier
+orden, de modo que solo importa cómo se intercalan relleno y aristas. Por
+eso agrupamos la geometría por "losas" (las 6 caras del cubo grande, cada
+una con su quad exterior, sus aristas y su quad interior) y `orden_losas`
+da, para cada región de la cámara, el orden de atrás hacia delante.
+
+Bloques: para cubos grandes (128³ y más) cada losa se divide en bloques de
+`LADO_BLOQUE_TABLERO` × `LADO_BLOQUE_TABLERO` celdas. Cada bloque tiene sus
+propios tramos de índices (relleno exterior, relleno interior y aristas)
+y su caja envolvente, de modo que `Tablero` puede descartar los que quedan
+fuera del campo de visión. Dentro de cada buffer, los bloques de una misma
+losa son contiguos.
+"""
+
+import numpy as np
+
+from configuracion import TAMANO_CELDA, LADO_BLOQUE_TABLERO
+from topologia import DIRECCIONES_CUBO
+
+# Medio lado visual de cada minicubo de cristal (Fase 11: 0.4 para separar
+# visualmente las celdas).
+MEDIO_LADO = 0.4
+
+# Esquinas de un cubo unitario y sus 12 aristas como pares de índices.
+_ESQUINAS_CUBO = np.array(
+    [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32
+)
+_ARISTAS_CUBO = np.array([
+    (0, 1), (2, 3), (4, 5), (6, 7),  # Paralelas al eje Z
+    (0, 2), (1, 3), (4, 6), (5, 7),  # Paralelas al eje Y
+    (0, 4), (1, 5), (2, 6), (3, 7),  # Paralelas al eje X
+], dtype=np.uint32).ravel()
+
+
+# Cada cara del cubo grande es una losa (eje, lado): la losa k es la de la
+# dirección k de `DIRECCIONES_CUBO` (su normal exterior).
+LOSAS = tuple(
+    (int(np.flatnonzero(direccion)[0]), int(sum(direccion))) for direccion in DIRECCIONES_CUBO
+)
+EXTERIOR, INTERIOR = "exterior", "interior"
+
+
+def _tipo_indice(num_vertices: int):
+    """Índices de 16 bits siempre que quepan; de 32 bits en tableros grandes."""
+    return np.uint16 if num_vertices <= 0xFFFF else np.uint32
+
+
+def _rectangulos(mascara: np.ndarray) -> list:
+    """
+    Fusión "greedy" de una máscara 2D de caras visibles.
+
+    Recorre las filas buscando tramos contiguos de `True`. Un tramo que se
+    repite con los mismos extremos en la fila siguiente prolonga el
+    rectángulo abierto en lugar de abrir uno nuevo.
+
+    Returns:
+        list: rectángulos (fila_inicio, fila_fin, col_inicio, col_fin), con
+        los extremos finales excluidos.
+    """
+    rectangulos = []
+    abiertos = {}
+    relleno = np.zeros(mascara.shape[1] + 2, dtype=np.int8)
+    for fila in range(mascara.shape[0] + 1):
+        tramos = ()
+        if fila < mascara.shape[0]:
+            relleno[1:-1] = mascara[fila]
+            cambios = np.flatnonzero(np.diff(relleno))
+            tramos = zip(cambios[::2].tolist(), cambios[1::2].tolist())
+
+        siguientes = {}
+        for tramo in tramos:
+            siguientes[tramo] = abiertos.pop(tramo, fila)
+        for (col_inicio, col_fin), fila_inicio in abiertos.items():
+            rectangulos.append((fila_inicio, fila, col_inicio, col_fin))
+        abiertos = siguientes
+    return rectangulos
+
+
+def _ejes_losa(losa: int) -> tuple:
+    """Eje normal de la losa, su lado y los dos ejes de su plano (u, v)."""
+    eje, lado = LOSAS[losa]
+    u, v = [e for e in range(3) if e != eje]
+    return eje, lado, u, v
+
+
+def num_bloques(size: int, lado_bloque: int = LADO_BLOQUE_TABLERO) -> int:
+    """Bloques totales del tablero: 6 losas de ceil(N / lado)² bloques."""
+    por_eje = -(-size // lado_bloque)
+    return len(LOSAS) * por_eje * por_eje
+
+
+def _bloque_de(losa, cu, cv, size: int, lado_bloque: int):
+    """Índice de bloque de una celda de la losa con coordenadas de plano (cu, cv)."""
+    por_eje = -(-size // lado_bloque)
+    return (losa * por_eje + cu // lado_bloque) * por_eje + cv // lado_bloque
+
+
+def cajas_bloques(topologia, lado_bloque: int = LADO_BLOQUE_TABLERO):
+    """
+    Losa y caja envolvente (en coordenadas de mundo) de cada bloque.
+
+    Returns:
+        tuple: (losa int32 (B,), minimo float32 (B, 3), maximo float32 (B, 3)).
+    """
+    size = topologia.size
+    cm = topologia.coordenada_mundo
+    hs = MEDIO_LADO * TAMANO_CELDA
+    por_eje = -(-size // lado_bloque)
+
+    total = num_bloques(size, lado_bloque)
+    losa = np.repeat(np.arange(len(LOSAS), dtype=np.int32), por_eje * por_eje)
+    minimo = np.empty((total, 3), dtype=np.float32)
+    maximo = np.empty((total, 3), dtype=np.float32)
+
+    inicio = np.arange(por_eje) * lado_bloque
+    fin = np.minimum(inicio + lado_bloque, size) - 1
+    for k in range(len(LOSAS)):
+        eje, lado, u, v = _ejes_losa(k)
+        tramo = slice(k * por_eje * por_eje, (k + 1) * por_eje * por_eje)
+        capa = size - 1 if lado > 0 else 0
+        minimo[tramo, eje] = cm[capa] - hs
+        maximo[tramo, eje] = cm[capa] + hs
+        minimo[tramo, u] = np.repeat(cm[inicio] - hs, por_eje)
+        maximo[tramo, u] = np.repeat(cm[fin] + hs, por_eje)
+        minimo[tramo, v] = np.tile(cm[inicio] - hs, por_eje)
+        maximo[tramo, v] = np.tile(cm[fin] + hs, por_eje)
+    return losa, minimo, maximo
+
+
+def mallar_relleno(topologia, lado_bloque: int = LADO_BLOQUE_TABLERO):
+    """
+    Genera los triángulos del relleno de cristal: caras sin vecino de
+    superficie, fusionadas por planos dentro de cada bloque.
+
+    Returns:
+        tuple: (vertices float32 (V, 3), indices uint16/uint32 (I,), tramos)
+        para dibujar con `GL_TRIANGLES`. `tramos[tipo]` (EXTERIOR o
+        INTERIOR) es un array (B, 2) con el primer índice y el número de
+        índices de ese quad en cada bloque.
+    """
+    size = topologia.size
+    cm = topologia.coordenada_mundo
+    hs = MEDIO_LADO * TAMANO_CELDA
+    superficie = topologia.superficie
+    por_eje = -(-size // lado_bloque)
+
+    grupos = {}
+    for k, direccion in enumerate(DIRECCIONES_CUBO):
+        eje, signo, u, v = _ejes_losa(k)
+
+        # Caras visibles: sin celda de superficie contigua en esa dirección.
+        visibles = superficie[topologia.vecinos[:, k] < 0]
+        for capa in np.unique(visibles[:, eje]).tolist():
+            en_capa = visibles[visibles[:, eje] == capa]
+            mascara = np.zeros((size, size), dtype=bool)
+            mascara[en_capa[:, u], en_capa[:, v]] = True
+
+            # La capa 0 pertenece a la losa del lado negativo y la N-1 a la
+            # del positivo; la cara es exterior si mira hacia fuera de su losa.
+            lado = 1 if capa == size - 1 else -1
+            losa = LOSAS.index((eje, lado))
+            tipo = EXTERIOR if signo == lado else INTERIOR
+
+            plano = cm[capa] + signo * hs
+            for bu in range(por_eje):
+                for bv in range(por_eje):
+                    fu, fv = bu * lado_bloque, bv * lado_bloque
+                    parte = mascara[fu:fu + lado_bloque, fv:fv + lado_bloque]
+                    bloque = _bloque_de(losa, fu, fv, size, lado_bloque)
+                    for fila_inicio, fila_fin, col_inicio, col_fin in _rectangulos(parte):
+                        u0, u1 = cm[fu + fila_inicio] - hs, cm[fu + fila_fin - 1] + hs
+                        v0, v1 = cm[fv + col_inicio] - hs, cm[fv + col_fin - 1] + hs
+                        esquinas = np.empty((4, 3), dtype=np.float32)
+                        esquinas[:, eje] = plano
+                        esquinas[:, u] = (u0, u1, u1, u0)
+                        esquinas[:, v] = (v0, v0, v1, v1)
+                        # Sentido antihorario visto desde el lado de la normal.
+                        if (signo > 0) != ((v - u) % 3 == 1):
+                            esquinas = esquinas[::-1]
+                        grupos.setdefault((bloque, tipo), []).append(esquinas)
+
+    total = num_bloques(size, lado_bloque)
+    quads = []
+    tramos = {tipo: np.zeros((total, 2), dtype=np.int64) for tipo in (EXTERIOR, INTERIOR)}
+    for bloque in range(total):
+        for tipo in (EXTERIOR, INTERIOR):
+            grupo = grupos.get((bloque, tipo), [])
+            tramos[tipo][bloque] = (len(quads) * 6, len(grupo) * 6)
+            quads.extend(grupo)
+
+    if not quads:
+        return np.zeros((0, 3), dtype=np.float32), np.zeros(0, dtype=np.uint16), tramos
+
+    vertices = np.concatenate(quads)
+    base = np.arange(0, len(vertices), 4, dtype=np.uint32)[:, None]
+    indices = (base + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).ravel()
+    return vertices, indices.astype(_tipo_indice(len(vertices))), tramos
+
+
+def mallar_aristas(topologia, lado_bloque: int = LADO_BLOQUE_TABLERO):
+    """
+    Genera el wireframe de cada celda de superficie con vértices compartidos:
+    8 esquinas por celda y 24 índices (12 aristas), agrupadas por bloque. Las
+    celdas de aristas y esquinas del cubo grande van con la primera losa
+    (por eje) a la que pertenecen.
+
+    Returns:
+        tuple: (vertices float32 (V, 3), indices uint16/uint32 (I,), tramos)
+        para dibujar con `GL_LINES`. `tramos` es un array (B, 2) con el
+        primer índice y el número de índices de las aristas de cada bloque.
+    """
+    hs = MEDIO_LADO * TAMANO_CELDA
+    superficie = topologia.superficie
+    size = topologia.size
+    filas = np.arange(len(superficie))
+
+    # Losa de cada celda: primer eje en el que está en el borde.
+    en_borde = (superficie == 0) | (superficie == size - 1)
+    eje = np.argmax(en_borde, axis=1)
+    negativa = superficie[filas, eje] == 0
+    losa = 2 * eje + negativa  # Mismo orden que LOSAS: (x,+), (x,-), (y,+)...
+
+    # Coordenadas de plano (u, v): los dos ejes restantes en orden creciente.
+    u = np.where(eje == 0, 1, 0)
+    v = np.where(eje == 2, 1, 2)
+    bloque = _bloque_de(losa, superficie[filas, u], superficie[filas, v], size, lado_bloque)
+
+    total = num_bloques(size, lado_bloque)
+    orden = np.argsort(bloque, kind="stable")
+    conteo = np.bincount(bloque, minlength=total)
+    inicio = np.concatenate([[0], np.cumsum(conteo)[:-1]])
+    tramos = np.stack([inicio * 24, conteo * 24], axis=1).astype(np.int64)
+
+    posiciones = topologia.posiciones_superficie[orden].astype(np.float32)
+    vertices = (posiciones[:, None, :] + _ESQUINAS_CUBO[None, :, :] * hs).reshape(-1, 3)
+    base = np.arange(0, len(vertices), 8, dtype=np.uint32)[:, None]
+    indices = (base + _ARISTAS_CUBO[None, :]).ravel()
+    return vertices, indices.astype(_tipo_indice(len(vertices))), tramos
+
+
+def orden_losas(region: tuple) -> list:
+    """
+    Orden de dibujo de atrás hacia delante de las losas, según la región en
+    la que está la cámara (en coordenadas del tablero).
+
+    :param region: (rx, ry, rz) con -1 / +1 si la cámara está más allá de la
+                   cara negativa / positiva del cubo en ese eje y 0 si está
+                   entre ambas. Las 8 combinaciones sin ceros son los
+                   octantes; los ceros cubren las cámaras frontales o
+                   cercanas, que quedan a la altura de alguna cara.
+    :return: lista de (losa, frontal). Una losa es frontal si la cámara ve
+             su cara exterior.
+    """
+    opuestas, laterales, frontales = [], [], []
+    for k, (eje, lado) in enumerate(LOSAS):
+        if region[eje] == lado:
+            frontales.append(k)
+        elif region[eje] == -lado:
+            opuestas.append(k)  # Justo detrás de una losa frontal: las más lejanas
+        else:
+            laterales.append(k)
+    return [(k, False) for k in opuestas + laterales] + [(k, True) for k in frontales]
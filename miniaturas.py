@@ -0,0 +1,214 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - miniaturas.py
+
+Miniaturas de partidas sin ventana, para generarlas en servidores Linux sin
+pantalla ni GPU.
+
+`RenderizadorMiniaturas` crea un único contexto sin ventana (EGL u OSMesa,
+ver `contexto.py`) con un framebuffer del tamaño de la miniatura y dibuja en
+él la misma escena que `Game._dibujar_escena` con la cámara 1 (o la 2): luces,
+serpiente y comida instanciadas y tablero. No incluye la interfaz 2D.
+
+El estado de partida se recibe serializado como una grabación (ver
+`repeticion.py`) y un paso: la grabación se reproduce sin dibujar hasta ese
+paso y se dibuja el resultado. La imagen sale como bytes PNG
+(`captura.codificar_png`).
+
+Para miniaturas en lote, lo caro de preparar se hace una sola vez y se
+reutiliza entre partidas: el contexto, los shaders y un `Tablero` (con su
+malla ya subida a la GPU) por cada lado de cubo distinto. Por partida solo
+quedan la simulación, un frame y la codificación del PNG.
+
+Ejemplos:
+    python miniaturas.py partida.rep --salida miniaturas
+    python miniaturas.py partidas.arc --puntuacion-minima 200 --paso 1000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from configuracion import (
+    COLOR_FONDO, FOV, NEAR_PLANE, FAR_PLANE, CAMARA_1_POS, CAMARA_2_POS,
+    MINIATURA_ANCHO, MINIATURA_ALTO,
+)
+from contexto import crear_contexto
+from repeticion import Grabacion, Reproductor, EXTENSION
+from archivo_repeticiones import LectorArchivo
+
+# Cámaras fijas disponibles (las 3 y 4 siguen a la cabeza en tiempo real).
+POSICIONES_CAMARA = {1: CAMARA_1_POS, 2: CAMARA_2_POS}
+
+
+class RenderizadorMiniaturas:
+    """
+    Dibuja estados de partida en un framebuffer sin ventana.
+
+    Crea el contexto GL del proceso: solo puede haber uno, y debe crearse
+    antes de importar cualquier otro módulo que use OpenGL.
+    """
+
+    def __init__(self, ancho: int = MINIATURA_ANCHO, alto: int = MINIATURA_ALTO, camara: int = 1):
+        if camara not in POSICIONES_CAMARA:
+            raise ValueError(f"Cámara no disponible sin ventana: {camara}")
+        self.ancho = ancho
+        self.alto = alto
+        self.camara = camara
+        self.plataforma = crear_contexto(ancho, alto)
+
+        # Con el contexto ya creado podemos importar los módulos que usan GL.
+        from OpenGL.GL import glEnable, glClearColor, GL_DEPTH_TEST, GL_NORMALIZE
+        from luces import Iluminacion
+
+        glEnable(GL_DEPTH_TEST)
+        glEnable(GL_NORMALIZE)
+        glClearColor(*COLOR_FONDO)
+        self.luces = Iluminacion()
+
+        # Lado del cubo -> (Tablero, RenderizadorSegmentos), creados al verlo
+        # por primera vez y reutilizados en el resto del lote.
+        self._escenas = {}
+        self._pixeles = np.empty((alto, ancho, 4), dtype=np.uint8)
+
+    def _escena(self, size: int) -> tuple:
+        escena = self._escenas.get(size)
+        if escena is None:
+            from tablero import Tablero
+            from renderizador import RenderizadorSegmentos
+
+            tablero = Tablero(size)
+            escena = self._escenas[size] = (tablero, RenderizadorSegmentos(tablero, self.luces))
+        return escena
+
+    def dibujar(self, simulacion):
+        """Dibuja el estado actual de `simulacion` en el framebuffer."""
+        from OpenGL.GL import (
+            glClear, glLoadIdentity, glMatrixMode, glPushMatrix, glPopMatrix, glMultMatrixf,
+            GL_PROJECTION, GL_MODELVIEW, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT,
+        )
+        from OpenGL.GLU import gluPerspective, gluLookAt
+
+        size = simulacion.size
+        tablero, renderizador = self._escena(size)
+
+        # Misma proyección y cámara que `Game` para ese lado de cubo.
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(FOV, self.ancho / self.alto, NEAR_PLANE, max(FAR_PLANE, size * 5.0))
+        glMatrixMode(GL_MODELVIEW)
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glLoadIdentity()
+        distancia = size * 2.5
+        gluLookAt(*(distancia * c for c in POSICIONES_CAMARA[self.camara]), 0, 0, 0, 0, 1, 0)
+        self.luces.activar()
+
+        glPushMatrix()
+        glMultMatrixf(simulacion.snake.orientacion.matriz_gl())
+        renderizador.dibujar(simulacion.snake, simulacion.comida)
+        tablero.dibujar()
+        glPopMatrix()
+
+    def leer(self) -> np.ndarray:
+        """
+        Píxeles RGBA del framebuffer (alto, ancho, 4), fila 0 abajo. El array
+        se reutiliza en la siguiente lectura.
+        """
+        from OpenGL.GL import glReadPixels, glPixelStorei, GL_PACK_ALIGNMENT, GL_RGBA, GL_UNSIGNED_BYTE
+
+        glPixelStorei(GL_PACK_ALIGNMENT, 4)
+        glReadPixels(0, 0, self.ancho, self.alto, GL_RGBA, GL_UNSIGNED_BYTE, self._pixeles)
+        return self._pixeles
+
+    def miniatura(self, simulacion) -> bytes:
+        """PNG del estado actual de `simulacion`."""
+        from captura import codificar_png
+
+        self.dibujar(simulacion)
+        return codificar_png(self.leer())
+
+    def miniatura_grabacion(self, grabacion: Grabacion, paso: int = None) -> bytes:
+        """
+        PNG de la partida grabada tras el paso `paso` (acotado a la
+        grabación); con None, al final de la partida.
+        """
+        reproductor = Reproductor(grabacion)
+        reproductor.ir_a(len(grabacion) if paso is None else paso)
+        return self.miniatura(reproductor.simulacion)
+
+    def miniatura_bytes(self, datos, paso: int = None) -> bytes:
+        """Como `miniatura_grabacion`, con la grabación serializada (`Grabacion.a_bytes`)."""
+        return self.miniatura_grabacion(Grabacion.desde_bytes(datos), paso)
+
+    def miniaturas_archivo(self, lector: LectorArchivo, partidas=None, paso: int = None):
+        """
+        Genera (número de partida, PNG) para las `partidas` de un archivo de
+        grabaciones (todas con None), en el mismo contexto.
+        """
+        if partidas is None:
+            partidas = range(len(lector))
+        for numero in partidas:
+            yield int(numero), self.miniatura_grabacion(lector.grabacion(numero), paso)
+
+    def liberar(self):
+        """Libera la geometría de los tableros creados."""
+        for tablero, _ in self._escenas.values():
+            tablero.liberar()
+        self._escenas.clear()
+
+
+def _tamano_imagen(texto: str) -> tuple:
+    try:
+        ancho, alto = (int(valor) for valor in texto.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tamaño no válido (ANCHOxALTO): {texto}")
+    return ancho, alto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera miniaturas PNG de partidas grabadas sin ventana.")
+    parser.add_argument("ruta", help=f"Grabación suelta ({EXTENSION}) o archivo de grabaciones (main.py --grabar).")
+    parser.add_argument("--salida", default="miniaturas", metavar="CARPETA",
+                        help="Carpeta donde se escriben los PNG.")
+    parser.add_argument("--paso", type=int, default=None,
+                        help="Paso de la partida que se dibuja (por defecto, el final).")
+    parser.add_argument("--partidas", type=int, nargs="+", default=None, metavar="K",
+                        help="Números de partida del archivo (por defecto, todas).")
+    parser.add_argument("--puntuacion-minima", type=int, default=None, metavar="N",
+                        help="Solo las partidas del archivo con al menos N puntos.")
+    parser.add_argument("--tamano-imagen", type=_tamano_imagen, default=(MINIATURA_ANCHO, MINIATURA_ALTO),
+                        metavar="ANCHOxALTO", help="Tamaño de las miniaturas.")
+    parser.add_argument("--camara", type=int, choices=sorted(POSICIONES_CAMARA), default=1)
+    args = parser.parse_args()
+
+    renderizador = RenderizadorMiniaturas(*args.tamano_imagen, camara=args.camara)
+    os.makedirs(args.salida, exist_ok=True)
+    base = os.path.splitext(os.path.basename(args.ruta))[0]
+
+    inicio = time.perf_counter()
+    escritas = 0
+    if args.ruta.endswith(EXTENSION):
+        destino = os.path.join(args.salida, base + ".png")
+        with open(destino, "wb") as archivo:
+            archivo.write(renderizador.miniatura_grabacion(Grabacion.cargar(args.ruta), args.paso))
+        escritas = 1
+    else:
+        with LectorArchivo(args.ruta) as lector:
+            partidas = args.partidas
+            if args.puntuacion_minima is not None:
+                partidas = lector.buscar(args.puntuacion_minima)
+            for numero, png in renderizador.miniaturas_archivo(lector, partidas, args.paso):
+                with open(os.path.join(args.salida, f"{base}_{numero:06d}.png"), "wb") as archivo:
+                    archivo.write(png)
+                escritas += 1
+    duracion = time.perf_counter() - inicio
+
+    print(f"{escritas} miniaturas {renderizador.ancho}x{renderizador.alto} en {args.salida} "
+          f"({renderizador.plataforma}): {duracion:.2f} s, {escritas / max(duracion, 1e-9):.1f} por segundo")
+    renderizador.liberar()
+
+
+if __name__ == "__main__":
+    main()
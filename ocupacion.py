@@ -0,0 +1,228 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - ocupacion.py
+
+Este módulo mantiene qué celdas de la superficie del cubo están ocupadas por
+la serpiente y cuáles quedan libres.
+
+Reunimos aquí dos estructuras que deben moverse siempre a la vez:
+
+1. Una rejilla GRID_SIZE³ con el número de segmentos en cada celda. Usamos un
+   contador y no un booleano porque `Snake.crecer` duplica la cola y, durante
+   un paso, dos segmentos comparten celda.
+2. Un índice de celdas libres de la superficie: un array con los ids libres
+   y, para cada id, su posición en ese array. Ocupar o liberar una celda es un
+   intercambio con el último elemento (*swap-remove*), así que ambas
+   operaciones son O(1).
+
+Gracias al índice, `Comida` elige una celda libre con un único número
+aleatorio, en lugar de reintentar posiciones al azar (algo que se volvía
+cada vez más lento a medida que la serpiente llenaba el cubo).
+
+Instantáneas
+------------
+El orden del índice de libres depende de toda la historia de la partida, y
+de él depende qué celda sale en cada sorteo de la comida: para restaurar una
+partida de forma exacta no basta con reconstruir el mapa a partir del
+cuerpo. Copiar los arrays en cada instantánea, en cambio, cuesta
+O(GRID_SIZE³).
+
+Usamos un árbol de versiones con diario (la técnica de los arrays
+persistentes de Baker). A partir de la primera instantánea, cada `ocupar` y
+`liberar` anota en `_diario` la celda, el signo y la posición intercambiada:
+lo justo para deshacerlo o rehacerlo. `instantanea` cierra el diario en una
+versión nueva y la devuelve (O(1)); `restaurar` recorre el camino entre la
+versión actual y la pedida deshaciendo y rehaciendo operaciones, y da la
+vuelta a las aristas recorridas, de modo que el coste es proporcional a los
+pasos que separan ambas versiones. Las versiones antiguas apuntan hacia la
+actual, así que las instantáneas que nadie conserva se liberan solas.
+"""
+
+import numpy as np
+
+from configuracion import GRID_SIZE
+from topologia import topologia
+
+
+class _Version:
+    """
+    Nodo del árbol de versiones de `MapaOcupacion`.
+
+    Para la versión actual, `siguiente` es None. Para las demás, el estado de
+    la versión se obtiene aplicando `operaciones` (hacia delante si `signo`
+    es 1, deshaciéndolas si es -1) al estado de `siguiente`, que está un paso
+    más cerca de la actual.
+    """
+
+    __slots__ = ("siguiente", "operaciones", "signo")
+
+    def __init__(self):
+        self.siguiente = None
+        self.operaciones = None
+        self.signo = 1
+
+
+class MapaOcupacion:
+    """
+    Contador de ocupación por celda más índice de celdas libres de superficie.
+    """
+
+    def __init__(self, size: int = GRID_SIZE):
+        self.size = size
+        self.conteo = np.zeros((size, size, size), dtype=np.uint8)
+
+        # Identificadores de superficie compartidos con el resto del juego:
+        # id -> celda y celda -> id (-1 si es interior).
+        self.topologia = topologia(size)
+        self.superficie = self.topologia.superficie
+        self.id_superficie = self.topologia.id_superficie
+
+        # Índice de libres: los `num_libres` primeros ids de `_libres` están
+        # libres; `_posicion[id]` indica dónde está cada id dentro de `_libres`.
+        self._libres = np.arange(len(self.superficie), dtype=np.int32)
+        self._posicion = np.arange(len(self.superficie), dtype=np.int32)
+        self.num_libres = len(self.superficie)
+
+        # Diario de operaciones desde `_version` (None hasta la primera
+        # instantánea: sin instantáneas no se anota nada).
+        self._version = None
+        self._diario = None
+
+    def cantidad(self, x: int, y: int, z: int) -> int:
+        """Número de segmentos que ocupan la celda (x, y, z)."""
+        return int(self.conteo[x, y, z])
+
+    def ocupada(self, x: int, y: int, z: int) -> bool:
+        return self.conteo[x, y, z] > 0
+
+    def ocupar(self, x: int, y: int, z: int) -> None:
+        self.conteo[x, y, z] += 1
+        posicion = -1
+        if self.conteo[x, y, z] == 1:
+            posicion = self._quitar_libre(int(self.id_superficie[x, y, z]))
+        if self._diario is not None:
+            self._diario.append((x, y, z, 1, posicion))
+
+    def liberar(self, x: int, y: int, z: int) -> None:
+        self.conteo[x, y, z] -= 1
+        posicion = -1
+        if self.conteo[x, y, z] == 0:
+            posicion = self._agregar_libre(int(self.id_superficie[x, y, z]))
+        if self._diario is not None:
+            self._diario.append((x, y, z, -1, posicion))
+
+    def _intercambiar(self, i: int, j: int) -> None:
+        """Intercambia las posiciones i y j de `_libres` manteniendo `_posicion`."""
+        a, b = self._libres[i], self._libres[j]
+        self._libres[i], self._libres[j] = b, a
+        self._posicion[b], self._posicion[a] = i, j
+
+    def _mover_frontera(self, posicion: int, signo: int) -> None:
+        """
+        Encoge (signo 1) o amplía (signo -1) la zona libre intercambiando
+        `posicion` con la frontera. Una operación deshace a la otra.
+        """
+        if signo > 0:
+            self.num_libres -= 1
+            self._intercambiar(posicion, self.num_libres)
+        else:
+            self._intercambiar(posicion, self.num_libres)
+            self.num_libres += 1
+
+    def _quitar_libre(self, id_celda: int) -> int:
+        """
+        Saca `id_celda` de la zona libre y devuelve la posición que ocupaba
+        (-1 si no es de la superficie).
+        """
+        if id_celda < 0:
+            return -1
+        # Llevamos el id al final de la zona libre y la encogemos.
+        posicion = int(self._posicion[id_celda])
+        self._mover_frontera(posicion, 1)
+        return posicion
+
+    def _agregar_libre(self, id_celda: int) -> int:
+        """Devuelve a la zona libre `id_celda`, como `_quitar_libre`."""
+        if id_celda < 0:
+            return -1
+        # Llevamos el id justo detrás de la zona libre y la ampliamos.
+        posicion = int(self._posicion[id_celda])
+        self._mover_frontera(posicion, -1)
+        return posicion
+
+    def celda_libre_aleatoria(self, rng):
+        """
+        Elige una celda libre de la superficie de forma uniforme en O(1).
+
+        Args:
+            rng: Generador con interfaz `random.Random` (se usa `randrange`).
+
+        Returns:
+            tuple[int, int, int] | None: la celda elegida, o None si la
+            superficie está completamente ocupada.
+        """
+        if self.num_libres == 0:
+            return None
+        id_celda = self._libres[rng.randrange(self.num_libres)]
+        x, y, z = self.superficie[id_celda]
+        return int(x), int(y), int(z)
+
+    # ------------------------------------------------------------------
+    # Instantáneas
+    # ------------------------------------------------------------------
+
+    def _aplicar(self, operaciones: list, signo: int) -> None:
+        """Rehace (signo 1) o deshace (signo -1, en orden inverso) `operaciones`."""
+        if signo < 0:
+            operaciones = reversed(operaciones)
+        for x, y, z, delta, posicion in operaciones:
+            delta *= signo
+            if delta > 0:
+                self.conteo[x, y, z] += 1
+            else:
+                self.conteo[x, y, z] -= 1
+            if posicion >= 0:
+                self._mover_frontera(posicion, delta)
+
+    def instantanea(self) -> _Version:
+        """
+        Versión que representa el estado actual (ver "Instantáneas" en la
+        cabecera). Dos instantáneas sin cambios entre ellas son la misma.
+        """
+        if self._diario is None:
+            self._version = _Version()
+        elif self._diario:
+            # La versión anterior se obtiene deshaciendo el diario.
+            nueva = _Version()
+            anterior = self._version
+            anterior.siguiente, anterior.operaciones, anterior.signo = nueva, self._diario, -1
+            self._version = nueva
+        self._diario = []
+        return self._version
+
+    def restaurar(self, version: _Version) -> None:
+        """
+        Vuelve al estado de `version`, deshaciendo y rehaciendo las operaciones
+        que la separan de la versión actual.
+
+        Raises:
+            ValueError: si `version` no procede de este mapa.
+        """
+        camino = []
+        nodo = version
+        while nodo is not self._version:
+            if nodo is None or self._version is None:
+                raise ValueError("La instantánea no pertenece a este mapa de ocupación")
+            camino.append(nodo)
+            nodo = nodo.siguiente
+
+        # Volvemos a la versión actual y avanzamos hacia `version`, invirtiendo
+        # cada arista recorrida para que apunte a la nueva versión actual.
+        self._aplicar(self._diario, -1)
+        self._diario = []
+        actual = self._version
+        for nodo in reversed(camino):
+            self._aplicar(nodo.operaciones, nodo.signo)
+            actual.siguiente, actual.operaciones, actual.signo = nodo, nodo.operaciones, -nodo.signo
+            nodo.siguiente = nodo.operaciones = None
+            actual = nodo
+        self._version = version
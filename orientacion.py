@@ -0,0 +1,115 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - orientacion.py
+
+Este módulo implementa el "frente infinito" sin reescribir coordenadas.
+
+Hasta ahora, cada vez que la cabeza cruzaba un borde rotábamos las
+coordenadas de todos los segmentos (y de la comida) para que la lógica
+siguiera operando sobre la cara frontal. Eso suponía un recorrido O(longitud)
+en cada transición y duplicaba la misma lógica en `snake.py` y `comida.py`.
+
+Ahora las entidades mantienen coordenadas fijas en el espacio del cubo y solo
+llevamos una matriz entera 3x3 de orientación: el marco de la cara que el
+jugador ve de frente. La matriz se usa únicamente en dos sitios:
+
+- Al interpretar la entrada: las flechas (definidas en el plano de la vista)
+  se convierten a direcciones del cubo.
+- Al renderizar: `glMultMatrixf` lleva el cubo al marco de la vista.
+
+Una transición de cara se reduce a multiplicar dos matrices 3x3: O(1) sin
+importar la longitud de la serpiente.
+
+Convención: si `c` es una celda del cubo y `v` la misma celda vista desde el
+frente, con centro `C = (N-1)/2` en cada eje, se cumple `c - C = R · (v - C)`.
+Es decir, las columnas de `R` son los ejes de la vista expresados en el cubo.
+"""
+
+from configuracion import GRID_SIZE
+
+IDENTIDAD = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+
+
+def rotacion_entera(eje: str, angulo: float) -> tuple:
+    """
+    Devuelve la matriz de rotación (filas) de `angulo` grados alrededor de
+    `eje`. Solo admitimos múltiplos de 90º, por lo que todos los coeficientes
+    son enteros (-1, 0 o 1).
+    """
+    pasos = int(round(angulo / 90.0)) % 4
+    c = (1, 0, -1, 0)[pasos]
+    s = (0, 1, 0, -1)[pasos]
+
+    if eje == "x":
+        return ((1, 0, 0), (0, c, -s), (0, s, c))
+    if eje == "y":
+        return ((c, 0, s), (0, 1, 0), (-s, 0, c))
+    if eje == "z":
+        return ((c, -s, 0), (s, c, 0), (0, 0, 1))
+    raise ValueError(f"Eje de rotación desconocido: {eje}")
+
+
+def multiplicar(a: tuple, b: tuple) -> tuple:
+    """Producto de dos matrices 3x3 representadas como tuplas de filas."""
+    return tuple(
+        tuple(sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3))
+        for i in range(3)
+    )
+
+
+class Orientacion:
+    """
+    Marco de la cara frontal actual expresado en el espacio fijo del cubo.
+    """
+
+    def __init__(self, size: int = GRID_SIZE):
+        self.matriz = IDENTIDAD
+        self.limite = size - 1
+
+    def a_cubo(self, direccion: tuple) -> tuple:
+        """Convierte una dirección del plano de la vista en una dirección del cubo."""
+        m = self.matriz
+        dx, dy, dz = direccion
+        return (
+            m[0][0] * dx + m[0][1] * dy + m[0][2] * dz,
+            m[1][0] * dx + m[1][1] * dy + m[1][2] * dz,
+            m[2][0] * dx + m[2][1] * dy + m[2][2] * dz,
+        )
+
+    def a_vista(self, x: int, y: int, z: int) -> tuple:
+        """
+        Convierte una celda del cubo en la celda equivalente vista desde el
+        frente. Trabajamos con coordenadas duplicadas (2c - N + 1) para que el
+        centro del cubo sea entero y toda la aritmética siga siendo exacta.
+        """
+        m = self.matriz
+        n = self.limite
+        qx, qy, qz = 2 * x - n, 2 * y - n, 2 * z - n
+        # v - C = R^T · (c - C)
+        return (
+            (m[0][0] * qx + m[1][0] * qy + m[2][0] * qz + n) // 2,
+            (m[0][1] * qx + m[1][1] * qy + m[2][1] * qz + n) // 2,
+            (m[0][2] * qx + m[1][2] * qy + m[2][2] * qz + n) // 2,
+        )
+
+    def girar(self, eje: str, angulo_mundo: float) -> None:
+        """
+        Registra una transición de cara.
+
+        El mundo gira visualmente `angulo_mundo` grados alrededor de `eje`, así
+        que el marco de la vista gira en sentido contrario dentro del cubo.
+        """
+        self.matriz = multiplicar(self.matriz, rotacion_entera(eje, -angulo_mundo))
+
+    def matriz_gl(self) -> list:
+        """
+        Matriz 4x4 (orden de columnas de OpenGL) que lleva el cubo al marco de
+        la vista, es decir, R^T. Como R^T leída por columnas coincide con R
+        leída por filas, basta con aplanar las filas de R.
+        """
+        m = self.matriz
+        return [
+            m[0][0], m[0][1], m[0][2], 0.0,
+            m[1][0], m[1][1], m[1][2], 0.0,
+            m[2][0], m[2][1], m[2][2], 0.0,
+            0.0, 0.0, 0.0, 1.0,
+        ]
@@ -0,0 +1,177 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - perfilador.py
+
+Este módulo mide cuánto tarda cada fase del bucle principal.
+
+La única afirmación de rendimiento que teníamos era "60 FPS" en la memoria,
+sin nada que la midiera. `Perfilador` cronometra las fases de `Game.run`
+(entrada, lógica, renderizado) y el dibujado de cada entidad (tablero,
+serpiente y comida, texto), con muy poco coste:
+
+- Las fases son una lista fija: cada una tiene su fila en un array NumPy
+  preasignado (fases x muestras) que usamos como buffer circular.
+- Medir es leer `time.perf_counter` dos veces y sumar a un float; un objeto
+  `_Medicion` reutilizable por fase evita crear objetos en cada frame.
+- Una fase que se ejecuta varias veces en un frame (p. ej. `dibujar_texto`)
+  acumula su tiempo, y al cerrar el frame se guarda el total.
+
+Los datos se muestran como superposición en pantalla (tecla F3) y pueden
+volcarse a CSV (un frame por fila) y a JSON (resumen por fase).
+
+Además de tiempos, otros subsistemas pueden registrar contadores con
+`registrar` (por ejemplo, la caché de textos): cualquier objeto con
+`estadisticas()` y `resumen()` aparece en la superposición y en el JSON.
+"""
+
+import csv
+import json
+import time
+
+import numpy as np
+
+from configuracion import MUESTRAS_TIEMPO_FRAME
+
+# Fases medidas, en el orden en que se muestran, con su nivel de sangría en
+# la superposición (indica qué fase contiene a cuál).
+FASES_PERFIL = (
+    ("input", 0),
+    ("actualizar", 0),
+    ("renderizar", 0),
+    ("escena", 1),
+    ("entidades", 2),
+    ("tablero", 2),
+    ("texto", 2),
+    ("captura", 1),
+    ("flip", 1),
+)
+
+
+class _Medicion:
+    """Gestor de contexto reutilizable que suma el tiempo de una fase."""
+
+    __slots__ = ("acumulado", "indice", "_inicio")
+
+    def __init__(self, acumulado, indice):
+        self.acumulado = acumulado
+        self.indice = indice
+        self._inicio = 0.0
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.acumulado[self.indice] += time.perf_counter() - self._inicio
+        return False
+
+
+class Perfilador:
+    """
+    Buffers circulares con el tiempo de cada fase en los últimos frames.
+    """
+
+    def __init__(self, muestras=MUESTRAS_TIEMPO_FRAME):
+        self.nombres = [nombre for nombre, _ in FASES_PERFIL]
+
+        # Fila 0: frame completo; filas 1..n: fases (segundos).
+        self.tiempos = np.zeros((len(self.nombres) + 1, muestras), dtype=np.float64)
+        self._indice = 0
+        self.num_muestras = 0
+
+        # Tiempo acumulado en el frame en curso, por fase.
+        self._acumulado = [0.0] * len(self.nombres)
+        self._mediciones = {
+            nombre: _Medicion(self._acumulado, i) for i, nombre in enumerate(self.nombres)
+        }
+
+        # Fuentes de contadores: nombre -> objeto con estadisticas() y resumen()
+        self.contadores = {}
+
+    def registrar(self, nombre: str, fuente) -> None:
+        """Añade `fuente` (con `estadisticas()` y `resumen()`) a los informes."""
+        self.contadores[nombre] = fuente
+
+    def medir(self, fase: str) -> _Medicion:
+        """
+        Devuelve el cronómetro de `fase`, para usar con `with`:
+
+            with perfilador.medir("tablero"):
+                tablero.dibujar()
+        """
+        return self._mediciones[fase]
+
+    def cerrar_frame(self, dt: float) -> None:
+        """Guarda el frame que acaba de terminar (duración total `dt`, en segundos)."""
+        columna = self._indice
+        self.tiempos[0, columna] = dt
+        self.tiempos[1:, columna] = self._acumulado
+        for i in range(len(self._acumulado)):
+            self._acumulado[i] = 0.0
+
+        self._indice = (columna + 1) % self.tiempos.shape[1]
+        self.num_muestras = min(self.num_muestras + 1, self.tiempos.shape[1])
+
+    def _ordenados(self) -> np.ndarray:
+        """Muestras registradas (ms), de la más antigua a la más reciente."""
+        if self.num_muestras < self.tiempos.shape[1]:
+            datos = self.tiempos[:, :self.num_muestras]
+        else:
+            datos = np.roll(self.tiempos, -self._indice, axis=1)
+        return datos * 1000.0
+
+    def estadisticas(self) -> dict:
+        """
+        Media, p50 y p99 (ms) del frame completo y de cada fase, más los
+        contadores registrados.
+        """
+        contadores = {nombre: fuente.estadisticas() for nombre, fuente in self.contadores.items()}
+        if self.num_muestras == 0:
+            return {"frames": 0, "contadores": contadores}
+
+        datos = self._ordenados()
+        p50 = np.percentile(datos, 50, axis=1)
+        p99 = np.percentile(datos, 99, axis=1)
+        media = datos.mean(axis=1)
+
+        def fila(i):
+            return {"media_ms": float(media[i]), "p50_ms": float(p50[i]), "p99_ms": float(p99[i])}
+
+        return {
+            "frames": self.num_muestras,
+            "frame": fila(0),
+            "fases": {nombre: fila(i + 1) for i, nombre in enumerate(self.nombres)},
+            "contadores": contadores,
+        }
+
+    def lineas_superposicion(self) -> list:
+        """
+        Texto de la superposición: frame p50/p99 y desglose por fase, como
+        pares (nivel de sangría, texto).
+        """
+        e = self.estadisticas()
+        if e["frames"] == 0:
+            return [(0, "Perfil: sin datos")]
+
+        frame = e["frame"]
+        lineas = [(0, f"Frame p50 {frame['p50_ms']:.2f} ms  p99 {frame['p99_ms']:.2f} ms")]
+        for nombre, nivel in FASES_PERFIL:
+            fase = e["fases"][nombre]
+            lineas.append((nivel, f"{nombre}: {fase['p50_ms']:.2f} / {fase['p99_ms']:.2f} ms"))
+        for nombre, fuente in self.contadores.items():
+            lineas.append((0, f"{nombre}:"))
+            lineas.extend((1, linea) for linea in fuente.resumen().splitlines())
+        return lineas
+
+    def volcar_csv(self, ruta: str) -> None:
+        """Escribe un frame por fila: duración total y tiempo de cada fase (ms)."""
+        datos = self._ordenados()
+        with open(ruta, "w", newline="") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["frame_ms"] + [f"{nombre}_ms" for nombre in self.nombres])
+            for columna in datos.T:
+                escritor.writerow([f"{valor:.4f}" for valor in columna])
+
+    def volcar_json(self, ruta: str) -> None:
+        """Escribe el resumen de `estadisticas` en formato JSON."""
+        with open(ruta, "w") as archivo:
+            json.dump(self.estadisticas(), archivo, indent=2)
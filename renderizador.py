@@ -0,0 +1,235 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - renderizador.py
+
+Este módulo agrupa el dibujado de todos los cubos sólidos de la escena
+(segmentos de la serpiente y comida) en una única llamada de dibujo.
+
+Hasta ahora cada `Segmento` se dibujaba por separado: `transformar` hacía
+push/translate/scale/pop y después emitíamos 24 `glVertex3f` en modo
+inmediato. Con serpientes de cientos de celdas, ese trabajo en Python por
+segmento acababa dominando el coste de `Game._renderizar_escena`.
+
+La alternativa que implementamos es el *instancing*:
+
+1. Un VBO compartido con la geometría de un cubo unitario (posición + normal).
+2. Un VBO por instancia con la posición de mundo y el color de cada cubo.
+3. Un shader (`shaders.py`) que desplaza el cubo unitario a la posición de
+   cada instancia y lo ilumina con los uniforms de `luces.py`.
+4. Un VAO que recuerda toda la configuración de atributos, de modo que cada
+   frame solo enlazamos el VAO, subimos unos pocos uniforms y hacemos una
+   sola llamada a `glDrawArraysInstanced`.
+
+Además, cada instancia lleva la posición que tenía en el paso lógico anterior.
+El shader interpola entre ambas con el uniform `alfa` (la fracción del paso
+actual ya transcurrida), de modo que la serpiente se desliza con suavidad a
+cualquier tasa de frames aunque la lógica avance a pasos discretos.
+
+Los datos por instancia solo se vuelven a subir a la GPU cuando la serpiente
+o la comida cambian (una vez por paso lógico). En el resto de frames el coste
+de dibujar la serpiente es constante, sin importar su longitud.
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL.GL import (
+    glGenBuffers, glBindBuffer, glBufferData, glGenVertexArrays, glBindVertexArray,
+    glEnableVertexAttribArray, glVertexAttribPointer, glVertexAttribDivisor,
+    glDrawArraysInstanced, glUseProgram, glGetFloatv,
+    GL_ARRAY_BUFFER, GL_STATIC_DRAW, GL_DYNAMIC_DRAW, GL_FLOAT, GL_FALSE,
+    GL_TRIANGLES, GL_MODELVIEW_MATRIX, GL_PROJECTION_MATRIX,
+)
+
+from configuracion import (
+    TAMANO_CELDA, COLOR_COMIDA, COLOR_SERPIENTE_CABEZA, COLOR_SERPIENTE_CUERPO
+)
+from shaders import ProgramaShader, SHADER_VOXEL_VERTICES, SHADER_VOXEL_FRAGMENTOS, matriz_normal
+
+# Ubicaciones fijas de los atributos del shader.
+# El atributo 0 debe ser siempre un atributo por vértice (no por instancia):
+# algunos drivers en perfil de compatibilidad lo tratan como `gl_Vertex`.
+ATRIBUTO_VERTICE = 0
+ATRIBUTO_NORMAL = 1
+ATRIBUTO_DESPLAZAMIENTO = 2
+ATRIBUTO_COLOR = 3
+ATRIBUTO_DESPLAZAMIENTO_ANTERIOR = 4
+
+# Floats por vértice del cubo (x, y, z, nx, ny, nz) y por instancia
+# (px, py, pz, r, g, b, a, px_anterior, py_anterior, pz_anterior).
+FLOATS_VERTICE = 6
+FLOATS_INSTANCIA = 10
+BYTES_FLOAT = 4
+
+
+def _geometria_cubo_unitario() -> np.ndarray:
+    """
+    Genera los 36 vértices (12 triángulos) de un cubo unitario centrado en el
+    origen, intercalando posición y normal de cada cara.
+    """
+    hs = 0.5  # Ocupa toda la celda, igual que el antiguo cubo de `Segmento`
+    caras = [
+        # (normal, cuatro esquinas en sentido antihorario visto desde fuera)
+        ((0, 0, 1),  [(-hs, -hs, hs), (hs, -hs, hs), (hs, hs, hs), (-hs, hs, hs)]),
+        ((0, 0, -1), [(hs, -hs, -hs), (-hs, -hs, -hs), (-hs, hs, -hs), (hs, hs, -hs)]),
+        ((-1, 0, 0), [(-hs, -hs, -hs), (-hs, -hs, hs), (-hs, hs, hs), (-hs, hs, -hs)]),
+        ((1, 0, 0),  [(hs, -hs, hs), (hs, -hs, -hs), (hs, hs, -hs), (hs, hs, hs)]),
+        ((0, 1, 0),  [(-hs, hs, hs), (hs, hs, hs), (hs, hs, -hs), (-hs, hs, -hs)]),
+        ((0, -1, 0), [(-hs, -hs, -hs), (hs, -hs, -hs), (hs, -hs, hs), (-hs, -hs, hs)]),
+    ]
+
+    vertices = []
+    for normal, (a, b, c, d) in caras:
+        for esquina in (a, b, c, a, c, d):
+            vertices.append(esquina + normal)
+
+    return np.array(vertices, dtype=np.float32)
+
+
+class RenderizadorSegmentos:
+    """
+    Dibuja la serpiente y la comida como instancias de un mismo cubo sólido.
+    """
+
+    def __init__(self, tablero, luces):
+        self.tablero = tablero
+        self.luces = luces
+
+        self.programa = ProgramaShader(SHADER_VOXEL_VERTICES, SHADER_VOXEL_FRAGMENTOS, {
+            "vertice": ATRIBUTO_VERTICE,
+            "normal": ATRIBUTO_NORMAL,
+            "desplazamiento": ATRIBUTO_DESPLAZAMIENTO,
+            "color": ATRIBUTO_COLOR,
+            "desplazamiento_anterior": ATRIBUTO_DESPLAZAMIENTO_ANTERIOR,
+        })
+
+        # Geometría compartida: se sube una única vez.
+        cubo = _geometria_cubo_unitario()
+        self.num_vertices_cubo = len(cubo)
+        self.vbo_cubo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_cubo)
+        glBufferData(GL_ARRAY_BUFFER, cubo.nbytes, cubo, GL_STATIC_DRAW)
+
+        # Datos por instancia: se rellenan bajo demanda.
+        self.vbo_instancias = glGenBuffers(1)
+        self.num_instancias = 0
+
+        # Clave del último estado subido a la GPU (serpiente, revisión, comida).
+        self._clave_subida = None
+
+        self.vao = self._crear_vao()
+
+    def _crear_vao(self):
+        """
+        Registra en un VAO la disposición de ambos buffers (punteros y
+        divisores). Solo se hace una vez: al redimensionar el buffer de
+        instancias con `glBufferData` el VAO sigue apuntando al mismo objeto.
+        """
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+
+        stride_vertice = FLOATS_VERTICE * BYTES_FLOAT
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_cubo)
+        glEnableVertexAttribArray(ATRIBUTO_VERTICE)
+        glVertexAttribPointer(ATRIBUTO_VERTICE, 3, GL_FLOAT, GL_FALSE, stride_vertice, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(ATRIBUTO_NORMAL)
+        glVertexAttribPointer(ATRIBUTO_NORMAL, 3, GL_FLOAT, GL_FALSE, stride_vertice,
+                              ctypes.c_void_p(3 * BYTES_FLOAT))
+
+        stride_instancia = FLOATS_INSTANCIA * BYTES_FLOAT
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_instancias)
+        for atributo, componentes, desplazamiento in (
+            (ATRIBUTO_DESPLAZAMIENTO, 3, 0),
+            (ATRIBUTO_COLOR, 4, 3),
+            (ATRIBUTO_DESPLAZAMIENTO_ANTERIOR, 3, 7),
+        ):
+            glEnableVertexAttribArray(atributo)
+            glVertexAttribPointer(atributo, componentes, GL_FLOAT, GL_FALSE, stride_instancia,
+                                  ctypes.c_void_p(desplazamiento * BYTES_FLOAT))
+            glVertexAttribDivisor(atributo, 1)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return vao
+
+    def _subir_instancias(self, snake, comida, celdas_anteriores=None):
+        """
+        Convierte las celdas lógicas en posiciones de mundo y sube el buffer
+        de instancias completo en una sola transferencia.
+
+        `celdas_anteriores` son las celdas del cuerpo antes del último paso.
+        El segmento i se interpola entre su celda anterior y la actual; si la
+        serpiente ha crecido, los segmentos nuevos parten de la antigua cola.
+        """
+        celdas = snake.celdas()
+        hay_comida = comida is not None and comida.posicion
+        n = len(celdas) + (1 if hay_comida else 0)
+
+        # Todo el trabajo sobre el cuerpo son operaciones vectorizadas:
+        # ningún bucle de Python recorre los segmentos.
+        coordenada_mundo = self.tablero.topologia.coordenada_mundo
+        datos = np.empty((n, FLOATS_INSTANCIA), dtype=np.float32)
+        datos[:len(celdas), :3] = coordenada_mundo[celdas]
+        datos[:len(celdas), 3:7] = COLOR_SERPIENTE_CUERPO
+        if len(celdas):
+            datos[0, 3:7] = COLOR_SERPIENTE_CABEZA
+
+        datos[:len(celdas), 7:] = datos[:len(celdas), :3]
+        if celdas_anteriores is not None and len(celdas_anteriores) and len(celdas):
+            m = min(len(celdas), len(celdas_anteriores))
+            datos[:m, 7:] = coordenada_mundo[celdas_anteriores[:m]]
+            datos[m:len(celdas), 7:] = coordenada_mundo[celdas_anteriores[-1]]
+
+        if hay_comida:
+            datos[-1, :3] = coordenada_mundo[[comida.posicion.x, comida.posicion.y, comida.posicion.z]]
+            datos[-1, 3:7] = COLOR_COMIDA
+            datos[-1, 7:] = datos[-1, :3]
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_instancias)
+        glBufferData(GL_ARRAY_BUFFER, datos.nbytes, datos, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.num_instancias = len(datos)
+
+    def dibujar(self, snake, comida=None, celdas_anteriores=None, alfa=1.0):
+        """
+        Dibuja todos los cubos sólidos con una única llamada instanciada.
+        Solo volvemos a subir las instancias si la serpiente se ha movido o
+        la comida ha cambiado de celda desde el último frame.
+
+        :param celdas_anteriores: Celdas del cuerpo antes del último paso
+                                  (None para dibujar sin interpolar).
+        :param alfa: Fracción del paso actual transcurrida, en [0, 1].
+        """
+        if snake is None:
+            return
+
+        posicion_comida = None
+        if comida is not None and comida.posicion:
+            posicion_comida = (comida.posicion.x, comida.posicion.y, comida.posicion.z)
+
+        clave = (snake, snake.revision, posicion_comida)
+        if clave != self._clave_subida:
+            self._subir_instancias(snake, comida, celdas_anteriores)
+            self._clave_subida = clave
+
+        if self.num_instancias == 0:
+            return
+
+        # Matrices actuales de la pila de OpenGL (cámara + rotación del mundo).
+        modelovista = glGetFloatv(GL_MODELVIEW_MATRIX)
+
+        programa = self.programa
+        programa.usar()
+        programa.uniform_matriz4("modelovista", modelovista)
+        programa.uniform_matriz4("proyeccion", glGetFloatv(GL_PROJECTION_MATRIX))
+        programa.uniform_matriz3_filas("matriz_normal", matriz_normal(modelovista))
+        programa.uniform_1f("escala", TAMANO_CELDA)
+        programa.uniform_1f("alfa", alfa)
+        self.luces.subir_uniforms(programa)
+
+        glBindVertexArray(self.vao)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, self.num_vertices_cubo, self.num_instancias)
+
+        # Restauramos el estado para no interferir con el pipeline fijo
+        # que sigue usando el tablero y la interfaz.
+        glBindVertexArray(0)
+        glUseProgram(0)
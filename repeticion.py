@@ -0,0 +1,201 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - repeticion.py
+
+Grabación y reproducción de partidas.
+
+Como `Simulacion` es determinista (ver `simulacion.py`), una partida queda
+descrita por completo con muy pocos datos:
+
+- La semilla del generador de la comida.
+- La configuración que afecta a las reglas o al ritmo: lado del cubo
+  (`GRID_SIZE` o `--tamano`) y `TIEMPO_PASO`.
+- La acción de cada paso lógico: un byte por paso (índice en `ACCIONES`).
+
+El formato binario es una cabecera fija (`CABECERA`) seguida de los bytes de
+las acciones. Un minuto de juego son unos 400 bytes.
+
+`Reproductor` vuelve a simular la grabación sin pantalla, a miles de pasos
+por segundo. Para saltar a un paso cualquiera guarda una instantánea del
+estado cada `INTERVALO_INSTANTANEAS` pasos la primera vez que los recorre:
+después, `ir_a(paso)` restaura la instantánea anterior más cercana y solo
+simula el tramo que falta.
+
+Ejemplo:
+    python repeticion.py partida.rep --ir-a 500
+"""
+
+import argparse
+import random
+import struct
+import time
+
+import numpy as np
+
+from configuracion import TIEMPO_PASO
+from simulacion import Simulacion, ACCIONES
+
+MAGIA = b"S3DR"
+VERSION = 1
+
+# Magia, versión, semilla, lado del cubo, TIEMPO_PASO y número de pasos
+# (little-endian, sin relleno).
+CABECERA = struct.Struct("<4sHQHdI")
+
+EXTENSION = ".rep"
+
+# Pasos entre instantáneas del reproductor: saltar a cualquier paso cuesta
+# como mucho este número de pasos simulados.
+INTERVALO_INSTANTANEAS = 256
+
+
+def nueva_semilla() -> int:
+    """Semilla aleatoria de 64 bits (cabe en la cabecera)."""
+    return random.SystemRandom().getrandbits(64)
+
+
+class Grabacion:
+    """
+    Semilla, configuración y acciones de una partida.
+    """
+
+    def __init__(self, semilla: int, size: int, tiempo_paso: float = TIEMPO_PASO, acciones=b""):
+        self.semilla = semilla
+        self.size = size
+        self.tiempo_paso = tiempo_paso
+        # Un bytearray mientras se graba. Las grabaciones leídas de un archivo
+        # (ver `archivo_repeticiones.py`) son una vista de solo lectura, sin copia.
+        self.acciones = acciones if isinstance(acciones, memoryview) else bytearray(acciones)
+
+    def __len__(self) -> int:
+        return len(self.acciones)
+
+    def registrar(self, accion: int):
+        """Añade la acción del último paso lógico."""
+        self.acciones.append(accion)
+
+    def a_bytes(self) -> bytes:
+        """Serializa la grabación: cabecera seguida de un byte por paso."""
+        cabecera = CABECERA.pack(MAGIA, VERSION, self.semilla, self.size, self.tiempo_paso, len(self.acciones))
+        return cabecera + self.acciones
+
+    @classmethod
+    def desde_bytes(cls, datos) -> "Grabacion":
+        """
+        Reconstruye una grabación serializada con `a_bytes`. Si `datos` es un
+        `memoryview`, las acciones son una vista de él (no se copian).
+
+        Raises:
+            ValueError: si los datos no son una grabación válida.
+        """
+        if len(datos) < CABECERA.size:
+            raise ValueError("Grabación truncada: falta la cabecera")
+        magia, version, semilla, size, tiempo_paso, pasos = CABECERA.unpack_from(datos)
+        if magia != MAGIA:
+            raise ValueError("No es una grabación de Snake 3D")
+        if version != VERSION:
+            raise ValueError(f"Versión de grabación no soportada: {version}")
+
+        acciones = datos[CABECERA.size:CABECERA.size + pasos]
+        if len(acciones) != pasos:
+            raise ValueError(f"Grabación truncada: {len(acciones)} de {pasos} pasos")
+        if pasos and np.frombuffer(acciones, dtype=np.uint8).max() >= len(ACCIONES):
+            raise ValueError("Grabación con acciones no válidas")
+        return cls(semilla, size, tiempo_paso, acciones)
+
+    def guardar(self, ruta: str):
+        with open(ruta, "wb") as archivo:
+            archivo.write(self.a_bytes())
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "Grabacion":
+        with open(ruta, "rb") as archivo:
+            return cls.desde_bytes(archivo.read())
+
+
+class Reproductor:
+    """
+    Vuelve a simular una grabación, con avance rápido y saltos a cualquier paso.
+    """
+
+    def __init__(self, grabacion: Grabacion, intervalo: int = INTERVALO_INSTANTANEAS):
+        self.grabacion = grabacion
+        self.intervalo = intervalo
+        self.simulacion = Simulacion(grabacion.semilla, grabacion.size)
+
+        # La instantánea k es el estado tras k * intervalo pasos.
+        self._instantaneas = [self.simulacion.instantanea()]
+
+    @property
+    def paso(self) -> int:
+        """Pasos ya reproducidos."""
+        return self.simulacion.pasos
+
+    def avanzar(self, pasos: int = None) -> int:
+        """
+        Reproduce `pasos` pasos (o hasta el final de la grabación) sin dibujar.
+
+        Returns:
+            int: pasos reproducidos de verdad.
+        """
+        simulacion = self.simulacion
+        acciones = self.grabacion.acciones
+        intervalo = self.intervalo
+        instantaneas = self._instantaneas
+
+        inicio = simulacion.pasos
+        fin = len(acciones) if pasos is None else min(inicio + pasos, len(acciones))
+        while simulacion.pasos < fin and not simulacion.terminado:
+            simulacion.paso(acciones[simulacion.pasos])
+            if simulacion.pasos % intervalo == 0 and simulacion.pasos // intervalo == len(instantaneas):
+                instantaneas.append(simulacion.instantanea())
+        return simulacion.pasos - inicio
+
+    def ir_a(self, paso: int) -> int:
+        """
+        Coloca la simulación justo después del paso `paso` (acotado a la
+        grabación). Si hace falta retroceder, o la instantánea más cercana
+        está más adelante que el paso actual, restauramos esa instantánea.
+
+        Returns:
+            int: el paso alcanzado.
+        """
+        paso = max(0, min(paso, len(self.grabacion)))
+        k = min(paso // self.intervalo, len(self._instantaneas) - 1)
+        if not k * self.intervalo <= self.paso <= paso:
+            self.simulacion.restaurar(self._instantaneas[k])
+        self.avanzar(paso - self.paso)
+        return self.paso
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una grabación de Snake 3D sin ventana.")
+    parser.add_argument("ruta", help=f"Grabación ({EXTENSION}) guardada con `Grabacion.guardar` "
+                                     "(para archivos de main.py --grabar, ver archivo_repeticiones.py).")
+    parser.add_argument("--ir-a", type=int, default=None, metavar="PASO",
+                        help="Tras reproducirla entera, salta al paso PASO y muestra su estado.")
+    args = parser.parse_args()
+
+    grabacion = Grabacion.cargar(args.ruta)
+    print(f"Semilla {grabacion.semilla}, cubo {grabacion.size}, "
+          f"TIEMPO_PASO {grabacion.tiempo_paso}, {len(grabacion)} pasos")
+
+    reproductor = Reproductor(grabacion)
+    inicio = time.perf_counter()
+    reproductor.avanzar()
+    duracion = time.perf_counter() - inicio
+    simulacion = reproductor.simulacion
+    print(f"Final: puntuación {simulacion.puntuacion}, longitud {len(simulacion.snake)}, "
+          f"paso {reproductor.paso}{' (terminada)' if simulacion.terminado else ''}")
+    print(f"Tiempo: {duracion:.3f} s  ({reproductor.paso / max(duracion, 1e-9):,.0f} pasos/s)")
+
+    if args.ir_a is not None:
+        inicio = time.perf_counter()
+        reproductor.ir_a(args.ir_a)
+        duracion = time.perf_counter() - inicio
+        print(f"Paso {reproductor.paso}: puntuación {simulacion.puntuacion}, "
+              f"longitud {len(simulacion.snake)}, cabeza {simulacion.snake.cabeza()}  "
+              f"({duracion * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - ritmo.py
+
+Este módulo controla el ritmo del bucle principal y mide los tiempos de frame.
+
+Hasta ahora `Game.run` llamaba a `pygame.time.Clock.tick(FPS)`, que duerme
+con los temporizadores del sistema operativo (de grano grueso) y siempre
+limita a 60 FPS. Así no podíamos saber cuánto margen real tiene el
+renderizado del cubo en una máquina concreta, y la espera añadía latencia
+variable entre la pulsación y la imagen.
+
+`Marcapasos` admite varios modos (ver `MODO_RITMO` en configuracion.py) y
+registra, en dos buffers circulares, el tiempo total de cada frame y el
+tiempo de trabajo (todo lo que no es espera). La diferencia entre ambos es el
+margen disponible.
+"""
+
+import time
+
+import numpy as np
+
+from configuracion import (
+    MODO_RITMO, PRESUPUESTO_FRAME_MS, MARGEN_ESPERA_ACTIVA_MS, MUESTRAS_TIEMPO_FRAME
+)
+
+MODOS_RITMO = ("limitado", "sin_limite", "vsync", "precision")
+
+
+class Marcapasos:
+    """
+    Espera el tiempo que corresponda a cada frame según el modo y guarda
+    los tiempos de los últimos `muestras` frames.
+    """
+
+    def __init__(self, modo=MODO_RITMO, presupuesto_ms=PRESUPUESTO_FRAME_MS,
+                 muestras=MUESTRAS_TIEMPO_FRAME):
+        if modo not in MODOS_RITMO:
+            raise ValueError(f"Modo de ritmo desconocido: {modo}")
+        self.modo = modo
+        self.presupuesto = presupuesto_ms / 1000.0
+        self.margen_espera_activa = MARGEN_ESPERA_ACTIVA_MS / 1000.0
+
+        # Buffers circulares (segundos): frame completo y trabajo sin espera.
+        self.tiempos_frame = np.zeros(muestras, dtype=np.float64)
+        self.tiempos_trabajo = np.zeros(muestras, dtype=np.float64)
+        self._indice = 0
+        self.num_muestras = 0
+
+        self._ultimo = time.perf_counter()
+
+    def reiniciar(self):
+        """Toma el instante actual como inicio del frame (p. ej., tras cargar)."""
+        self._ultimo = time.perf_counter()
+
+    def esperar(self) -> float:
+        """
+        Completa el frame actual según el modo y devuelve su duración total
+        (el `dt` que usa la lógica), en segundos.
+        """
+        trabajo = time.perf_counter() - self._ultimo
+        objetivo = self._ultimo + self.presupuesto
+
+        if self.modo == "limitado":
+            restante = objetivo - time.perf_counter()
+            if restante > 0:
+                time.sleep(restante)
+
+        elif self.modo == "precision":
+            restante = objetivo - time.perf_counter()
+            if restante > self.margen_espera_activa:
+                time.sleep(restante - self.margen_espera_activa)
+            while time.perf_counter() < objetivo:
+                pass
+
+        # En "sin_limite" no esperamos; en "vsync" ya esperó el intercambio
+        # de buffers (`pygame.display.flip`).
+
+        ahora = time.perf_counter()
+        dt = ahora - self._ultimo
+        self._ultimo = ahora
+
+        self.tiempos_frame[self._indice] = dt
+        self.tiempos_trabajo[self._indice] = trabajo
+        self._indice = (self._indice + 1) % len(self.tiempos_frame)
+        self.num_muestras = min(self.num_muestras + 1, len(self.tiempos_frame))
+        return dt
+
+    def estadisticas(self) -> dict:
+        """
+        Resumen (en milisegundos) de los frames registrados: media, mediana,
+        percentil 99 y máximo del frame completo, trabajo medio y FPS medios.
+        """
+        if self.num_muestras == 0:
+            return {"modo": self.modo, "frames": 0}
+
+        frames = self.tiempos_frame[:self.num_muestras] * 1000.0
+        trabajo = self.tiempos_trabajo[:self.num_muestras] * 1000.0
+        media = float(frames.mean())
+        return {
+            "modo": self.modo,
+            "frames": self.num_muestras,
+            "media_ms": media,
+            "p50_ms": float(np.percentile(frames, 50)),
+            "p99_ms": float(np.percentile(frames, 99)),
+            "max_ms": float(frames.max()),
+            "trabajo_ms": float(trabajo.mean()),
+            "fps": 1000.0 / media if media > 0 else 0.0,
+        }
+
+    def resumen(self) -> str:
+        """Estadísticas en una línea legible (para consola o la interfaz)."""
+        e = self.estadisticas()
+        if e["frames"] == 0:
+            return f"Ritmo '{self.modo}': sin frames registrados"
+        return (f"Ritmo '{e['modo']}': {e['fps']:.1f} FPS | frame {e['media_ms']:.2f} ms "
+                f"(p50 {e['p50_ms']:.2f}, p99 {e['p99_ms']:.2f}, max {e['max_ms']:.2f}) | "
+                f"trabajo {e['trabajo_ms']:.2f} ms")
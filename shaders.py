@@ -0,0 +1,237 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - shaders.py
+
+Este módulo agrupa los programas GLSL del juego y una pequeña clase para
+compilarlos y alimentar sus uniforms.
+
+Hasta ahora la iluminación pasaba por el pipeline fijo: cada frame,
+`Iluminacion.activar` reconfiguraba `GL_LIGHT0`, `GL_COLOR_MATERIAL` y el
+material, y el shader de los vóxeles leía ese estado a través de variables
+predefinidas (`gl_LightSource`, `gl_ModelViewMatrix`...). Ahora todo lo que
+necesita el shader llega como uniforms explícitos:
+
+- Matrices de modelo-vista, proyección y normales.
+- Posición y colores de la luz, más la intensidad del flash al comer (el
+  aclarado de la luz se calcula en el propio shader).
+
+Así, el estado que cambia por frame se reduce a unas pocas subidas de
+uniforms, y el shader no depende de ninguna característica del perfil de
+compatibilidad.
+"""
+
+import numpy as np
+from OpenGL.GL import (
+    glCreateProgram, glAttachShader, glBindAttribLocation, glLinkProgram,
+    glGetProgramiv, glGetProgramInfoLog, glUseProgram, glGetUniformLocation,
+    glUniform1i, glUniform1f, glUniform2f, glUniform3f, glUniform4f,
+    glUniformMatrix3fv, glUniformMatrix4fv,
+    GL_VERTEX_SHADER, GL_FRAGMENT_SHADER, GL_LINK_STATUS, GL_FALSE, GL_TRUE,
+)
+from OpenGL.GL.shaders import compileShader
+
+# ---------------------------------------------------------------------------
+# Vóxeles sólidos iluminados (serpiente y comida)
+# ---------------------------------------------------------------------------
+
+SHADER_VOXEL_VERTICES = """
+#version 130
+
+in vec3 vertice;
+in vec3 normal;
+in vec3 desplazamiento;
+in vec4 color;
+in vec3 desplazamiento_anterior;
+
+uniform mat4 modelovista;
+uniform mat4 proyeccion;
+uniform mat3 matriz_normal;
+uniform float escala;
+uniform float alfa;
+
+uniform vec3 luz_posicion;       // En espacio de ojo
+uniform vec3 ambiente_global;
+uniform vec3 luz_ambiente;
+uniform vec3 luz_difusa;
+uniform vec3 luz_especular;
+uniform vec3 material_especular;
+uniform float brillo;
+uniform float intensidad_flash;  // 0 = sin flash, 1 = flash completo
+
+out vec4 color_fragmento;
+
+void main()
+{
+    vec3 centro = mix(desplazamiento_anterior, desplazamiento, alfa);
+    vec4 posicion_ojo = modelovista * vec4(vertice * escala + centro, 1.0);
+    vec3 n = normalize(matriz_normal * normal);
+    vec3 l = normalize(luz_posicion - posicion_ojo.xyz);
+    vec3 h = normalize(l + normalize(-posicion_ojo.xyz));
+
+    // El flash aclara la luz hacia el blanco (ambiente +0.7, difusa +0.2).
+    vec3 ambiente = ambiente_global + min(luz_ambiente + intensidad_flash * 0.7, vec3(1.0));
+    vec3 difusa_luz = min(luz_difusa + intensidad_flash * 0.2, vec3(1.0));
+
+    // Ambiente y difusa tomadas del color del cubo, especular del material.
+    float difusa = max(dot(n, l), 0.0);
+    float especular = 0.0;
+    if (difusa > 0.0) {
+        especular = pow(max(dot(n, h), 0.0), brillo);
+    }
+
+    vec3 rgb = color.rgb * (ambiente + difusa_luz * difusa)
+             + material_especular * luz_especular * especular;
+
+    color_fragmento = vec4(rgb, color.a);
+    gl_Position = proyeccion * posicion_ojo;
+}
+"""
+
+SHADER_VOXEL_FRAGMENTOS = """
+#version 130
+
+in vec4 color_fragmento;
+out vec4 color_salida;
+
+void main()
+{
+    color_salida = color_fragmento;
+}
+"""
+
+
+# ---------------------------------------------------------------------------
+# Cristal del tablero (relleno y aristas, sin iluminación)
+# ---------------------------------------------------------------------------
+
+SHADER_CRISTAL_VERTICES = """
+#version 130
+
+in vec3 vertice;
+
+uniform mat4 modelovista;
+uniform mat4 proyeccion;
+
+void main()
+{
+    gl_Position = proyeccion * (modelovista * vec4(vertice, 1.0));
+}
+"""
+
+SHADER_CRISTAL_FRAGMENTOS = """
+#version 130
+
+uniform vec4 color;
+out vec4 color_salida;
+
+void main()
+{
+    color_salida = color;
+}
+"""
+
+
+# ---------------------------------------------------------------------------
+# Texto de la interfaz (quads con coordenadas de pantalla y atlas de glifos)
+# ---------------------------------------------------------------------------
+
+SHADER_TEXTO_VERTICES = """
+#version 130
+
+in vec2 posicion;   // En píxeles, origen arriba a la izquierda (como Pygame)
+in vec2 uv;
+
+uniform vec2 pantalla;
+
+out vec2 uv_fragmento;
+
+void main()
+{
+    vec2 ndc = posicion / pantalla * 2.0 - 1.0;
+    gl_Position = vec4(ndc.x, -ndc.y, 0.0, 1.0);
+    uv_fragmento = uv;
+}
+"""
+
+SHADER_TEXTO_FRAGMENTOS = """
+#version 130
+
+in vec2 uv_fragmento;
+
+uniform sampler2D atlas;
+uniform vec4 color;
+
+out vec4 color_salida;
+
+void main()
+{
+    color_salida = color * texture(atlas, uv_fragmento);
+}
+"""
+
+
+class ProgramaShader:
+    """
+    Programa GLSL enlazado con ubicaciones de atributos fijas y caché de
+    ubicaciones de uniforms.
+    """
+
+    def __init__(self, fuente_vertices: str, fuente_fragmentos: str, atributos: dict):
+        """
+        :param atributos: nombre -> ubicación. Se fijan antes de enlazar para
+                          que los VAO puedan configurarse con índices constantes.
+        """
+        self.id = glCreateProgram()
+        glAttachShader(self.id, compileShader(fuente_vertices, GL_VERTEX_SHADER))
+        glAttachShader(self.id, compileShader(fuente_fragmentos, GL_FRAGMENT_SHADER))
+        for nombre, ubicacion in atributos.items():
+            glBindAttribLocation(self.id, ubicacion, nombre)
+        glLinkProgram(self.id)
+
+        if not glGetProgramiv(self.id, GL_LINK_STATUS):
+            raise RuntimeError(glGetProgramInfoLog(self.id))
+
+        self._uniforms = {}
+
+    def usar(self):
+        glUseProgram(self.id)
+
+    def ubicacion(self, nombre: str) -> int:
+        """Ubicación del uniform `nombre` (consultada a OpenGL una sola vez)."""
+        ubicacion = self._uniforms.get(nombre)
+        if ubicacion is None:
+            ubicacion = glGetUniformLocation(self.id, nombre)
+            self._uniforms[nombre] = ubicacion
+        return ubicacion
+
+    def uniform_1i(self, nombre: str, valor: int):
+        glUniform1i(self.ubicacion(nombre), valor)
+
+    def uniform_1f(self, nombre: str, valor: float):
+        glUniform1f(self.ubicacion(nombre), valor)
+
+    def uniform_2f(self, nombre: str, valor):
+        glUniform2f(self.ubicacion(nombre), valor[0], valor[1])
+
+    def uniform_3f(self, nombre: str, valor):
+        glUniform3f(self.ubicacion(nombre), valor[0], valor[1], valor[2])
+
+    def uniform_4f(self, nombre: str, valor):
+        glUniform4f(self.ubicacion(nombre), valor[0], valor[1], valor[2], valor[3])
+
+    def uniform_matriz4(self, nombre: str, matriz):
+        """Sube una matriz 4x4 en el orden de columnas de OpenGL (como `glGetFloatv`)."""
+        glUniformMatrix4fv(self.ubicacion(nombre), 1, GL_FALSE, np.asarray(matriz, dtype=np.float32))
+
+    def uniform_matriz3_filas(self, nombre: str, matriz):
+        """Sube una matriz 3x3 expresada por filas (NumPy)."""
+        glUniformMatrix3fv(self.ubicacion(nombre), 1, GL_TRUE, np.asarray(matriz, dtype=np.float32))
+
+
+def matriz_normal(modelovista_columnas) -> np.ndarray:
+    """
+    Matriz de normales (inversa traspuesta de la parte 3x3 de la modelo-vista),
+    por filas. `modelovista_columnas` es la matriz tal y como la devuelve
+    `glGetFloatv(GL_MODELVIEW_MATRIX)` (orden de columnas).
+    """
+    m = np.asarray(modelovista_columnas, dtype=np.float64).reshape(4, 4).T[:3, :3]
+    return np.linalg.inv(m).T
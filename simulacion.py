@@ -0,0 +1,135 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - simulacion.py
+
+Este módulo contiene el núcleo lógico del juego, sin ninguna dependencia de
+Pygame ni de OpenGL.
+
+Hasta ahora el avance de la serpiente dependía de los `dt` de
+`pygame.time.Clock` (`Snake.actualizar`) y la lógica de comer vivía en
+`Game._actualizar_juego`. Eso obligaba a abrir una ventana con contexto GL
+para ejecutar cualquier partida, y siempre a velocidad de tiempo real.
+
+`Simulacion` reúne la serpiente, la comida y la puntuación y expone una única
+operación determinista: `paso(accion)`. Con la misma semilla y la misma
+secuencia de acciones, la partida es siempre idéntica. Así podemos:
+
+- Ejecutar miles de pasos por segundo sin pantalla (pruebas, bots).
+- Reproducir partidas grabadas a partir de la semilla y las acciones.
+
+`Game` se limita a decidir *cuándo* dar un paso (según el tiempo real) y a
+dibujar el estado resultante.
+"""
+
+import random
+from collections import namedtuple
+
+from configuracion import GRID_SIZE, DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT, PUNTOS_POR_COMIDA
+from snake import Snake
+from comida import Comida
+
+# Acciones válidas de `paso`: un índice de esta tupla.
+# La acción 0 mantiene la intención de giro actual.
+ACCIONES = (None, DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT)
+ACCION_NINGUNA = 0
+
+# Resultado de un paso lógico:
+# - eje, angulo: rotación del mundo solicitada (None, 0.0 si no hay transición).
+# - comio: la cabeza ha alcanzado la comida en este paso.
+# - terminado: la partida ha acabado (autocolisión o tablero completo).
+ResultadoPaso = namedtuple("ResultadoPaso", ["eje", "angulo", "comio", "terminado"])
+
+
+class Simulacion:
+    """
+    Estado completo de una partida, avanzado paso a paso.
+    """
+
+    def __init__(self, semilla=None, size: int = GRID_SIZE):
+        """
+        :param semilla: Semilla del generador aleatorio de la comida. Con None
+                        se toma una semilla del sistema operativo.
+        :param size: Lado del cubo (GRID_SIZE por defecto).
+        """
+        self.semilla = semilla
+        self.size = size
+        self.rng = random.Random(semilla)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Comienza una partida nueva reutilizando el generador aleatorio."""
+        self.snake = Snake(self.size)
+        self.comida = Comida(self.snake, self.rng)
+        self.puntuacion = 0
+        self.pasos = 0
+        self.terminado = False
+
+    def cambiar_direccion(self, direccion):
+        """Registra la intención de giro del jugador para el próximo paso."""
+        self.snake.cambiar_direccion(direccion)
+
+    def accion_pendiente(self) -> int:
+        """
+        Acción equivalente a la intención de giro registrada con
+        `cambiar_direccion`: dar el paso con ella produce el mismo resultado
+        que el teclado, y es lo que se guarda en las grabaciones.
+        """
+        snake = self.snake
+        if snake.proxima_direccion == snake.direccion:
+            return ACCION_NINGUNA
+        return ACCIONES.index(snake.proxima_direccion)
+
+    def instantanea(self) -> tuple:
+        """
+        Estado completo de la partida: serpiente, comida (con el generador
+        aleatorio) y marcador. Cuesta O(1): el cuerpo se comparte con la
+        partida en curso (ver `snake.py`). `restaurar` la recupera sobre esta
+        misma partida (hasta el próximo `reiniciar`).
+        """
+        return (self.snake.instantanea(), self.comida.instantanea(),
+                self.puntuacion, self.pasos, self.terminado)
+
+    def restaurar(self, instantanea: tuple):
+        """Vuelve al estado guardado con `instantanea`."""
+        snake, comida, self.puntuacion, self.pasos, self.terminado = instantanea
+        self.snake.restaurar(snake)
+        self.comida.restaurar(comida)
+
+    def paso(self, accion: int = ACCION_NINGUNA) -> ResultadoPaso:
+        """
+        Avanza la partida exactamente un paso lógico.
+
+        Args:
+            accion: Índice en `ACCIONES`. Las acciones que supondrían un giro
+                    de 180º se ignoran, igual que con el teclado.
+
+        Returns:
+            ResultadoPaso con la transición de cara, si la cabeza ha comido y
+            si la partida ha terminado.
+        """
+        if self.terminado:
+            return ResultadoPaso(None, 0.0, False, True)
+
+        direccion = ACCIONES[accion]
+        if direccion is not None:
+            self.snake.cambiar_direccion(direccion)
+
+        eje, angulo = self.snake.mover()
+        self.pasos += 1
+
+        if not self.snake.vivo:
+            self.terminado = True
+            return ResultadoPaso(eje, angulo, False, True)
+
+        # Colisión con la comida
+        comio = False
+        posicion = self.comida.posicion
+        if posicion and self.snake.cabeza() == (posicion.x, posicion.y, posicion.z):
+            comio = True
+            self.snake.crecer()
+            self.puntuacion += PUNTOS_POR_COMIDA
+
+            # Si no queda ninguna celda libre, la partida ha terminado.
+            if not self.comida.generar_nueva_posicion():
+                self.terminado = True
+
+        return ResultadoPaso(eje, angulo, comio, self.terminado)
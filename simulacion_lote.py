@@ -0,0 +1,244 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - simulacion_lote.py
+
+Este módulo avanza muchas partidas independientes a la vez con NumPy.
+
+`Simulacion` (simulacion.py) ejecuta una partida con objetos de Python:
+suficiente para jugar, pero demasiado lento cuando queremos miles de partidas
+de bots o de regresión, porque cada paso recorre el intérprete partida a
+partida.
+
+`SimulacionLote` aplica exactamente las mismas reglas que `Snake` y `Comida`
+pero guarda el estado de B partidas en arrays, con una fila por partida:
+
+- Cuerpos: buffers circulares (B, capacidad) de ids de superficie
+  (`topologia.py`), con su índice de cabeza y su longitud.
+- Ocupación: contador (B, celdas de superficie) por partida.
+- Comida: id de superficie de la comida de cada partida (-1 si no hay).
+- Orientación: matriz entera 3x3 de la cara frontal de cada partida.
+
+Un único `paso(acciones)` mueve todas las partidas activas con operaciones
+vectorizadas, sin ningún bucle de Python sobre las partidas ni sobre los
+segmentos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from configuracion import GRID_SIZE, DIR_UP, PUNTOS_POR_COMIDA
+from orientacion import rotacion_entera
+from simulacion import ACCIONES, ACCION_NINGUNA
+from topologia import topologia, DIRECCIONES_CUBO, TRANSICIONES
+
+# Vector (en el plano de la vista) de cada acción; la acción 0 no tiene.
+VECTORES_ACCION = np.array([d if d else (0, 0, 0) for d in ACCIONES], dtype=np.int32)
+
+# Acción que representa cada dirección (para comprobar giros de 180º).
+ACCION_OPUESTA = np.array(
+    [0] + [ACCIONES.index(tuple(-c for c in d)) for d in ACCIONES[1:]], dtype=np.int8
+)
+
+# Matriz que `Orientacion.girar` multiplica por la derecha al salir por cada
+# borde de la cara frontal (la identidad para la acción 0, que no se usa).
+GIROS_ACCION = np.array(
+    [np.eye(3, dtype=np.int32)] + [
+        rotacion_entera(TRANSICIONES[d][0], -TRANSICIONES[d][1]) for d in ACCIONES[1:]
+    ],
+    dtype=np.int32,
+)
+
+# Dirección del cubo (dx, dy, dz) -> columna de `Topologia.vecinos`.
+# Codificamos cada componente en base 3: (dx + 1) * 9 + (dy + 1) * 3 + (dz + 1).
+COLUMNA_DIRECCION = np.full(27, -1, dtype=np.int32)
+for _k, (_dx, _dy, _dz) in enumerate(DIRECCIONES_CUBO):
+    COLUMNA_DIRECCION[(_dx + 1) * 9 + (_dy + 1) * 3 + (_dz + 1)] = _k
+
+# Resultado de un paso del lote (un array de B elementos por campo):
+# - transicion: la partida ha cambiado de cara. La rotación del mundo es
+#   `TRANSICIONES[ACCIONES[direccion]]`.
+# - comio: la cabeza ha alcanzado la comida en este paso.
+# - terminado: la partida ha acabado (en este paso o antes).
+ResultadoLote = namedtuple("ResultadoLote", ["transicion", "comio", "terminado"])
+
+
+class SimulacionLote:
+    """
+    B partidas independientes de Snake 3D avanzadas con un único paso vectorizado.
+    """
+
+    def __init__(self, num_partidas: int, semilla=None, size: int = GRID_SIZE):
+        """
+        :param num_partidas: Número B de partidas simultáneas.
+        :param semilla: Semilla del generador de NumPy que coloca la comida.
+        :param size: Lado del cubo (GRID_SIZE por defecto).
+        """
+        self.num_partidas = num_partidas
+        self.size = size
+        self.rng = np.random.default_rng(semilla)
+
+        self.topologia = topologia(size)
+        self.num_celdas = self.topologia.num_celdas
+
+        # Como mucho toda la superficie más la copia temporal de la cola que
+        # añade `crecer`: nunca hace falta redimensionar el buffer.
+        self.capacidad = self.num_celdas + 1
+
+        b, s = num_partidas, self.num_celdas
+        self.cuerpo = np.zeros((b, self.capacidad), dtype=np.int32)
+        self.inicio = np.zeros(b, dtype=np.int64)
+        self.longitud = np.zeros(b, dtype=np.int64)
+        self.conteo = np.zeros((b, s), dtype=np.uint8)
+        self.comida = np.full(b, -1, dtype=np.int32)
+        self.orientacion = np.zeros((b, 3, 3), dtype=np.int32)
+        self.direccion = np.zeros(b, dtype=np.int8)
+        self.vivo = np.zeros(b, dtype=bool)
+        self.terminado = np.zeros(b, dtype=bool)
+        self.puntuacion = np.zeros(b, dtype=np.int64)
+        self.pasos = np.zeros(b, dtype=np.int64)
+
+        self.reiniciar()
+
+    def reiniciar(self, mascara=None):
+        """
+        Comienza de nuevo las partidas indicadas (todas si `mascara` es None),
+        con la misma posición inicial que `Snake._crear_inicial`.
+        """
+        if mascara is None:
+            filas = np.arange(self.num_partidas)
+        else:
+            filas = np.flatnonzero(mascara)
+        if len(filas) == 0:
+            return
+
+        z_face = self.size - 1
+        mid = self.size // 2
+        iniciales = [self.topologia.id_celda(mid, y, z_face) for y in (mid, mid - 1, mid - 2)]
+
+        self.cuerpo[filas] = 0
+        self.cuerpo[filas, :len(iniciales)] = iniciales
+        self.inicio[filas] = 0
+        self.longitud[filas] = len(iniciales)
+        self.conteo[filas] = 0
+        self.conteo[filas[:, None], iniciales] = 1
+        self.orientacion[filas] = np.eye(3, dtype=np.int32)
+        self.direccion[filas] = ACCIONES.index(DIR_UP)
+        self.vivo[filas] = True
+        self.terminado[filas] = False
+        self.puntuacion[filas] = 0
+        self.pasos[filas] = 0
+        self.comida[filas] = self._celdas_libres_aleatorias(filas)
+
+    def _celdas_libres_aleatorias(self, filas: np.ndarray) -> np.ndarray:
+        """
+        Elige, para cada partida de `filas`, una celda libre uniforme.
+
+        Asignamos una clave aleatoria a cada celda, descartamos las ocupadas y
+        nos quedamos con la mayor: un solo `argmax` por fila. Devuelve -1 en
+        las partidas sin ninguna celda libre.
+        """
+        claves = self.rng.random((len(filas), self.num_celdas))
+        libres = self.conteo[filas] == 0
+        claves[~libres] = -1.0
+        elegidas = np.argmax(claves, axis=1).astype(np.int32)
+        elegidas[~libres.any(axis=1)] = -1
+        return elegidas
+
+    def _destinos(self, filas, cabezas, direcciones):
+        """Id de la celda contigua a cada cabeza según la orientación (-1 si sale del cubo)."""
+        vectores = VECTORES_ACCION[direcciones]
+        # Dirección del cubo = R · d (igual que `Orientacion.a_cubo`).
+        d_cubo = np.einsum("bij,bj->bi", self.orientacion[filas], vectores)
+        codigo = (d_cubo[:, 0] + 1) * 9 + (d_cubo[:, 1] + 1) * 3 + (d_cubo[:, 2] + 1)
+        return self.topologia.vecinos[cabezas, COLUMNA_DIRECCION[codigo]]
+
+    def paso(self, acciones=None) -> ResultadoLote:
+        """
+        Avanza un paso lógico en todas las partidas no terminadas.
+
+        Args:
+            acciones: Array de B índices en `ACCIONES` (o None para mantener
+                      la dirección en todas). Los giros de 180º se ignoran.
+
+        Returns:
+            ResultadoLote con un array booleano de B elementos por campo.
+        """
+        b = self.num_partidas
+        transicion = np.zeros(b, dtype=bool)
+        comio = np.zeros(b, dtype=bool)
+
+        filas = np.flatnonzero(~self.terminado)
+        if len(filas) == 0:
+            return ResultadoLote(transicion, comio, self.terminado.copy())
+
+        # 1. Intención de giro: igual que `Snake.cambiar_direccion`.
+        if acciones is not None:
+            nuevas = np.asarray(acciones, dtype=np.int8)[filas]
+            validas = (nuevas != ACCION_NINGUNA) & (nuevas != ACCION_OPUESTA[self.direccion[filas]])
+            self.direccion[filas[validas]] = nuevas[validas]
+        direcciones = self.direccion[filas]
+
+        # 2. Celda contigua a la cabeza (tabla de vecinos).
+        capacidad = self.capacidad
+        cabezas = self.cuerpo[filas, self.inicio[filas]]
+        destinos = self._destinos(filas, cabezas, direcciones)
+
+        # 3. Transiciones de cara: giramos la orientación de las partidas que
+        # salen del cubo y volvemos a buscar el vecino.
+        cruzan = destinos < 0
+        if cruzan.any():
+            f = filas[cruzan]
+            self.orientacion[f] = np.matmul(self.orientacion[f], GIROS_ACCION[direcciones[cruzan]])
+            destinos[cruzan] = self._destinos(f, cabezas[cruzan], direcciones[cruzan])
+            transicion[f] = True
+        self.pasos[filas] += 1
+
+        # 4. Autocolisión (la cola que se va no cuenta como obstáculo).
+        colas = self.cuerpo[filas, (self.inicio[filas] + self.longitud[filas] - 1) % capacidad]
+        ocupacion_destino = self.conteo[filas, destinos].astype(np.int32)
+        ocupacion_destino -= colas == destinos
+
+        chocan = ocupacion_destino > 0
+        muertas = filas[chocan]
+        self.vivo[muertas] = False
+        self.terminado[muertas] = True
+
+        filas, destinos, colas = filas[~chocan], destinos[~chocan], colas[~chocan]
+
+        # 5. Movimiento "crawler": liberamos la cola y escribimos la cabeza
+        # delante de la antigua. Cada fila toca una sola celda por operación,
+        # así que la indexación avanzada no pierde actualizaciones.
+        self.conteo[filas, colas] -= 1
+        self.inicio[filas] = (self.inicio[filas] - 1) % capacidad
+        self.cuerpo[filas, self.inicio[filas]] = destinos
+        self.conteo[filas, destinos] += 1
+
+        # 6. Comida: crecer (duplicar la cola), puntuar y recolocarla.
+        comen = destinos == self.comida[filas]
+        if comen.any():
+            f = filas[comen]
+            colas_nuevas = self.cuerpo[f, (self.inicio[f] + self.longitud[f] - 1) % capacidad]
+            self.cuerpo[f, (self.inicio[f] + self.longitud[f]) % capacidad] = colas_nuevas
+            self.longitud[f] += 1
+            self.conteo[f, colas_nuevas] += 1
+            self.puntuacion[f] += PUNTOS_POR_COMIDA
+            comio[f] = True
+
+            # Si no queda ninguna celda libre, la partida ha terminado.
+            self.comida[f] = self._celdas_libres_aleatorias(f)
+            self.terminado[f[self.comida[f] < 0]] = True
+
+        return ResultadoLote(transicion, comio, self.terminado.copy())
+
+    def celdas(self, partida: int) -> np.ndarray:
+        """
+        Celdas (x, y, z) de la serpiente de una partida, de la cabeza a la
+        cola, con el mismo formato que `Snake.celdas`.
+        """
+        indices = (self.inicio[partida] + np.arange(self.longitud[partida])) % self.capacidad
+        return self.topologia.superficie[self.cuerpo[partida, indices]]
+
+    def cabezas(self) -> np.ndarray:
+        """Array (B, 3) con la celda de la cabeza de cada partida."""
+        ids = self.cuerpo[np.arange(self.num_partidas), self.inicio]
+        return self.topologia.superficie[ids]
@@ -11,34 +11,84 @@ Fase 4:
 Fase 5:
 - Detectamos cruces de borde y aplicamos transiciones de cara manteniendo la
   ilusión del “frente infinito”.
-- Rotamos las coordenadas discretas de todos los segmentos para que, tras la
-  animación visual del cubo, la lógica continúe operando sobre la cara frontal.
+- Las coordenadas de los segmentos son fijas en el espacio del cubo. Cada
+  transición solo actualiza la matriz de orientación (`orientacion.py`), que
+  traduce las flechas del jugador a direcciones del cubo: O(1) por transición.
+- La adyacencia entre celdas (incluido el salto de arista) se consulta en las
+  tablas precalculadas de `topologia.py`.
+
+Fase 8 (optimización):
+- Mantenemos un mapa de ocupación (`ocupacion.py`) sincronizado con los
+  segmentos, de modo que la autocolisión y la elección de la comida cuestan
+  O(1) sin importar la longitud de la serpiente.
+- El cuerpo vive en arrays NumPy de enteros. Avanzar escribe una fila y
+  mueve un índice (O(1), sin crear objetos), y cualquier operación sobre todo
+  el cuerpo (como preparar las instancias del renderizador) es una única
+  operación vectorizada.
+- La serpiente ya no importa nada de Pygame ni de OpenGL y no mide el tiempo:
+  cada llamada a `mover` es un paso lógico (`simulacion.py` marca el ritmo).
+
+Instantáneas:
+- Para rebobinar, buscar en una grabación o explorar jugadas, `instantanea`
+  debe costar O(1) y no copiar el cuerpo. Por eso el cuerpo ya no es un
+  buffer circular (que sobrescribe las filas de la cola) sino una tupla de
+  bloques de FILAS_BLOQUE filas: la cabeza avanza hacia filas anteriores y,
+  al agotar el primer bloque, se antepone uno nuevo; la cola abandona el
+  último bloque cuando lo vacía.
+- Una instantánea guarda la tupla de bloques y los índices. Las filas por
+  delante de la cabeza no pertenecen a ninguna instantánea de esta misma
+  historia, así que avanzar no copia nada y las instantáneas consecutivas
+  comparten todos sus bloques. Solo copiamos un bloque (copia en escritura)
+  al escribir donde una instantánea puede mirar: detrás de la cola al crecer
+  después de una instantánea, o delante de la cabeza después de `restaurar`
+  (la historia abandonada puede estar usando esas filas).
 """
 
+import numpy as np
+
 from configuracion import (
     GRID_SIZE,
-    COLOR_SERPIENTE_CABEZA,
-    COLOR_SERPIENTE_CUERPO,
     DIR_UP,
-    DIR_DOWN,
-    DIR_LEFT,
-    DIR_RIGHT,
     DIR_STOP,
-    TIEMPO_PASO,
 )
-from segmento import Segmento
-from tablero import Tablero
+from ocupacion import MapaOcupacion
+from orientacion import Orientacion
+from topologia import topologia, TRANSICIONES
+
+# Filas de cada bloque del cuerpo (ver "Instantáneas" en la cabecera).
+FILAS_BLOQUE = 64
 
 class Snake:
-    def __init__(self, tablero: Tablero):
-        self.tablero = tablero
-        self.segmentos = []
+    def __init__(self, size: int = GRID_SIZE):
+        self.size = size
+
+        # Cuerpo: tupla de bloques (FILAS_BLOQUE, 3) de celdas (x, y, z). El
+        # segmento i (0 = cabeza) vive en la fila global _inicio + i, contando
+        # las filas de los bloques uno tras otro.
+        self._bloques = ()
+        self._inicio = 0
+        self.longitud = 0
+
+        # Si podemos escribir delante de la cabeza (en el primer bloque) o
+        # detrás de la cola (en el último) sin copiar el bloque antes.
+        self._cabeza_propia = True
+        self._cola_propia = True
 
         # Estado de movimiento
         self.direccion = DIR_UP           # Dirección actual de movimiento
         self.proxima_direccion = DIR_UP   # Buffer para la siguiente entrada del usuario
-        self.tiempo_acumulado = 0.0       # Acumulador para controlar la velocidad
         self.vivo = True                  # Bandera para detener la serpiente cuando haya autocolisión (fase futura)
+        self.revision = 0                 # Se incrementa cada vez que cambian las celdas (para el renderizador)
+
+        # Tablas de vecinos compartidas con el tablero y la comida.
+        self.topologia = topologia(size)
+
+        # Marco de la cara frontal actual. `direccion` y `proxima_direccion`
+        # se expresan en el plano de la vista; los segmentos, en el cubo.
+        self.orientacion = Orientacion(size)
+
+        # Ocupación por celda + índice de celdas libres (lo consulta `Comida`).
+        self.ocupacion = MapaOcupacion(size)
 
         self._crear_inicial()
 
@@ -48,15 +98,85 @@ class Snake:
         colocando la cabeza en el centro y dos segmentos de cuerpo por debajo
         en el eje Y para que la cadena sea claramente visible.
         """
-        z_face = GRID_SIZE - 1
-        mid = GRID_SIZE // 2
+        z_face = self.size - 1
+        mid = self.size // 2
+
+        # Cabeza y cuerpo (2 segmentos hacia abajo), de la cabeza a la cola.
+        for y in (mid, mid - 1, mid - 2):
+            self._agregar_cola(mid, y, z_face)
+
+    def __len__(self) -> int:
+        return self.longitud
 
-        # Cabeza
-        self.segmentos.append(Segmento(mid, mid, z_face, COLOR_SERPIENTE_CABEZA))
+    def cabeza(self) -> tuple:
+        """Celda (x, y, z) de la cabeza, en coordenadas del cubo."""
+        x, y, z = self._bloques[0][self._inicio]
+        return int(x), int(y), int(z)
 
-        # Cuerpo (2 segmentos hacia abajo)
-        self.segmentos.append(Segmento(mid, mid - 1, z_face, COLOR_SERPIENTE_CUERPO))
-        self.segmentos.append(Segmento(mid, mid - 2, z_face, COLOR_SERPIENTE_CUERPO))
+    def cola(self) -> tuple:
+        """Celda (x, y, z) del último segmento, en coordenadas del cubo."""
+        bloque, fila = divmod(self._inicio + self.longitud - 1, FILAS_BLOQUE)
+        x, y, z = self._bloques[bloque][fila]
+        return int(x), int(y), int(z)
+
+    def celdas(self) -> np.ndarray:
+        """
+        Devuelve un array (longitud, 3) con todas las celdas ordenadas de la
+        cabeza a la cola. Es una copia: una única concatenación de los bloques.
+        """
+        fin = self._inicio + self.longitud
+        if len(self._bloques) == 1:
+            return self._bloques[0][self._inicio:fin].copy()
+        return np.concatenate(self._bloques)[self._inicio:fin]
+
+    def _copiar_bloque(self, indice: int):
+        """Sustituye el bloque `indice` por una copia propia (copia en escritura)."""
+        bloques = list(self._bloques)
+        bloques[indice] = bloques[indice].copy()
+        self._bloques = tuple(bloques)
+        if indice == 0:
+            self._cabeza_propia = True
+        if indice == len(bloques) - 1:
+            self._cola_propia = True
+
+    def _agregar_cabeza(self, x: int, y: int, z: int):
+        """Añade un segmento delante de la cabeza actual."""
+        if self._inicio == 0:
+            self._bloques = (np.zeros((FILAS_BLOQUE, 3), dtype=np.int32),) + self._bloques
+            self._inicio = FILAS_BLOQUE
+            self._cabeza_propia = True
+            self._cola_propia = self._cola_propia or len(self._bloques) == 1
+        elif not self._cabeza_propia:
+            self._copiar_bloque(0)
+        self._inicio -= 1
+        self._bloques[0][self._inicio] = (x, y, z)
+        self.longitud += 1
+        self.ocupacion.ocupar(x, y, z)
+
+    def _agregar_cola(self, x: int, y: int, z: int):
+        """Añade un segmento detrás de la cola actual."""
+        fila = self._inicio + self.longitud
+        if fila == len(self._bloques) * FILAS_BLOQUE:
+            self._bloques += (np.zeros((FILAS_BLOQUE, 3), dtype=np.int32),)
+            self._cola_propia = True
+        elif not self._cola_propia:
+            self._copiar_bloque(len(self._bloques) - 1)
+        self._bloques[-1][fila % FILAS_BLOQUE] = (x, y, z)
+        self.longitud += 1
+        self.ocupacion.ocupar(x, y, z)
+
+    def _quitar_cola(self):
+        """Elimina el último segmento (sin tocar la ocupación)."""
+        self.longitud -= 1
+        if self._inicio + self.longitud <= (len(self._bloques) - 1) * FILAS_BLOQUE:
+            # El último bloque ha quedado vacío. El nuevo último bloque puede
+            # estar compartido con alguna instantánea.
+            self._bloques = self._bloques[:-1]
+            self._cola_propia = False
+
+    def ocupada(self, x: int, y: int, z: int) -> bool:
+        """Indica en O(1) si alguna parte de la serpiente ocupa la celda (x, y, z)."""
+        return self.ocupacion.ocupada(x, y, z)
 
     def cambiar_direccion(self, nueva_dir):
         """
@@ -78,172 +198,106 @@ class Snake:
         if not es_opuesto:
             self.proxima_direccion = nueva_dir
 
-    def actualizar(self, dt: float):
+    def mover(self, crecer=False):
         """
-        Avanza la lógica de juego según el delta time.
+        Calcula la nueva posición, gestiona transiciones de cara y actualiza los segmentos.
+        El ritmo de los pasos lo decide quien llama (ver `simulacion.py`).
+        :param crecer: Si es True, no eliminamos la cola (la serpiente crece).
 
         Returns:
             tuple[str | None, float]: información sobre la rotación solicitada.
             - ('x'|'y', +/-90.0) cuando hay transición de cara.
             - (None, 0.0) si no ocurre nada especial.
         """
-        if not self.vivo:
-            return (None, 0.0)
-
-        self.tiempo_acumulado += dt
-
-        rotacion_solicitada = (None, 0.0)
-
-        # Si ha pasado suficiente tiempo, damos un "paso".
-        if self.tiempo_acumulado >= TIEMPO_PASO:
-            self.tiempo_acumulado = 0.0
-            rotacion_solicitada = self.mover()
-
-        return rotacion_solicitada
-
-    def mover(self, crecer=False):
-        """
-        Calcula la nueva posición, gestiona transiciones de cara y actualiza los segmentos.
-        :param crecer: Si es True, no eliminamos la cola (la serpiente crece).
-        """
-        # 1. Actualizamos la dirección oficial.
+        # 1. Actualizamos la dirección oficial (en el plano de la vista).
         self.direccion = self.proxima_direccion
-        dx, dy, dz = self.direccion
+        self.revision += 1
 
-        # 2. Obtenemos posición actual de la cabeza.
-        cabeza = self.segmentos[0]
-        nx = cabeza.x + dx
-        ny = cabeza.y + dy
-        nz = cabeza.z + dz
+        # 2. Buscamos la celda contigua a la cabeza en la tabla de vecinos,
+        # traduciendo antes la flecha al espacio fijo del cubo.
+        id_cabeza = self.topologia.id_celda(*self.cabeza())
+        id_destino = self.topologia.vecino(id_cabeza, self.orientacion.a_cubo(self.direccion))
 
-        # 3. Verificamos si debemos rotar el mundo (Fase 5).
-        rotacion_eje, rotacion_angulo = self._verificar_transicion(nx, ny)
+        # 3. Un vecino -1 indica que la cabeza cruza una arista: hay que rotar
+        # el mundo (Fase 5). La rotación depende solo del borde de la cara
+        # frontal por el que salimos, es decir, de la flecha actual.
+        rotacion_eje, rotacion_angulo = (None, 0.0)
+        if id_destino < 0 and self.direccion in TRANSICIONES:
+            rotacion_eje, rotacion_angulo = TRANSICIONES[self.direccion]
 
-        if rotacion_eje is not None:
-            # Ajustamos las coordenadas de todos los segmentos para mantener
-            # la ilusión de que seguimos operando sobre la cara frontal.
-            self._aplicar_transformacion_coordenadas(rotacion_eje, rotacion_angulo)
+            # Giramos el marco de la vista (O(1)); los segmentos no se tocan.
+            self.orientacion.girar(rotacion_eje, rotacion_angulo)
 
-            # Recalculamos la posición objetivo de la cabeza en el nuevo marco.
-            cabeza = self.segmentos[0]
-            nx = cabeza.x + dx
-            ny = cabeza.y + dy
-            nz = cabeza.z + dz
+            # La misma flecha apunta ahora hacia el interior de la nueva cara.
+            id_destino = self.topologia.vecino(id_cabeza, self.orientacion.a_cubo(self.direccion))
 
         # 4. Control defensivo: evitamos acceder fuera de la rejilla
         # (solo debería ocurrir si en el futuro añadimos nuevas transiciones).
-        if not (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE):
+        if id_destino < 0:
             return rotacion_eje, rotacion_angulo
 
+        nx, ny, nz = self.topologia.celda(id_destino)
+
         # --- FASE 8: Detección de Autocolisión ---
-        # Verificamos si la nueva posición de la cabeza coincide con algún segmento del cuerpo.
-        # Nota: No comprobamos el último segmento si no vamos a crecer, porque ese espacio quedará libre.
-        # Sin embargo, para simplificar y ser robustos, comprobamos contra todos menos la cola actual
-        # si no crecemos.
-        
-        # Enfoque simple: comprobamos contra todos los segmentos actuales.
-        # Si la nueva cabeza (nx, ny, nz) está en self.segmentos, es choque.
-        # Excepción: si no crecemos, la cola se va a ir, así que chocar contra la cola es válido (perseguirla).
-        
-        limite_comprobacion = len(self.segmentos)
-        if not crecer:
-            limite_comprobacion -= 1 # Ignoramos la cola actual porque se moverá
-            
-        for i in range(limite_comprobacion):
-            seg = self.segmentos[i]
-            if seg.x == nx and seg.y == ny and seg.z == nz:
-                self.vivo = False
-                print("Game Over: Autocolisión detectada")
-                return rotacion_eje, rotacion_angulo
+        # Consultamos la rejilla de ocupación en lugar de recorrer el cuerpo.
+        # Excepción: si no crecemos, la cola se va a ir, así que chocar contra
+        # la cola es válido (perseguirla). Si la cola está duplicada tras
+        # `crecer`, la otra copia sigue contando como obstáculo.
+        ocupacion_destino = self.ocupacion.cantidad(nx, ny, nz)
+        if not crecer and self.cola() == (nx, ny, nz):
+            ocupacion_destino -= 1
+
+        if ocupacion_destino > 0:
+            self.vivo = False
+            return rotacion_eje, rotacion_angulo
 
         # 5. Movimiento "crawler" (mover la serpiente).
-        # a) Creamos nueva cabeza en la posición destino.
-        nueva_cabeza = Segmento(nx, ny, nz, COLOR_SERPIENTE_CABEZA)
-
-        # b) La cabeza antigua pasa a ser cuerpo.
-        self.segmentos[0].color = COLOR_SERPIENTE_CUERPO
-
-        # c) Insertamos la nueva cabeza al principio de la lista.
-        self.segmentos.insert(0, nueva_cabeza)
-
-        # d) Gestión de la cola (Crecimiento)
+        # a) Si no crecemos, liberamos la cola.
         if not crecer:
-            # Si no crecemos, eliminamos la cola para mantener el tamaño.
-            self.segmentos.pop()
-        
-        return rotacion_eje, rotacion_angulo
-
-    def _verificar_transicion(self, nx, ny):
-        """
-        Detecta si la coordenada propuesta sale de la cara frontal y determina
-        qué rotación del mundo es necesaria para seguir a la serpiente.
-
-        Returns:
-            tuple[str | None, float]: ('x'|'y', +/-90.0) o (None, 0.0).
-        """
-        limit = GRID_SIZE - 1
-
-        # Caso 1: Salimos por la Derecha -> Mundo gira a la Izquierda (-90º en Y).
-        if nx > limit:
-            return ("y", -90.0)
-
-        # Caso 2: Salimos por la Izquierda -> Mundo gira a la Derecha (+90º en Y).
-        if nx < 0:
-            return ("y", 90.0)
+            cx, cy, cz = self.cola()
+            self.ocupacion.liberar(cx, cy, cz)
+            self._quitar_cola()
 
-        # Caso 3: Salimos por Arriba -> Mundo gira hacia Abajo (+90º en X).
-        if ny > limit:
-            return ("x", 90.0)
+        # b) Escribimos la nueva cabeza justo antes de la antigua (O(1)).
+        self._agregar_cabeza(nx, ny, nz)
 
-        # Caso 4: Salimos por Abajo -> Mundo gira hacia Arriba (-90º en X).
-        if ny < 0:
-            return ("x", -90.0)
-
-        return (None, 0.0)
-
-    def _aplicar_transformacion_coordenadas(self, eje, angulo_mundo):
-        """
-        Aplica una rotación al sistema de coordenadas de todos los segmentos.
+        return rotacion_eje, rotacion_angulo
 
-        Principio del “frente infinito”:
-        Si el mundo gira visualmente -90º, rotamos las coordenadas de la serpiente
-        +90º para que, matemáticamente, siga operando sobre la cara frontal.
-        """
-        N = GRID_SIZE - 1
-        angulo_transformacion = -angulo_mundo  # Espejo respecto a la rotación visual.
-
-        for seg in self.segmentos:
-            x, y, z = seg.x, seg.y, seg.z
-
-            if eje == "y":
-                if angulo_transformacion == 90.0:
-                    # Rotación +90º alrededor de Y (CCW).
-                    seg.x = N - z
-                    seg.z = x
-                elif angulo_transformacion == -90.0:
-                    # Rotación -90º alrededor de Y (CW).
-                    seg.x = z
-                    seg.z = N - x
-
-            elif eje == "x":
-                if angulo_transformacion == 90.0:
-                    # Rotación +90º alrededor de X.
-                    seg.y = z
-                    seg.z = N - y
-                elif angulo_transformacion == -90.0:
-                    # Rotación -90º alrededor de X.
-                    seg.y = N - z
-                    seg.z = y
+    def cabeza_en_vista(self) -> tuple:
+        """Celda de la cabeza expresada en el marco de la cara frontal actual."""
+        return self.orientacion.a_vista(*self.cabeza())
 
     def crecer(self):
         """
         Hace crecer a la serpiente añadiendo un nuevo segmento al final (cola).
         Se duplica el último segmento; en el siguiente movimiento se "desplegará".
         """
-        cola = self.segmentos[-1]
-        nuevo_segmento = Segmento(cola.x, cola.y, cola.z, COLOR_SERPIENTE_CUERPO)
-        self.segmentos.append(nuevo_segmento)
+        self._agregar_cola(*self.cola())
+        self.revision += 1
+
+    def instantanea(self) -> tuple:
+        """
+        Estado de la serpiente en O(1): bloques del cuerpo (compartidos, ver
+        "Instantáneas" en la cabecera), dirección, marco de la vista y versión
+        del mapa de ocupación. Solo puede restaurarse en esta misma serpiente.
+        """
+        # Detrás de la cola hay filas que esta instantánea sí ve.
+        self._cola_propia = False
+        return (
+            self._bloques, self._inicio, self.longitud,
+            self.direccion, self.proxima_direccion, self.vivo,
+            self.orientacion.matriz, self.ocupacion.instantanea(),
+        )
 
-    def dibujar(self):
-        for seg in self.segmentos:
-            seg.dibujar(self.tablero)
\ No newline at end of file
+    def restaurar(self, instantanea: tuple):
+        """Vuelve al estado guardado con `instantanea`."""
+        # Primero la ocupación: si la instantánea es de otra serpiente, falla
+        # sin haber tocado nada.
+        self.ocupacion.restaurar(instantanea[-1])
+        (self._bloques, self._inicio, self.longitud,
+         self.direccion, self.proxima_direccion, self.vivo,
+         self.orientacion.matriz, _) = instantanea
+        self._cabeza_propia = self._cola_propia = False
+        # No recuperamos la revisión antigua: las celdas han cambiado y el
+        # renderizador debe volver a leerlas.
+        self.revision += 1
@@ -11,70 +11,207 @@ El tablero es ahora:
 - Una estructura semitransparente que permite ver el interior del cubo,
   creando el distintivo efecto de "cubo de cristal".
 
-Para lograr un rendimiento óptimo (60 FPS con miles de cubos), implementamos
-Display Lists de OpenGL. Esta técnica precompila todos los comandos de dibujo
-del tablero en la memoria de la GPU durante la inicialización. Después, cada
-frame solo requiere una única llamada para renderizar toda la estructura.
-
-Además, como optimización adicional, solo dibujamos los vóxeles de la
-superficie del cubo (las 6 caras externas), dejando el interior vacío.
-Esto reduce drásticamente el número de polígonos sin afectar la jugabilidad,
-ya que la serpiente solo se mueve por la superficie.
+Solo dibujamos los vóxeles de la superficie del cubo (las 6 caras
+externas), dejando el interior vacío, ya que la serpiente solo se mueve por
+la superficie.
+
+Antes el tablero se precompilaba en una Display List con un cubo completo
+por celda. Ahora la geometría sale de `mallado.py` ya reducida (relleno sin
+caras interiores y fusionado por planos, aristas indexadas) y vive en
+buffers de vértices (VBO + índices) que se suben una sola vez. Cada frame
+son dos llamadas de dibujo, una para el relleno y otra para las aristas, con
+un shader sin iluminación (`shaders.py`). Así el coste de construcción y de
+relleno por frame crece mucho más despacio con GRID_SIZE.
+
+El cristal es transparente y se mezcla sin escribir profundidad, así que el
+orden de dibujo importa. En lugar de un orden fijo, precalculamos para cada
+región de la cámara (los 8 octantes y las posiciones a la altura de alguna
+cara, 27 en total) la secuencia de tramos de atrás hacia delante
+(`mallado.orden_losas`). En cada frame solo calculamos en qué región está la
+cámara y recorremos su lista: no se reordena ni se sube nada a la GPU, por
+lo que el coste no cambia durante las rotaciones de 90°.
+
+Para cubos grandes, cada losa se divide en bloques (`LADO_BLOQUE_TABLERO`)
+con su propia caja envolvente y sus tramos de índices. Cada frame
+comprobamos las cajas contra las 6 caras del frustum de la cámara (todas a
+la vez, con NumPy) y solo dibujamos los bloques visibles. Los de una misma
+pasada (por ejemplo, las aristas de una losa) salen en una única llamada a
+`glMultiDrawElements`, así que el número de llamadas no crece con el
+número de bloques y el coste de dibujo depende de lo que se ve, no del
+área total del cubo.
 """
 
+import ctypes
+import itertools
+
 from OpenGL.GL import (
-    glBegin, glEnd, glColor4f, glVertex3f,
-    glEnable, glDisable, glBlendFunc, glLineWidth, glDepthMask,
-    GL_QUADS, GL_LINES, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA,
-    GL_FALSE, GL_TRUE, GL_LIGHTING,
-    glGenLists, glNewList, glEndList, glCallList, GL_COMPILE
+    glGenBuffers, glBindBuffer, glBufferData, glDeleteBuffers,
+    glGenVertexArrays, glBindVertexArray, glDeleteVertexArrays,
+    glEnableVertexAttribArray, glVertexAttribPointer, glDrawElements, glMultiDrawElements,
+    glUseProgram, glGetFloatv, glEnable, glDisable, glBlendFunc, glLineWidth, glDepthMask,
+    GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW, GL_FLOAT,
+    GL_UNSIGNED_SHORT, GL_UNSIGNED_INT, GL_TRIANGLES, GL_LINES,
+    GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_FALSE, GL_TRUE,
+    GL_MODELVIEW_MATRIX, GL_PROJECTION_MATRIX,
 )
-from configuracion import (
-    GRID_SIZE, TAMANO_CELDA, OFFSET_GRID,
-    COLOR_CUBO_VACIO, COLOR_BORDE_VACIO, ESPACIO_CELDA
+import numpy as np
+
+from configuracion import GRID_SIZE, TAMANO_CELDA, COLOR_CUBO_VACIO, COLOR_BORDE_VACIO
+from mallado import (
+    mallar_relleno, mallar_aristas, cajas_bloques, orden_losas,
+    LOSAS, MEDIO_LADO, EXTERIOR, INTERIOR,
 )
-from transformaciones import transformar
+from shaders import ProgramaShader, SHADER_CRISTAL_VERTICES, SHADER_CRISTAL_FRAGMENTOS
+from topologia import topologia
+
+# Ubicación fija del único atributo del shader de cristal.
+ATRIBUTO_VERTICE = 0
+
+
+class _Malla:
+    """Un VAO con un buffer de vértices (x, y, z) y otro de índices."""
+
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray, primitiva):
+        self.primitiva = primitiva
+        self.num_vertices = len(vertices)
+        self.num_indices = len(indices)
+        self.tipo_indice = GL_UNSIGNED_SHORT if indices.dtype == np.uint16 else GL_UNSIGNED_INT
+        self.bytes_indice = indices.itemsize
+
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        self.vbo, self.ibo = glGenBuffers(2)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(ATRIBUTO_VERTICE)
+        glVertexAttribPointer(ATRIBUTO_VERTICE, 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+
+        # El buffer de índices queda registrado en el propio VAO.
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def dibujar(self, primero: int = 0, cuenta: int = None):
+        """Dibuja `cuenta` índices a partir de `primero` (por defecto, todos)."""
+        cuenta = self.num_indices - primero if cuenta is None else cuenta
+        if cuenta:
+            glBindVertexArray(self.vao)
+            glDrawElements(self.primitiva, cuenta, self.tipo_indice,
+                           ctypes.c_void_p(primero * self.bytes_indice))
+
+    def dibujar_tramos(self, tramos: np.ndarray):
+        """Dibuja varios tramos (primero, cuenta) con una sola llamada."""
+        if len(tramos) == 1:
+            self.dibujar(int(tramos[0, 0]), int(tramos[0, 1]))
+        elif len(tramos):
+            glBindVertexArray(self.vao)
+            desplazamientos = (tramos[:, 0] * self.bytes_indice).astype(np.uintp)
+            glMultiDrawElements(self.primitiva, tramos[:, 1].astype(np.int32), self.tipo_indice,
+                                desplazamientos, len(tramos))
+
+    def liberar(self):
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(2, [self.vbo, self.ibo])
+
 
 class Tablero:
-    def __init__(self):
-        self.size = GRID_SIZE
-        self.display_list_id = None
-        self._compilar_lista()
-    
-    def _compilar_lista(self):
+    def __init__(self, size: int = GRID_SIZE):
+        self.size = size
+        self.topologia = topologia(self.size)
+        self.programa = ProgramaShader(SHADER_CRISTAL_VERTICES, SHADER_CRISTAL_FRAGMENTOS,
+                                       {"vertice": ATRIBUTO_VERTICE})
+        self.relleno = None
+        self.aristas = None
+        self.ordenes = {}
+        self.cajas_minimo = self.cajas_maximo = None
+        self.num_bloques_visibles = 0
+        # Coordenada del plano exterior de cada cara del cubo grande.
+        self.limite = float(self.topologia.coordenada_mundo[-1]) + MEDIO_LADO * TAMANO_CELDA
+        self._construir_malla()
+
+    def _construir_malla(self):
         """
-        Compila la geometría del tablero en una Display List de OpenGL.
-        Esto envía todos los comandos de dibujo a la GPU una sola vez.
+        Genera la malla del tablero (`mallado.py`) y la sube a la GPU.
+        Solo ocurre una vez, al crear el tablero.
         """
-        self.display_list_id = glGenLists(1)
-        glNewList(self.display_list_id, GL_COMPILE)
-        
-        # --- Lógica de dibujo original ---
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glDepthMask(GL_FALSE)
-        
-        for x in range(self.size):
-            for y in range(self.size):
-                for z in range(self.size):
-                    # Optimización Fase 11: Solo dibujamos los cubos de la superficie (hueco por dentro)
-                    # Esto limpia visualmente el centro y mejora el rendimiento.
-                    if x == 0 or x == self.size - 1 or \
-                       y == 0 or y == self.size - 1 or \
-                       z == 0 or z == self.size - 1:
-                        
-                        px, py, pz = self.obtener_posicion_mundo(x, y, z)
-                        transformar(
-                            t_x=px, t_y=py, t_z=pz,
-                            s_x=TAMANO_CELDA, s_y=TAMANO_CELDA, s_z=TAMANO_CELDA,
-                            objeto_dibujado=self._dibujar_cubo_cristal
-                        )
-        
-        glDepthMask(GL_TRUE)
-        glDisable(GL_BLEND)
-        # ---------------------------------
-        
-        glEndList()
+        vertices, indices, tramos_relleno = mallar_relleno(self.topologia)
+        self.relleno = _Malla(vertices, indices, GL_TRIANGLES)
+        vertices, indices, tramos_aristas = mallar_aristas(self.topologia)
+        self.aristas = _Malla(vertices, indices, GL_LINES)
+        losa_bloque, self.cajas_minimo, self.cajas_maximo = cajas_bloques(self.topologia)
+
+        # Pasadas de dibujo por región: en una losa trasera vemos primero
+        # (más lejos) su cara exterior; en una frontal, su cara interior.
+        # Cada pasada guarda los bloques no vacíos de su losa y sus tramos.
+        pasadas_losa = {}
+        for losa in range(len(LOSAS)):
+            de_losa = losa_bloque == losa
+            for clave, malla, tramos, color in (
+                (EXTERIOR, self.relleno, tramos_relleno[EXTERIOR], COLOR_CUBO_VACIO),
+                (INTERIOR, self.relleno, tramos_relleno[INTERIOR], COLOR_CUBO_VACIO),
+                ("aristas", self.aristas, tramos_aristas, COLOR_BORDE_VACIO),
+            ):
+                bloques = np.flatnonzero(de_losa & (tramos[:, 1] > 0))
+                pasadas_losa[(losa, clave)] = (malla, bloques, tramos[bloques], color)
+
+        for region in itertools.product((-1, 0, 1), repeat=3):
+            secuencia = []
+            for losa, frontal in orden_losas(region):
+                lejano, cercano = (INTERIOR, EXTERIOR) if frontal else (EXTERIOR, INTERIOR)
+                for clave in (lejano, "aristas", cercano):
+                    pasada = pasadas_losa[(losa, clave)]
+                    if len(pasada[1]):
+                        secuencia.append(pasada)
+            self.ordenes[region] = secuencia
+
+    @property
+    def num_vertices(self) -> int:
+        """Vértices totales en la GPU (relleno + aristas)."""
+        return self.relleno.num_vertices + self.aristas.num_vertices
+
+    def liberar(self):
+        """Libera los buffers de la GPU (el tablero deja de poder dibujarse)."""
+        for malla in (self.relleno, self.aristas):
+            if malla is not None:
+                malla.liberar()
+        self.relleno = self.aristas = None
+        self.ordenes = {}
+
+    def bloques_visibles(self, modelovista, proyeccion) -> np.ndarray:
+        """
+        Máscara (B,) de los bloques cuya caja envolvente toca el frustum.
+
+        Extraemos los 6 planos de la matriz de recorte (proyección ×
+        modelo-vista, en coordenadas del tablero) y, para cada plano, probamos
+        la esquina de cada caja más adentrada en él: si queda fuera de algún
+        plano, el bloque entero está fuera.
+        """
+        recorte = (np.asarray(proyeccion, dtype=np.float64).reshape(4, 4).T
+                   @ np.asarray(modelovista, dtype=np.float64).reshape(4, 4).T)
+        planos = np.concatenate([recorte[3] + recorte[:3], recorte[3] - recorte[:3]])
+
+        normales, distancias = planos[:, :3], planos[:, 3]
+        positiva = normales[:, None, :] >= 0
+        esquinas = np.where(positiva, self.cajas_maximo[None], self.cajas_minimo[None])
+        dentro = np.einsum("pbk,pk->pb", esquinas, normales) + distancias[:, None] >= 0
+        return dentro.all(axis=0)
+
+    def region_camara(self, modelovista) -> tuple:
+        """
+        Región de la cámara respecto al cubo, en coordenadas del tablero:
+        por eje, -1 / +1 si está más allá de la cara negativa / positiva y 0
+        si está entre ambas.
+
+        :param modelovista: matriz de `glGetFloatv(GL_MODELVIEW_MATRIX)`.
+        """
+        m = np.asarray(modelovista, dtype=np.float64).reshape(4, 4).T
+        # El ojo está en el origen del espacio de vista: lo llevamos al tablero.
+        ojo = np.linalg.solve(m, (0.0, 0.0, 0.0, 1.0))[:3]
+        return tuple(int(c > self.limite) - int(c < -self.limite) for c in ojo.tolist())
 
     def obtener_posicion_mundo(self, x: int, y: int, z: int) -> tuple:
         """
@@ -85,76 +222,55 @@ class Tablero:
         puede traducirse a una posición 3D continua, compatible con las
         transformaciones de OpenGL.
         """
-        # Fase 11: Incluimos el espacio entre celdas en el cálculo de la posición.
-        stride = TAMANO_CELDA + ESPACIO_CELDA
-        
-        pos_x = (x * stride) - OFFSET_GRID + (TAMANO_CELDA / 2)
-        pos_y = (y * stride) - OFFSET_GRID + (TAMANO_CELDA / 2)
-        pos_z = (z * stride) - OFFSET_GRID + (TAMANO_CELDA / 2)
-        return pos_x, pos_y, pos_z
+        # Fase 11: El espacio entre celdas ya está incluido en la tabla de
+        # posiciones de `topologia.py`; aquí solo la consultamos.
+        return self.topologia.posicion_mundo(x, y, z)
 
     def dibujar(self):
         """
-        Dibuja el tablero invocando la Display List precompilada.
-        Rendimiento: 1 llamada vs 170,000 llamadas.
-        """
-        if self.display_list_id:
-            glCallList(self.display_list_id)
-
-    def _dibujar_cubo_cristal(self):
-        """
-        Primitiva de un cubo unitario con relleno translúcido y bordes
-        marcados.
+        Dibuja el cubo de cristal (relleno translúcido y aristas) con la
+        matriz actual de la pila de OpenGL, de atrás hacia delante según la
+        región en la que esté la cámara. Solo se dibujan los bloques que
+        tocan el frustum.
 
         El relleno aporta la sensación volumétrica, mientras que el
         wireframe refuerza la lectura de la rejilla 3D cuando el cubo rota
         sobre sí mismo.
         """
-        hs = 0.4 # Half size (Reducido a 0.4 para mayor separación visual entre celdas)
-        
-        # 1. Relleno translúcido
-        glColor4f(*COLOR_CUBO_VACIO)
-        glBegin(GL_QUADS)
-        # Cara frontal
-        glVertex3f(-hs, -hs,  hs); glVertex3f( hs, -hs,  hs)
-        glVertex3f( hs,  hs,  hs); glVertex3f(-hs,  hs,  hs)
-        # Cara trasera
-        glVertex3f(-hs, -hs, -hs); glVertex3f(-hs,  hs, -hs)
-        glVertex3f( hs,  hs, -hs); glVertex3f( hs, -hs, -hs)
-        # Cara izquierda
-        glVertex3f(-hs, -hs, -hs); glVertex3f(-hs, -hs,  hs)
-        glVertex3f(-hs,  hs,  hs); glVertex3f(-hs,  hs, -hs)
-        # Cara derecha
-        glVertex3f( hs, -hs, -hs); glVertex3f( hs,  hs, -hs)
-        glVertex3f( hs,  hs,  hs); glVertex3f( hs, -hs,  hs)
-        # Cara arriba
-        glVertex3f(-hs,  hs, -hs); glVertex3f(-hs,  hs,  hs)
-        glVertex3f( hs,  hs,  hs); glVertex3f( hs,  hs, -hs)
-        # Cara abajo
-        glVertex3f(-hs, -hs, -hs); glVertex3f( hs, -hs, -hs)
-        glVertex3f( hs, -hs,  hs); glVertex3f(-hs, -hs,  hs)
-        glEnd()
-
-        # 2. Bordes (Wireframe)
-        # Desactivamos iluminación para que las líneas se vean siempre nítidas
-        glDisable(GL_LIGHTING)
+        if self.relleno is None:
+            return
+
+        modelovista = glGetFloatv(GL_MODELVIEW_MATRIX)
+        proyeccion = glGetFloatv(GL_PROJECTION_MATRIX)
+        visibles = self.bloques_visibles(modelovista, proyeccion)
+        self.num_bloques_visibles = int(visibles.sum())
+        if not self.num_bloques_visibles:
+            return
+
+        programa = self.programa
+        programa.usar()
+        programa.uniform_matriz4("modelovista", modelovista)
+        programa.uniform_matriz4("proyeccion", proyeccion)
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glDepthMask(GL_FALSE)
+
         glLineWidth(1.0)
-        glColor4f(*COLOR_BORDE_VACIO)
-        glBegin(GL_LINES)
-        # Frontal
-        glVertex3f(-hs,-hs, hs); glVertex3f( hs,-hs, hs)
-        glVertex3f( hs,-hs, hs); glVertex3f( hs, hs, hs)
-        glVertex3f( hs, hs, hs); glVertex3f(-hs, hs, hs)
-        glVertex3f(-hs, hs, hs); glVertex3f(-hs,-hs, hs)
-        # Trasera
-        glVertex3f(-hs,-hs,-hs); glVertex3f( hs,-hs,-hs)
-        glVertex3f( hs,-hs,-hs); glVertex3f( hs, hs,-hs)
-        glVertex3f( hs, hs,-hs); glVertex3f(-hs, hs,-hs)
-        glVertex3f(-hs, hs,-hs); glVertex3f(-hs,-hs,-hs)
-        # Uniones
-        glVertex3f(-hs,-hs, hs); glVertex3f(-hs,-hs,-hs)
-        glVertex3f( hs,-hs, hs); glVertex3f( hs,-hs,-hs)
-        glVertex3f( hs, hs, hs); glVertex3f( hs, hs,-hs)
-        glVertex3f(-hs, hs, hs); glVertex3f(-hs, hs,-hs)
-        glEnd()
-        glEnable(GL_LIGHTING) # Reactivamos iluminación para el resto de la escena
\ No newline at end of file
+
+        # Relleno y bordes (wireframe) intercalados por losas. Sin
+        # iluminación, para que las líneas se vean siempre nítidas.
+        color_actual = None
+        for malla, bloques, tramos, color in self.ordenes[self.region_camara(modelovista)]:
+            en_vista = visibles[bloques]
+            if not en_vista.any():
+                continue
+            if color is not color_actual:
+                programa.uniform_4f("color", color)
+                color_actual = color
+            malla.dibujar_tramos(tramos[en_vista])
+
+        glBindVertexArray(0)
+        glUseProgram(0)
+        glDepthMask(GL_TRUE)
+        glDisable(GL_BLEND)
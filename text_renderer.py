@@ -4,81 +4,223 @@ Proyecto Snake 3D: Vóxel Planetario - text_renderer.py
 Este módulo resuelve un problema clásico en aplicaciones OpenGL: ¿cómo
 mostramos texto 2D (puntuación, instrucciones, mensajes) sobre una escena 3D?
 
-La solución que implementamos sigue estos pasos:
+La primera versión rasterizaba cada cadena completa con `pygame.font`, la
+guardaba en una caché por texto y la copiaba a la pantalla con
+`glDrawPixels`, cambiando la proyección para cada cadena. Eso suponía una
+transferencia de píxeles por cadena y frame, y un mapa de bits nuevo (para
+siempre en la caché) por cada puntuación distinta.
 
-1. Utilizamos pygame.font para renderizar el texto a una superficie 2D.
-2. Convertimos esa superficie a datos de píxeles compatibles con OpenGL.
-3. Cambiamos temporalmente a proyección ortogonal (2D).
-4. Dibujamos los píxeles del texto directamente en pantalla con glDrawPixels.
-5. Restauramos la proyección 3D para continuar con el renderizado normal.
+Ahora usamos un atlas de glifos:
 
-Para optimizar el rendimiento, implementamos un sistema de caché que evita
-regenerar las texturas de texto en cada frame. Los textos estáticos (como
-"Press S to Start") se generan una sola vez y se reutilizan, mientras que
-los textos dinámicos (como la puntuación) se actualizan solo cuando cambian.
+1. Al arrancar, rasterizamos una sola vez con `pygame.font` todos los
+   caracteres imprimibles (ASCII y Latin-1) de ambos tamaños y los
+   empaquetamos en una única textura.
+2. `dibujar_texto` ya no dibuja: traduce la cadena a quads (posición de
+   pantalla + coordenadas en el atlas) y los añade al lote del frame. La
+   maquetación de cada cadena se guarda en una caché LRU acotada en bytes
+   (`cache_lru.py`), así que los textos repetidos solo cuestan desplazar sus
+   quads a (x, y) y los que dejan de usarse acaban saliendo de la caché.
+3. `presentar` sube los vértices de todo el lote a un VBO y dibuja toda la
+   interfaz con una sola llamada, sin tocar las matrices de OpenGL: el
+   shader (`shaders.py`) convierte directamente píxeles a coordenadas de
+   recorte.
 
-Esta técnica nos permite mantener los 60 FPS estables sin sacrificar la
-claridad visual de la interfaz de usuario.
+Por frame solo viajan a la GPU unos pocos vértices; ningún píxel.
 """
 
+import ctypes
+
+import numpy as np
 import pygame
-from OpenGL.GL import *
-from configuracion import SCREEN_WIDTH, SCREEN_HEIGHT
+from OpenGL.GL import (
+    glGenTextures, glBindTexture, glTexImage2D, glTexParameteri, glPixelStorei, glActiveTexture,
+    glGenBuffers, glBindBuffer, glBufferData, glGenVertexArrays, glBindVertexArray,
+    glEnableVertexAttribArray, glVertexAttribPointer, glDrawArrays, glUseProgram,
+    glEnable, glDisable, glBlendFunc,
+    GL_TEXTURE_2D, GL_TEXTURE0, GL_RGBA, GL_UNSIGNED_BYTE, GL_UNPACK_ALIGNMENT,
+    GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER, GL_NEAREST,
+    GL_ARRAY_BUFFER, GL_STREAM_DRAW, GL_FLOAT, GL_FALSE, GL_TRIANGLES,
+    GL_DEPTH_TEST, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA,
+)
+
+from cache_lru import CacheLRU
+from configuracion import SCREEN_WIDTH, SCREEN_HEIGHT, PRESUPUESTO_CACHE_TEXTO_BYTES
+from shaders import ProgramaShader, SHADER_TEXTO_VERTICES, SHADER_TEXTO_FRAGMENTOS
+
+# Caracteres incluidos en el atlas. Cualquier otro se dibuja como SUSTITUTO.
+# Excluimos el guion discrecional (U+00AD): no tiene anchura y Pygame no lo
+# rasteriza.
+CARACTERES_ATLAS = "".join(
+    chr(c) for c in list(range(32, 127)) + list(range(160, 256)) if c != 0xAD
+)
+SUSTITUTO = "?"
+
+ANCHO_ATLAS = 1024
+SEPARACION_GLIFOS = 1  # Píxeles libres entre glifos para que no se mezclen
+
+ATRIBUTO_POSICION = 0
+ATRIBUTO_UV = 1
+
+# Floats por vértice (x, y, u, v) y vértices por glifo (dos triángulos).
+FLOATS_VERTICE = 4
+VERTICES_GLIFO = 6
+BYTES_FLOAT = 4
+
 
 class TextRenderer:
     def __init__(self):
         self.font_large = pygame.font.SysFont("Arial", 48, bold=True)
         self.font_small = pygame.font.SysFont("Arial", 24)
         self.color_text = (255, 255, 255, 255) # Blanco
-        
-        # --- OPTIMIZACION: Cache de texturas ---
-        # Diccionario: (texto, tamano) -> (width, height, text_data)
-        self.cache = {}
 
-    def dibujar_texto(self, texto, x, y, tamano="small"):
+        # Glifos por tamaño: carácter -> (ancho, alto, u0, v0, u1, v1)
+        self.glifos = {}
+        self.textura_atlas = self._crear_atlas({"large": self.font_large, "small": self.font_small})
+
+        # --- OPTIMIZACION: Cache de maquetación ---
+        # LRU: (texto, tamano) -> quads del texto con origen en (0, 0),
+        # limitada a PRESUPUESTO_CACHE_TEXTO_BYTES
+        self.cache = CacheLRU(PRESUPUESTO_CACHE_TEXTO_BYTES)
+
+        # Quads pendientes de dibujar en este frame
+        self.lote = []
+
+        self.programa = ProgramaShader(SHADER_TEXTO_VERTICES, SHADER_TEXTO_FRAGMENTOS, {
+            "posicion": ATRIBUTO_POSICION,
+            "uv": ATRIBUTO_UV,
+        })
+        self.vbo = glGenBuffers(1)
+        self.vao = self._crear_vao()
+
+    def _crear_atlas(self, fuentes: dict) -> int:
+        """
+        Rasteriza todos los glifos de cada fuente, los empaqueta por filas en
+        una superficie de Pygame y la sube como textura (una sola vez).
+        """
+        superficies = {}
+        x = y = alto_fila = 0
+        colocacion = {}
+        for tamano, fuente in fuentes.items():
+            for caracter in CARACTERES_ATLAS:
+                superficie = fuente.render(caracter, True, self.color_text)
+                ancho, alto = superficie.get_size()
+                if x + ancho > ANCHO_ATLAS:
+                    x, y, alto_fila = 0, y + alto_fila + SEPARACION_GLIFOS, 0
+                superficies[(tamano, caracter)] = superficie
+                colocacion[(tamano, caracter)] = (x, y, ancho, alto)
+                x += ancho + SEPARACION_GLIFOS
+                alto_fila = max(alto_fila, alto)
+        alto_atlas = y + alto_fila
+
+        # Fondo blanco transparente: al mezclar los glifos conservan su color.
+        atlas = pygame.Surface((ANCHO_ATLAS, alto_atlas), pygame.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        for (tamano, caracter), (gx, gy, ancho, alto) in colocacion.items():
+            atlas.blit(superficies[(tamano, caracter)], (gx, gy))
+            self.glifos.setdefault(tamano, {})[caracter] = (
+                ancho, alto,
+                gx / ANCHO_ATLAS, gy / alto_atlas,
+                (gx + ancho) / ANCHO_ATLAS, (gy + alto) / alto_atlas,
+            )
+
+        # La fila 0 de la textura es la superior del atlas (v = 0 arriba).
+        datos = pygame.image.tostring(atlas, "RGBA", False)
+        textura = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, textura)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, ANCHO_ATLAS, alto_atlas, 0, GL_RGBA, GL_UNSIGNED_BYTE, datos)
+        # Los quads se dibujan a tamaño real y en píxeles enteros: sin filtrado.
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return textura
+
+    def _crear_vao(self):
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        stride = FLOATS_VERTICE * BYTES_FLOAT
+        glEnableVertexAttribArray(ATRIBUTO_POSICION)
+        glVertexAttribPointer(ATRIBUTO_POSICION, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(ATRIBUTO_UV)
+        glVertexAttribPointer(ATRIBUTO_UV, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(2 * BYTES_FLOAT))
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return vao
+
+    def _maquetar(self, texto: str, tamano: str) -> np.ndarray:
         """
-        Dibuja texto en la posición (x, y) de la pantalla.
-        Usa caché para evitar renderizar la fuente en cada frame.
+        Convierte `texto` en quads (VERTICES_GLIFO vértices por carácter) con
+        la esquina superior izquierda de la cadena en (0, 0).
+        """
+        glifos = self.glifos[tamano]
+        quads = np.empty((len(texto), VERTICES_GLIFO, FLOATS_VERTICE), dtype=np.float32)
+        x = 0.0
+        for i, caracter in enumerate(texto):
+            ancho, alto, u0, v0, u1, v1 = glifos.get(caracter) or glifos[SUSTITUTO]
+            quads[i] = (
+                (x, 0, u0, v0), (x + ancho, 0, u1, v0), (x + ancho, alto, u1, v1),
+                (x, 0, u0, v0), (x + ancho, alto, u1, v1), (x, alto, u0, v1),
+            )
+            x += ancho
+        return quads.reshape(-1, FLOATS_VERTICE)
+
+    def dibujar_texto(self, texto, x, y, tamano="small", cachear=True):
+        """
+        Añade el texto en la posición (x, y) de la pantalla al lote del frame
+        (se dibuja en `presentar`). Usa caché para no maquetar la cadena en
+        cada frame.
+        Con `cachear=False` (textos que cambian constantemente, como las
+        cifras del perfilador) ni consultamos ni guardamos el resultado, para
+        no expulsar textos útiles de la caché.
         """
         clave_cache = (texto, tamano)
-        
-        if clave_cache in self.cache:
-            width, height, text_data = self.cache[clave_cache]
-        else:
-            # Si no está en caché, generamos
-            font = self.font_large if tamano == "large" else self.font_small
-            text_surface = font.render(texto, True, self.color_text, (0,0,0,0)) # Fondo transparente
-            text_data = pygame.image.tostring(text_surface, "RGBA", True)
-            width, height = text_surface.get_rect().size
-            
-            # Guardamos en caché
-            self.cache[clave_cache] = (width, height, text_data)
-
-        # Configurar proyección ortogonal para UI 2D
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT, -1, 1)
-        
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-
-        # Desactivar profundidad y luces (aunque ya no hay luces globales)
+
+        quads = self.cache.obtener(clave_cache) if cachear else None
+        if quads is None:
+            quads = self._maquetar(texto, tamano)
+            if cachear:
+                self.cache.guardar(clave_cache, quads)
+
+        if len(quads):
+            colocados = quads.copy()
+            colocados[:, 0] += x
+            colocados[:, 1] += y
+            self.lote.append(colocados)
+
+    def presentar(self):
+        """
+        Dibuja todo el texto acumulado desde la última llamada con una única
+        llamada de dibujo y vacía el lote.
+        """
+        if not self.lote:
+            return
+        vertices = np.concatenate(self.lote)
+        self.lote = []
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        programa = self.programa
+        programa.usar()
+        programa.uniform_2f("pantalla", (SCREEN_WIDTH, SCREEN_HEIGHT))
+        programa.uniform_4f("color", [c / 255.0 for c in self.color_text])
+        programa.uniform_1i("atlas", 0)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.textura_atlas)
+
+        # Desactivar profundidad: la interfaz siempre queda por encima
         glDisable(GL_DEPTH_TEST)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
-        # Posicionar raster (OpenGL empieza abajo-izquierda, Pygame arriba-izquierda)
-        glRasterPos2i(x, SCREEN_HEIGHT - y - height)
-        
-        glDrawPixels(width, height, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+        glBindVertexArray(self.vao)
+        glDrawArrays(GL_TRIANGLES, 0, len(vertices))
 
         # Restaurar estado
+        glBindVertexArray(0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glUseProgram(0)
         glDisable(GL_BLEND)
         glEnable(GL_DEPTH_TEST)
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
@@ -0,0 +1,120 @@
+"""
+Proyecto Snake 3D: Vóxel Planetario - topologia.py
+
+Este módulo precalcula, una única vez por tamaño de cubo, toda la geometría
+discreta de la superficie que antes recalculaban por separado el tablero, la
+comida y la serpiente:
+
+- La lista de celdas de superficie (y el mapa inverso celda -> id).
+- La posición de mundo de cada celda, sustituyendo las llamadas repetidas a
+  `Tablero.obtener_posicion_mundo`.
+- La tabla de vecinos de cada celda en las 6 direcciones del cubo. Un vecino
+  -1 significa que esa dirección sale del cubo: estamos en una arista y hay
+  que cambiar de cara.
+- La tabla de transiciones: qué rotación del mundo corresponde a salir por
+  cada borde de la cara frontal.
+
+Todas las consultas son O(1) sobre arrays NumPy. Usamos `lru_cache` para que
+todos los subsistemas compartan la misma instancia para un `GRID_SIZE` dado.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from configuracion import (
+    GRID_SIZE, TAMANO_CELDA, ESPACIO_CELDA,
+    DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT,
+)
+
+# Las 6 direcciones del cubo, en el orden de las columnas de `vecinos`.
+DIRECCIONES_CUBO = (
+    (1, 0, 0), (-1, 0, 0),
+    (0, 1, 0), (0, -1, 0),
+    (0, 0, 1), (0, 0, -1),
+)
+INDICE_DIRECCION = {d: i for i, d in enumerate(DIRECCIONES_CUBO)}
+
+# Salir de la cara frontal por cada borde (flecha en el plano de la vista)
+# obliga a girar el mundo para mostrar la cara contigua:
+# - Derecha -> el mundo gira a la izquierda (-90º en Y).
+# - Izquierda -> el mundo gira a la derecha (+90º en Y).
+# - Arriba -> el mundo gira hacia abajo (+90º en X).
+# - Abajo -> el mundo gira hacia arriba (-90º en X).
+TRANSICIONES = {
+    DIR_RIGHT: ("y", -90.0),
+    DIR_LEFT: ("y", 90.0),
+    DIR_UP: ("x", 90.0),
+    DIR_DOWN: ("x", -90.0),
+}
+
+
+class Topologia:
+    """
+    Tablas precalculadas de la superficie de un cubo de `size`³ celdas.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        borde = size - 1
+
+        # 1. Celdas de superficie: alguna coordenada vale 0 o N-1.
+        x, y, z = np.meshgrid(np.arange(size), np.arange(size), np.arange(size), indexing="ij")
+        en_superficie = (
+            (x == 0) | (x == borde) | (y == 0) | (y == borde) | (z == 0) | (z == borde)
+        )
+        self.superficie = np.stack(
+            [x[en_superficie], y[en_superficie], z[en_superficie]], axis=1
+        ).astype(np.int32)
+        self.num_celdas = len(self.superficie)
+
+        self.id_superficie = np.full((size, size, size), -1, dtype=np.int32)
+        self.id_superficie[tuple(self.superficie.T)] = np.arange(self.num_celdas, dtype=np.int32)
+
+        # 2. Posiciones de mundo. La conversión es separable por eje, así que
+        # basta una tabla de N valores: `coordenada_mundo[celdas]` convierte
+        # cualquier array de celdas (..., 3) de una sola vez.
+        ancho_total = size * TAMANO_CELDA + (size - 1) * ESPACIO_CELDA
+        stride = TAMANO_CELDA + ESPACIO_CELDA
+        self.coordenada_mundo = (
+            np.arange(size) * stride - ancho_total / 2.0 + TAMANO_CELDA / 2
+        ).astype(np.float32)
+        self.posiciones_superficie = self.coordenada_mundo[self.superficie]
+
+        # 3. Vecinos por dirección (-1 si la dirección sale del cubo o entra
+        # al interior hueco).
+        self.vecinos = np.full((self.num_celdas, len(DIRECCIONES_CUBO)), -1, dtype=np.int32)
+        for k, direccion in enumerate(DIRECCIONES_CUBO):
+            destino = self.superficie + np.array(direccion, dtype=np.int32)
+            dentro = np.all((destino >= 0) & (destino <= borde), axis=1)
+            self.vecinos[dentro, k] = self.id_superficie[tuple(destino[dentro].T)]
+
+    def id_celda(self, x: int, y: int, z: int) -> int:
+        """Id de superficie de la celda (x, y, z), o -1 si es interior."""
+        return int(self.id_superficie[x, y, z])
+
+    def celda(self, id_celda: int) -> tuple:
+        """Coordenadas (x, y, z) de una celda de superficie."""
+        x, y, z = self.superficie[id_celda]
+        return int(x), int(y), int(z)
+
+    def vecino(self, id_celda: int, direccion_cubo: tuple) -> int:
+        """
+        Id de la celda contigua en `direccion_cubo`, o -1 si esa dirección sale
+        del cubo (la cabeza está en una arista y debe cambiar de cara).
+        """
+        k = INDICE_DIRECCION.get(tuple(direccion_cubo))
+        if k is None:
+            return -1
+        return int(self.vecinos[id_celda, k])
+
+    def posicion_mundo(self, x: int, y: int, z: int) -> tuple:
+        """Posición de mundo (centrada en el origen) de la celda (x, y, z)."""
+        cm = self.coordenada_mundo
+        return float(cm[x]), float(cm[y]), float(cm[z])
+
+
+@lru_cache(maxsize=None)
+def topologia(size: int = GRID_SIZE) -> Topologia:
+    """Devuelve (y memoriza) la topología del cubo de `size`³ celdas."""
+    return Topologia(size)